@@ -1,9 +1,10 @@
 import streamlit as st
+import threading
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import date, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 import plotly.figure_factory as ff
 import datetime
 import pandas as pd 
@@ -12,6 +13,18 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 from PIL import Image
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+from pmanalysis.datastore import MINING_DATA, HierarchyIndex, TimeRangeIndex, history_version, read_history
+from pmanalysis.figures import FIGURES
+from pmanalysis.issues import IssueStore
+from pmanalysis.prefetch import PREFETCH
+from pmanalysis.rollup import RollupCube
+from pmanalysis.rules import (
+    HEALTH_BAND_LABELS, STATUS_ICONS, STATUS_COLORS, RISK_LABELS, RISK_ICONS,
+    CRITICAL_BAND, WARNING_BAND, HEALTHY_BAND, health_band, risk_code
+)
+from pmanalysis.tables import DEFAULT_PAGE_SIZE, PAGE_SIZES, page_count, select_rows, take_page
 
 # =====================================================
 # PAGE CONFIG
@@ -42,35 +55,83 @@ st.markdown("""
 # SESSION STATE INITIALIZATION
 # =====================================================
 if "issues" not in st.session_state:
-    st.session_state.issues = []
+    st.session_state.issues = None
 if "theme" not in st.session_state:
     st.session_state.theme = False
-if "data_loaded" not in st.session_state:
-    st.session_state.data_loaded = False
+if "issues_version" not in st.session_state:
+    st.session_state.issues_version = None
 
 # =====================================================
 # DATA LOADING
 # =====================================================
-@st.cache_data
 def load_data():
-    """Load data from CSV file"""
+    """Shared pipeline output (Parquet when present, else CSV), reloaded when the files change"""
     try:
-        df = pd.read_csv('output/mining_data.csv')
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['due_date'] = pd.to_datetime(df['due_date'])
-        return df
+        return MINING_DATA.get()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def _health_history(store_version, plant_id: str, from_date: date, to_date: date) -> pd.DataFrame:
+    """Mean sub-plant health per pipeline run, read from the partitioned history store"""
+    try:
+        history = read_history(
+            plant_id=plant_id, readings_from=from_date, readings_to=to_date,
+            columns=['run_at', 'sub_plant', 'health_score']
+        )
+    except ImportError:
+        return pd.DataFrame()
+    if history.empty:
+        return history
+    return history.groupby(['run_at', 'sub_plant'], observed=True)['health_score'].mean().reset_index()
+
+def load_health_history(plant_id: str, from_date: date, to_date: date) -> pd.DataFrame:
+    """Health trend, re-read only after the pipeline appends a run to the history store"""
+    return _health_history(history_version(), plant_id, from_date, to_date)
+
 # Load data
 df_raw = load_data()
 
+def load_time_index():
+    """Pipeline output sorted by (plant_id, timestamp); built once per data version"""
+    return MINING_DATA.derive('time_index', TimeRangeIndex) if df_raw is not None else None
+
+def load_rollup_cube():
+    """Health mean/min/count and status counts per hierarchy level, aggregated once per data version"""
+    return MINING_DATA.derive('rollup_cube', RollupCube) if df_raw is not None else None
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _window_rollup(data_version, from_date: date, to_date: date) -> RollupCube:
+    return load_rollup_cube().window(from_date, to_date)
+
+def get_window_rollup(from_date: date, to_date: date) -> RollupCube:
+    """Rollup cube over the selected date range, re-aggregated from the daily base"""
+    return _window_rollup(MINING_DATA.version, from_date, to_date)
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _plant_window(data_version, plant_id: str, from_date: date, to_date: date) -> pd.DataFrame:
+    return load_time_index().window(plant_id, from_date, to_date)
+
+def get_plant_window(plant_id: str, from_date: date, to_date: date) -> pd.DataFrame:
+    """One plant's readings inside [from_date, to_date] (shared, read-only), cached per (plant, from, to)"""
+    return _plant_window(MINING_DATA.version, plant_id, from_date, to_date)
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _plant_hierarchy(data_version, plant_id: str, from_date: date, to_date: date) -> HierarchyIndex:
+    return HierarchyIndex(get_plant_window(plant_id, from_date, to_date))
+
+def get_plant_hierarchy(plant_id: str, from_date: date, to_date: date) -> HierarchyIndex:
+    """Hierarchy lookups over one plant's readings inside [from_date, to_date]"""
+    return _plant_hierarchy(MINING_DATA.version, plant_id, from_date, to_date)
+
 # =====================================================
 # CONSTANTS & DATA STRUCTURES
 # =====================================================
 PLANTS = [f"Plant-{i}" for i in range(1, 6)]
 
+TABS = ["📊 Overview", "🏗️ Hierarchy Visualization", "🚨 Alerts", "🛠️ Maintenance"]
+
 PLANT_STRUCTURE = {
     "Crushing Plant": {
         "Jaw Crusher": ["Bearing", "Motor"],
@@ -335,53 +396,37 @@ def apply_theme(is_dark: bool) -> None:
 # =====================================================
 # UTILITY FUNCTIONS (CSV-based)
 # =====================================================
-def get_health_score(plant_id: str, sub_plant: str, equipment: str, component: str) -> int:
-    """Get health score from CSV data"""
-    filtered = df_raw[
-        (df_raw['plant_id'] == plant_id) &
-        (df_raw['sub_plant'] == sub_plant) &
-        (df_raw['equipment'] == equipment) &
-        (df_raw['component'] == component)
-    ]
-    if not filtered.empty:
-        return int(filtered['health_score'].iloc[0])
+def get_health_score(
+    plant_id: str,
+    sub_plant: str,
+    equipment: str,
+    component: str,
+    from_date: date,
+    to_date: date
+) -> int:
+    """Latest component health score among its readings inside [from_date, to_date]"""
+    score = get_plant_hierarchy(plant_id, from_date, to_date).last(plant_id, sub_plant, equipment, component)
+    if score is not None:
+        return int(score)
     return 85  # Default healthy
 
 def status(score: int) -> str:
     """Determine status based on health score"""
-    if score >= 85:
-        return "🟢 Healthy"
-    elif score >= 70:
-        return "🟠 Warning"
-    else:
-        return "🔴 Critical"
+    band = health_band(score)
+    return f"{STATUS_ICONS[band]} {HEALTH_BAND_LABELS['status'][band]}"
 
 def maintenance(score: int) -> str:
     """Determine maintenance type"""
-    if score >= 85:
-        return "Proactive"
-    elif score >= 70:
-        return "Preventive"
-    else:
-        return "Predictive"
+    return HEALTH_BAND_LABELS['maintenance_type'][health_band(score)]
 
 def action(score: int) -> str:
     """Determine required action"""
-    if score >= 85:
-        return "Continue monitoring"
-    elif score >= 70:
-        return "Plan inspection"
-    else:
-        return "Immediate inspection & shutdown planning"
+    return HEALTH_BAND_LABELS['action_required'][health_band(score)]
 
 def ml_risk_prediction(score: int) -> str:
     """ML-based failure risk prediction"""
-    if score < 65:
-        return "🔴 High Failure Risk"
-    elif score < 80:
-        return "🟠 Medium Failure Risk"
-    else:
-        return "🟢 Low Failure Risk"
+    code = risk_code(score)
+    return f"{RISK_ICONS[code]} {RISK_LABELS[code]}"
 
 def countdown_text(due_text: str) -> str:
     """Convert due date to countdown text"""
@@ -395,6 +440,9 @@ def countdown_text(due_text: str) -> str:
 # =====================================================
 # ENHANCED VISUALIZATION FUNCTIONS
 # =====================================================
+# Figures come from the shared FIGURES cache (per data version, LRU-bounded):
+# callers must not mutate them.
+@FIGURES.cached
 def create_donut_chart(value: int, title: str, theme_colors: Dict) -> go.Figure:
     """Create enhanced donut chart with theme support"""
     fig = go.Figure(data=[go.Pie(
@@ -430,6 +478,7 @@ def create_donut_chart(value: int, title: str, theme_colors: Dict) -> go.Figure:
     
     return fig
 
+@FIGURES.cached
 def create_bar_chart(df: pd.DataFrame, x: str, y: str, title: str) -> go.Figure:
     """Create enhanced bar chart"""
     fig = px.bar(
@@ -451,6 +500,23 @@ def create_bar_chart(df: pd.DataFrame, x: str, y: str, title: str) -> go.Figure:
     
     return fig
 
+@FIGURES.cached
+def create_trend_chart(df: pd.DataFrame, x: str, y: str, color: str, title: str) -> go.Figure:
+    """Create health trend line chart"""
+    fig = px.line(df, x=x, y=y, color=color, markers=True, title=title)
+    
+    fig.update_layout(
+        height=400,
+        margin=dict(t=50, b=50, l=50, r=50),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor='rgba(128,128,128,0.1)')
+    )
+    
+    return fig
+
+@FIGURES.cached
 def create_pie_chart(df: pd.DataFrame, names: str, title: str) -> go.Figure:
     """Create enhanced pie chart"""
     fig = px.pie(
@@ -472,6 +538,7 @@ def create_pie_chart(df: pd.DataFrame, names: str, title: str) -> go.Figure:
 # =====================================================
 # HIERARCHY VISUALIZATION FUNCTIONS
 # =====================================================
+@FIGURES.cached
 def create_hierarchy_flowchart(is_dark: bool) -> go.Figure:
     """Create interactive hierarchy flowchart using Plotly Sankey diagram"""
     
@@ -552,26 +619,25 @@ def render_subplant_asset_insights(
     selected_plant: str,
     selected_subplant: str,
     selected_asset: str,
+    from_date: date,
+    to_date: date,
     theme_colors: Dict
 ) -> None:
 
     st.subheader(f"🚛 Asset Intelligence – {selected_asset}")
 
-    df_filtered = df_raw[
-        (df_raw["plant_id"] == selected_plant) &
-        (df_raw["sub_plant"] == selected_subplant) &
-        (df_raw["equipment"] == selected_asset)
-    ].copy()
+    cube = get_window_rollup(from_date, to_date)
+    asset_rollup = cube.summary(selected_plant, selected_subplant, selected_asset)
 
-    if df_filtered.empty:
-        st.warning("No data available for this asset")
+    if asset_rollup is None:
+        st.warning(f"No data available for this asset between {from_date} and {to_date}")
         return
 
     # ===================================================
     # 1️⃣ OVERALL ASSET HEALTH
     # ===================================================
 
-    asset_health = int(df_filtered["health_score"].mean())
+    asset_health = int(asset_rollup["mean"])
 
     k1, k2, k3 = st.columns(3)
     k1.metric("Asset Health", f"{asset_health}%")
@@ -591,11 +657,9 @@ def render_subplant_asset_insights(
     st.markdown("### 🔩 Component Health Overview")
 
     comp_df = (
-        df_filtered
-        .groupby("component")["health_score"]
-        .mean()
-        .reset_index()
-        .rename(columns={"health_score": "Health (%)"})
+        cube.breakdown(selected_plant, selected_subplant, selected_asset)
+        .sort_values("component", ignore_index=True)[["component", "mean"]]
+        .rename(columns={"mean": "Health (%)"})
     )
 
     comp_df["Health (%)"] = comp_df["Health (%)"].astype(int)
@@ -622,13 +686,36 @@ def render_subplant_asset_insights(
 
     st.markdown("### 🧠 Component Intelligence Insight")
 
-    if avg_comp_health >= 85:
+    comp_band = health_band(avg_comp_health)
+    if comp_band == HEALTHY_BAND:
         st.success("All components operating in stable condition.")
-    elif 70 <= avg_comp_health < 85:
+    elif comp_band == WARNING_BAND:
         st.warning("Moderate wear detected. Preventive maintenance recommended.")
     else:
         st.error("Critical component degradation detected. Immediate action required.")
 
+    render_asset_sensor_drilldown(
+        selected_plant,
+        selected_subplant,
+        selected_asset,
+        comp_df["component"].tolist(),
+        from_date,
+        to_date
+    )
+
+
+@st.fragment
+@PREFETCH.in_foreground
+def render_asset_sensor_drilldown(
+    selected_plant: str,
+    selected_subplant: str,
+    selected_asset: str,
+    components: List[str],
+    from_date: date,
+    to_date: date
+) -> None:
+    """Sensor sections of the asset view; picking a component reruns only this part"""
+
     # ===================================================
     # 4️⃣ SENSOR DRILLDOWN
     # ===================================================
@@ -637,11 +724,13 @@ def render_subplant_asset_insights(
 
     selected_component = st.selectbox(
         "Select Component",
-        comp_df["component"],
+        components,
         key="asset_component_select"
     )
 
-    sensor_df = df_filtered[df_filtered["component"] == selected_component]
+    sensor_df = get_plant_hierarchy(selected_plant, from_date, to_date).rows(
+        selected_plant, selected_subplant, selected_asset, selected_component
+    )
 
     if sensor_df.empty:
         st.info("No sensor data available")
@@ -663,13 +752,14 @@ def render_subplant_asset_insights(
 
     st.markdown("### 🚨 Sensor Risk Insight")
 
-    if avg_sensor_health >= 85:
+    sensor_band = health_band(avg_sensor_health)
+    if sensor_band == HEALTHY_BAND:
         st.success(
             f"All sensors stable. Lowest sensor: "
             f"{worst_sensor['Sensor']} ({worst_sensor['Health (%)']}%)"
         )
 
-    elif 70 <= avg_sensor_health < 85:
+    elif sensor_band == WARNING_BAND:
         st.warning(
             f"Sensor degradation detected. Monitor "
             f"{worst_sensor['Sensor']} ({worst_sensor['Health (%)']}%)"
@@ -817,39 +907,33 @@ def render_hierarchy_cards():
     </div>
     """, unsafe_allow_html=True)
 
-def create_treemap_visualization(is_dark: bool, plant_id: str) -> go.Figure:
-    """Create treemap showing hierarchical structure with health scores from CSV"""
+@FIGURES.cached
+def create_treemap_visualization(is_dark: bool, plant_id: str, from_date: date, to_date: date) -> go.Figure:
+    """Create treemap showing hierarchical structure with health scores for the selected window"""
     
-    df_plant = df_raw[df_raw['plant_id'] == plant_id].copy()
+    cube = get_window_rollup(from_date, to_date)
     
     labels = [plant_id]
     parents = [""]
     values = [100]
-    health_scores = [int(df_plant['health_score'].mean())]
+    health_scores = [int(cube.summary(plant_id)['mean'])]
     
-    for sub_plant in df_plant['sub_plant'].unique():
+    for sub_plant in cube.children(plant_id):
         labels.append(sub_plant)
         parents.append(plant_id)
-        sp_data = df_plant[df_plant['sub_plant'] == sub_plant]
-        values.append(len(sp_data))
-        health_scores.append(int(sp_data['health_score'].mean()))
+        sp_rollup = cube.summary(plant_id, sub_plant)
+        values.append(sp_rollup['count'])
+        health_scores.append(int(sp_rollup['mean']))
         
-        for equipment in sp_data['equipment'].unique():
+        for equipment in cube.children(plant_id, sub_plant):
             eq_label = f"{equipment[:15]}"
             labels.append(eq_label)
             parents.append(sub_plant)
-            eq_data = sp_data[sp_data['equipment'] == equipment]
-            values.append(len(eq_data))
-            health_scores.append(int(eq_data['health_score'].mean()))
-    
-    colors = []
-    for score in health_scores:
-        if score >= 85:
-            colors.append('#22c55e')
-        elif score >= 70:
-            colors.append('#f59e0b')
-        else:
-            colors.append('#ef4444')
+            eq_rollup = cube.summary(plant_id, sub_plant, equipment)
+            values.append(eq_rollup['count'])
+            health_scores.append(int(eq_rollup['mean']))
+    
+    colors = [STATUS_COLORS[health_band(score)] for score in health_scores]
     
     fig = go.Figure(go.Treemap(
         labels=labels,
@@ -883,6 +967,7 @@ def create_treemap_visualization(is_dark: bool, plant_id: str) -> go.Figure:
     
     return fig
 
+@FIGURES.cached
 def create_network_diagram(is_dark: bool) -> go.Figure:
     """Create network diagram showing relationships"""
     
@@ -967,32 +1052,11 @@ def create_network_diagram(is_dark: bool) -> go.Figure:
 # INITIALIZE ISSUES FROM CSV
 # =====================================================
 def initialize_issues_from_csv() -> None:
-    """Initialize issues from CSV data"""
-    if not st.session_state.data_loaded and df_raw is not None:
-        st.session_state.issues = []
-        
-        df_issues = df_raw[df_raw['completed'] == False].copy()
-        
-        for _, row in df_issues.iterrows():
-            severity_map = {
-                'Critical': '🔴 Critical',
-                'Warning': '🟠 Attention',
-                'Normal': '🟢 Normal'
-            }
-            
-            st.session_state.issues.append({
-                "Sub-Plant": row['sub_plant'],
-                "Equipment": row['equipment'],
-                "Component": row['component'],
-                "Health": int(row['health_score']),
-                "Severity": severity_map.get(row['severity'], '🟠 Attention'),
-                "Action Type": row['maintenance_type'],
-                "Due": row['action_required'],
-                "Done": bool(row['completed']),
-                "Owner": row['owner'],
-            })
-        
-        st.session_state.data_loaded = True
+    """Initialize issues from CSV data (again whenever the pipeline publishes new output)"""
+    data_version = MINING_DATA.version
+    if st.session_state.issues_version != data_version and df_raw is not None:
+        st.session_state.issues = IssueStore(df_raw)
+        st.session_state.issues_version = data_version
 
 # =====================================================
 # MAIN APPLICATION
@@ -1014,21 +1078,22 @@ def main():
     # Header
     st.markdown("## ⛏️ Mining Industry – Plant Health Dashboard")
     
-    # Top controls
+    # Top controls (default window ends at the latest reading, not today)
+    latest = load_time_index().max_date or date.today()
     c1, c2, c3 = st.columns([2, 1, 1])
     with c1:
         selected_plant = st.selectbox("🏭 Select Plant", PLANTS, key="plant_select")
     with c2:
-        from_date = st.date_input("📅 From", date.today() - timedelta(days=7), key="from_date")
+        from_date = st.date_input("📅 From", latest - timedelta(days=7), key="from_date")
     with c3:
-        to_date = st.date_input("📅 To", date.today(), key="to_date")
+        to_date = st.date_input("📅 To", latest, key="to_date")
     
     st.caption(f"Plant: **{selected_plant}** | Period: **{from_date} → {to_date}**")
     st.markdown("---")
     
     # Sidebar navigation
     st.sidebar.title("📂 Navigation")
-    tab = st.sidebar.radio("Select Section", ["📊 Overview", "🏗️ Hierarchy Visualization", "🚨 Alerts", "🛠️ Maintenance"], key="tab_select")
+    tab = st.sidebar.radio("Select Section", TABS, key="tab_select")
     
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🔍 Detailed Insights")
@@ -1080,6 +1145,8 @@ def main():
         selected_plant,
         selected_subplant_insight,
         selected_asset,
+        from_date,
+        to_date,
         theme_colors
      )
 
@@ -1098,18 +1165,22 @@ def main():
     #         key="asset_select"
     #     )
     
-    # Operations Control Panel
-    render_operations_panel()
+    # Operations Control Panel (a fragment can only reach the sidebar through this context)
+    with st.sidebar:
+        render_operations_panel()
     
     # Tab content
     if tab == "📊 Overview":
-        render_overview_tab(selected_plant, to_date, theme_colors)
+        render_overview_tab(selected_plant, from_date, to_date, theme_colors)
     elif tab == "🏗️ Hierarchy Visualization":
-        render_hierarchy_tab(theme_toggle, selected_plant)
+        render_hierarchy_tab(theme_toggle, selected_plant, from_date, to_date)
     elif tab == "🚨 Alerts":
-        render_alerts_tab(selected_plant, to_date)
+        render_alerts_tab(selected_plant, from_date, to_date)
     else:
-        render_maintenance_tab(selected_plant, to_date)
+        render_maintenance_tab(selected_plant, from_date, to_date)
+    
+    # Warm the other tabs for this selection once the run finishes
+    prefetch_other_tabs(tab, selected_plant, from_date, to_date, theme_toggle, theme_colors)
     
     # Footer
     st.markdown("---")
@@ -1121,33 +1192,34 @@ def main():
 # =====================================================
 # OPERATIONS CONTROL PANEL
 # =====================================================
+@st.fragment
+@PREFETCH.in_foreground
 def render_operations_panel() -> None:
-    """Render the operations control panel in sidebar"""
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("## 🚦 Operations Control Panel")
-    st.sidebar.caption(
+    """Render the operations control panel (call inside `with st.sidebar:`)"""
+    st.markdown("---")
+    st.markdown("## 🚦 Operations Control Panel")
+    st.caption(
         "Live view of plant issues, required actions, and completion status"
     )
     
-    open_issues = [i for i in st.session_state.issues if not i["Done"]]
-    critical_issues = [i for i in open_issues if i["Severity"] == "🔴 Critical"]
+    issues = st.session_state.issues
     
-    col1, col2 = st.sidebar.columns(2)
+    col1, col2 = st.columns(2)
     with col1:
-        st.metric("🔴 Critical", len(critical_issues))
+        st.metric("🔴 Critical", issues.critical_count)
     with col2:
-        st.metric("📋 Open", len(open_issues))
+        st.metric("📋 Open", issues.open_count)
     
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 🧾 Issues Requiring Action")
+    st.markdown("---")
+    st.markdown("### 🧾 Issues Requiring Action")
     
-    if not open_issues:
-        st.sidebar.success("✅ All issues under control")
+    if not issues.open_count:
+        st.success("✅ All issues under control")
     else:
-        for idx, issue in enumerate(open_issues):
+        for issue_id, issue in issues.open_records():
             header = f"{issue['Severity']} | {issue['Component']} ({issue['Action Type']})"
             
-            with st.sidebar.expander(header):
+            with st.expander(header):
                 st.markdown(f"""
 **Sub-Plant:** {issue['Sub-Plant']}  
 **Equipment:** {issue['Equipment']}  
@@ -1160,15 +1232,13 @@ def render_operations_panel() -> None:
 {countdown_text('24' if issue['Action Type'] == 'Predictive' else '7')}
 """)
                 
-                if st.button("✔ Mark Completed", key=f"complete_{idx}"):
-                    for i in range(len(st.session_state.issues)):
-                        if st.session_state.issues[i] == issue:
-                            st.session_state.issues[i]["Done"] = True
-                            break
+                if st.button("✔ Mark Completed", key=f"complete_{issue_id}"):
+                    issues.mark_done(issue_id)
+                    # Full rerun: the overview KPIs read the same issue counts
                     st.rerun()
     
-    st.sidebar.markdown("### 🧭 Priority Guide")
-    st.sidebar.markdown("""
+    st.markdown("### 🧭 Priority Guide")
+    st.markdown("""
 🟢 **Proactive**  
 Equipment healthy - Monitor
 
@@ -1182,12 +1252,69 @@ High risk - Handle **immediately**
 # =====================================================
 # HIERARCHY VISUALIZATION TAB
 # =====================================================
-def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
+def render_hierarchy_tab(is_dark: bool, plant_id: str, from_date: date, to_date: date) -> None:
     """Render the hierarchy visualization tab"""
     
     st.markdown("## 🏗️ Mining Operations Monitoring Hierarchy")
     st.markdown("### Understanding How Your Plant is Monitored from Top to Bottom")
     
+    render_hierarchy_visualization(is_dark, plant_id, from_date, to_date)
+    
+    st.markdown("---")
+    st.markdown("### 📖 How to Use This Information")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        #### For Plant Managers
+        - **Monitor** the overall health at Mine Site level
+        - **Identify** which Sub-Plants need attention
+        - **Plan** resources based on maintenance priorities
+        - **Track** improvement over time
+        """)
+    
+    with col2:
+        st.markdown("""
+        #### For Maintenance Teams
+        - **Drill down** to specific equipment issues
+        - **Review** sensor readings for components
+        - **Prioritize** work based on health scores
+        - **Execute** maintenance before failures occur
+        """)
+    
+    st.markdown("---")
+    st.markdown("### 🔄 Complete Monitoring Workflow")
+    
+    st.code("""
+    STEP 1: Sensors collect real-time data (Vibration, Temperature, Pressure)
+           ↓
+    STEP 2: Data is analyzed to calculate Health Score (0-100%)
+           ↓
+    STEP 3: AI system categorizes equipment condition:
+           • 85-100% = 🟢 Healthy (Proactive Monitoring)
+           • 70-84%  = 🟠 Warning (Preventive Maintenance)
+           • 0-69%   = 🔴 Critical (Predictive Maintenance)
+           ↓
+    STEP 4: Maintenance recommendations are generated
+           ↓
+    STEP 5: Alerts are sent to relevant teams
+           ↓
+    STEP 6: Actions are tracked in Operations Control Panel
+    """, language="text")
+    
+    st.markdown("---")
+    st.markdown("### 🎮 Try It Yourself")
+    
+    st.markdown("**Select a component to see its full hierarchy path:**")
+    
+    render_hierarchy_explorer(plant_id, from_date, to_date)
+
+@st.fragment
+@PREFETCH.in_foreground
+def render_hierarchy_visualization(is_dark: bool, plant_id: str, from_date: date, to_date: date) -> None:
+    """Visualization picker and chart; switching views reruns only this part"""
+    
     viz_type = st.radio(
         "Select Visualization Type:",
         ["📊 Interactive Flow Diagram", "🎴 Detailed Level Cards", "🗺️ Hierarchical Health Map", "🔗 Network View"],
@@ -1223,13 +1350,16 @@ def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
         st.markdown("### Real-Time Health Status Across All Levels")
         st.info("🔍 **Larger boxes** = higher level components. **Colors** show health status. Click to zoom in.")
         
-        fig = create_treemap_visualization(is_dark, plant_id)
-        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+        plant_rollup = get_window_rollup(from_date, to_date).summary(plant_id) or {}
+        if plant_rollup:
+            fig = create_treemap_visualization(is_dark, plant_id, from_date, to_date)
+            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+        else:
+            st.info(f"No readings for {plant_id} between {from_date} and {to_date}")
         
-        df_plant = df_raw[df_raw['plant_id'] == plant_id]
-        healthy_count = len(df_plant[df_plant['health_score'] >= 85])
-        warning_count = len(df_plant[(df_plant['health_score'] >= 70) & (df_plant['health_score'] < 85)])
-        critical_count = len(df_plant[df_plant['health_score'] < 70])
+        healthy_count = plant_rollup.get('healthy', 0)
+        warning_count = plant_rollup.get('warning', 0)
+        critical_count = plant_rollup.get('critical', 0)
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1257,54 +1387,11 @@ def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
             st.markdown("🟠 **Amber** = Warning Equipment")
         with col4:
             st.markdown("🔴 **Red** = Critical Equipment")
-    
-    st.markdown("---")
-    st.markdown("### 📖 How to Use This Information")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        #### For Plant Managers
-        - **Monitor** the overall health at Mine Site level
-        - **Identify** which Sub-Plants need attention
-        - **Plan** resources based on maintenance priorities
-        - **Track** improvement over time
-        """)
-    
-    with col2:
-        st.markdown("""
-        #### For Maintenance Teams
-        - **Drill down** to specific equipment issues
-        - **Review** sensor readings for components
-        - **Prioritize** work based on health scores
-        - **Execute** maintenance before failures occur
-        """)
-    
-    st.markdown("---")
-    st.markdown("### 🔄 Complete Monitoring Workflow")
-    
-    st.code("""
-    STEP 1: Sensors collect real-time data (Vibration, Temperature, Pressure)
-           ↓
-    STEP 2: Data is analyzed to calculate Health Score (0-100%)
-           ↓
-    STEP 3: AI system categorizes equipment condition:
-           • 85-100% = 🟢 Healthy (Proactive Monitoring)
-           • 70-84%  = 🟠 Warning (Preventive Maintenance)
-           • 0-69%   = 🔴 Critical (Predictive Maintenance)
-           ↓
-    STEP 4: Maintenance recommendations are generated
-           ↓
-    STEP 5: Alerts are sent to relevant teams
-           ↓
-    STEP 6: Actions are tracked in Operations Control Panel
-    """, language="text")
-    
-    st.markdown("---")
-    st.markdown("### 🎮 Try It Yourself")
-    
-    st.markdown("**Select a component to see its full hierarchy path:**")
+
+@st.fragment
+@PREFETCH.in_foreground
+def render_hierarchy_explorer(plant_id: str, from_date: date, to_date: date) -> None:
+    """Sub-plant / equipment / component pickers and the resulting hierarchy path"""
     
     col1, col2, col3 = st.columns(3)
     
@@ -1329,7 +1416,9 @@ def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
             key="hier_component"
         )
     
-    sample_health = get_health_score(plant_id, selected_subplant, selected_equipment, selected_component)
+    sample_health = get_health_score(
+        plant_id, selected_subplant, selected_equipment, selected_component, from_date, to_date
+    )
     sample_status = status(sample_health)
     sample_maintenance = maintenance(sample_health)
     sample_sensors = SENSOR_MAP.get(selected_component, ["General"])
@@ -1342,7 +1431,7 @@ def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
         <h3>🏭 Mine Site → 🏗️ {selected_subplant} → ⚙️ {selected_equipment} → 🔧 {selected_component}</h3>
         <hr>
         <p><strong>📡 Monitored Sensors:</strong> {', '.join(sample_sensors)}</p>
-        <p><strong>📊 Current Health Score:</strong> <span class="status-badge status-{'healthy' if sample_health >= 85 else 'warning' if sample_health >= 70 else 'critical'}">{sample_health}%</span></p>
+        <p><strong>📊 Current Health Score:</strong> <span class="status-badge status-{HEALTH_BAND_LABELS['status'][health_band(sample_health)].lower()}">{sample_health}%</span></p>
         <p><strong>🎯 Status:</strong> {sample_status}</p>
         <p><strong>🛠️ Maintenance Type:</strong> {sample_maintenance}</p>
         <p><strong>⚡ Recommended Action:</strong> {action(sample_health)}</p>
@@ -1352,30 +1441,71 @@ def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
 # =====================================================
 # TAB RENDERERS
 # =====================================================
-def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict) -> None:
+def render_overview_tab(selected_plant: str, from_date: date, to_date: date, theme_colors: Dict) -> None:
     """Render overview tab content"""
-    st.subheader("🏭 Overall Plant Health")
+    render_overview_kpis(selected_plant, from_date, to_date, theme_colors)
+    render_component_drilldown(selected_plant, from_date, to_date)
+    
+    issues = st.session_state.issues
+    
+    st.markdown("### ⚠️ Top Risk Areas (Quick View)")
+    
+    if issues.open_count:
+        st.dataframe(
+            issues.open_frame(
+                ["Sub-Plant", "Equipment", "Component", "Severity", "Action Type", "Due"]
+            ),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.success("✅ No high-risk areas identified")
     
-    df_plant = df_raw[df_raw['plant_id'] == selected_plant].copy()
+    st.markdown("### 🏭 Mining Operations Snapshot")
     
+    try:
+        st.image(
+            "images/img1.jpg",
+            caption="Mining plant operations monitored through real-time systems",
+            use_container_width=True
+        )
+    except:
+        st.info("📷 Operations image not available - Add 'img1.jpg' to your project directory")
+
+def overview_scores(cube: RollupCube, selected_plant: str) -> Tuple[Dict[str, int], int, pd.DataFrame]:
+    """Sub-plant scores, plant health and the sub-plant bar data for a window cube"""
     sub_scores = {}
     for sp in PLANT_STRUCTURE.keys():
-        sp_data = df_plant[df_plant['sub_plant'] == sp]
-        if not sp_data.empty:
-            sub_scores[sp] = int(sp_data['health_score'].mean())
+        sp_rollup = cube.summary(selected_plant, sp)
+        if sp_rollup:
+            sub_scores[sp] = int(sp_rollup['mean'])
         else:
             sub_scores[sp] = 85
     
-    plant_health = int(df_plant['health_score'].mean()) if not df_plant.empty else 85
+    plant_rollup = cube.summary(selected_plant)
+    plant_health = int(plant_rollup['mean']) if plant_rollup else 85
+    
+    df_sub = pd.DataFrame({
+        "Sub-Plant": sub_scores.keys(),
+        "Health (%)": sub_scores.values()
+    })
+    
+    return sub_scores, plant_health, df_sub
+
+def render_overview_kpis(selected_plant: str, from_date: date, to_date: date, theme_colors: Dict) -> None:
+    """KPI row, health donuts, sub-plant bar and trend for the selected window"""
+    st.subheader("🏭 Overall Plant Health")
+    
+    cube = get_window_rollup(from_date, to_date)
+    sub_scores, plant_health, df_sub = overview_scores(cube, selected_plant)
     
-    open_issues = [i for i in st.session_state.issues if not i["Done"]]
-    critical_issues = [i for i in open_issues if i["Severity"] == "🔴 Critical"]
+    issues = st.session_state.issues
     
     k1, k2, k3, k4 = st.columns(4)
     k1.metric("Plant Health", f"{plant_health}%")
     k2.metric("Status", status(plant_health))
     k3.metric("Maintenance Mode", maintenance(plant_health))
-    k4.metric("Critical Areas", sum(1 for v in sub_scores.values() if v < 70))
+    k4.metric("Critical Areas", sum(1 for v in sub_scores.values() if health_band(v) == CRITICAL_BAND))
     
     st.markdown("### 📊 Visual Health Indicators")
     
@@ -1391,7 +1521,7 @@ def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict)
     with d2:
         st.plotly_chart(
             create_donut_chart(
-                max(30, 100 - len(critical_issues) * 10),
+                max(30, 100 - issues.critical_count * 10),
                 "Risk Buffer",
                 theme_colors
             ),
@@ -1402,7 +1532,7 @@ def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict)
     with d3:
         st.plotly_chart(
             create_donut_chart(
-                max(40, 100 - len(open_issues) * 5),
+                max(40, 100 - issues.open_count * 5),
                 "Operational Stability",
                 theme_colors
             ),
@@ -1410,17 +1540,27 @@ def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict)
             config={'displayModeBar': False}
         )
     
-    df_sub = pd.DataFrame({
-        "Sub-Plant": sub_scores.keys(),
-        "Health (%)": sub_scores.values()
-    })
-    
     st.plotly_chart(
         create_bar_chart(df_sub, "Sub-Plant", "Health (%)", "Sub-Plant Health"),
         use_container_width=True,
         config={'displayModeBar': False}
     )
     
+    st.markdown("### 📈 Health Trend")
+    trend = load_health_history(selected_plant, from_date, to_date)
+    if not trend.empty:
+        st.plotly_chart(
+            create_trend_chart(trend, "run_at", "health_score", "sub_plant", "Sub-Plant Health by Pipeline Run"),
+            use_container_width=True,
+            config={'displayModeBar': False}
+        )
+    else:
+        st.info(f"No stored pipeline runs for {selected_plant} between {from_date} and {to_date}")
+
+@st.fragment
+@PREFETCH.in_foreground
+def render_component_drilldown(selected_plant: str, from_date: date, to_date: date) -> None:
+    """Sub-Plant → Components table; picking a sub-plant reruns only this part"""
     st.markdown("### 🏗️ Sub-Plant → Components")
     selected_subplant = st.selectbox(
         "Select Sub-Plant",
@@ -1431,7 +1571,7 @@ def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict)
     rows = []
     for eq, comps in PLANT_STRUCTURE[selected_subplant].items():
         for comp in comps:
-            score = get_health_score(selected_plant, selected_subplant, eq, comp)
+            score = get_health_score(selected_plant, selected_subplant, eq, comp, from_date, to_date)
             rows.append({
                 "Equipment": eq,
                 "Component": comp,
@@ -1442,14 +1582,27 @@ def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict)
     df_comp = pd.DataFrame(rows)
     st.dataframe(df_comp, use_container_width=True, hide_index=True)
     
+    render_sensor_drilldown(selected_plant, selected_subplant, df_comp["Component"].unique().tolist(), from_date, to_date)
+
+@st.fragment
+@PREFETCH.in_foreground
+def render_sensor_drilldown(
+    selected_plant: str,
+    selected_subplant: str,
+    components: List[str],
+    from_date: date,
+    to_date: date
+) -> None:
+    """Component → Sensors table; picking a component reruns only this part"""
     st.markdown("### 🔩 Component → Sensors")
     selected_component = st.selectbox(
         "Select Component",
-        df_comp["Component"].unique(),
+        components,
         key="component_select"
     )
     
     sensor_rows = []
+    df_plant = get_plant_window(selected_plant, from_date, to_date)
     comp_data = df_plant[
         (df_plant['sub_plant'] == selected_subplant) &
         (df_plant['component'] == selected_component)
@@ -1467,90 +1620,129 @@ def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict)
         st.dataframe(pd.DataFrame(sensor_rows), use_container_width=True, hide_index=True)
     else:
         st.info("No sensor data available for this component")
+
+def severity_label(status_text: str) -> str:
+    """Prefix a pipeline status with its traffic-light icon"""
+    labels = HEALTH_BAND_LABELS['status']
+    band = labels.index(status_text) if status_text in labels else CRITICAL_BAND
+    return f"{STATUS_ICONS[band]} {status_text}"
+
+@st.fragment
+@PREFETCH.in_foreground
+def render_paged_table(
+    key: str,
+    df: pd.DataFrame,
+    columns: Dict[str, str],
+    filter_columns: List[str],
+    where=None,
+    formatters: Dict = None
+) -> None:
+    """
+    Filterable, sortable table showing one page of df at a time
+    columns maps source column -> display label. Filtering, sorting and paging
+    run server-side over row positions; only the visible page, projected to
+    `columns`, is formatted and sent to the browser. Paging reruns only this
+    fragment.
+    """
+    base_rows = select_rows(df, where)
+    labels = {label: column for column, label in columns.items()}
+    
+    controls = st.columns(len(filter_columns) + 3)
+    filters = {}
+    for control, column in zip(controls, filter_columns):
+        with control:
+            options = sorted(map(str, df[column].iloc[base_rows].unique()))
+            filters[column] = st.multiselect(columns[column], options, key=f"{key}_filter_{column}")
+    with controls[-3]:
+        sort_label = st.selectbox(
+            "Sort by", list(labels), index=None, placeholder="Window order", key=f"{key}_sort"
+        )
+    with controls[-2]:
+        descending = st.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    with controls[-1]:
+        page_size = st.selectbox(
+            "Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{key}_page_size"
+        )
     
-    st.markdown("### ⚠️ Top Risk Areas (Quick View)")
+    rows = select_rows(
+        df,
+        where,
+        filters,
+        sort_by=labels.get(sort_label),
+        ascending=not descending
+    )
+    if not len(rows):
+        st.info("No rows match the selected filters")
+        return
     
-    if open_issues:
-        st.dataframe(
-            pd.DataFrame(open_issues)[
-                ["Sub-Plant", "Equipment", "Component", "Severity", "Action Type", "Due"]
-            ],
-            use_container_width=True,
-            hide_index=True
-        )
-    else:
-        st.success("✅ No high-risk areas identified")
+    pages = page_count(len(rows), page_size)
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key=f"{key}_page")
     
-    st.markdown("### 🏭 Mining Operations Snapshot")
+    display = take_page(df, rows, list(columns), page, page_size)
+    display.columns = list(columns.values())
+    for label, formatter in (formatters or {}).items():
+        display[label] = formatter(display[label])
     
-    try:
-        st.image(
-            "images/img1.jpg",
-            caption="Mining plant operations monitored through real-time systems",
-            use_container_width=True
-        )
-    except:
-        st.info("📷 Operations image not available - Add 'img1.jpg' to your project directory")
+    st.dataframe(display, use_container_width=True, hide_index=True)
+    first = (page - 1) * page_size + 1
+    st.caption(f"Rows {first}–{first + len(display) - 1} of {len(rows)}")
 
-def render_alerts_tab(selected_plant: str, to_date: date) -> None:
+def render_alerts_tab(selected_plant: str, from_date: date, to_date: date) -> None:
     """Render alerts tab content"""
     st.subheader("🚨 Plant → Sub-Plant → Component → Sensor Alerts")
     
-    df_alerts = df_raw[
-        (df_raw['plant_id'] == selected_plant) &
-        (df_raw['health_score'] < 75)
-    ].copy()
-    
-    if not df_alerts.empty:
-        alert_display = df_alerts[[
-            'plant_id', 'sub_plant', 'equipment', 'component', 
-            'sensor_type', 'status', 'maintenance_type', 'action_required'
-        ]].copy()
-        
-        alert_display.columns = [
-            'Plant', 'Sub-Plant', 'Equipment', 'Component',
-            'Sensor', 'Severity', 'Maintenance', 'Action'
-        ]
-        
-        alert_display['Severity'] = alert_display['Severity'].apply(
-            lambda x: f"🟢 {x}" if x == 'Healthy' else f"🟠 {x}" if x == 'Warning' else f"🔴 {x}"
+    df_window = get_plant_window(selected_plant, from_date, to_date)
+    alert_mask = (df_window['health_score'] < 75).to_numpy()
+    
+    if alert_mask.any():
+        render_paged_table(
+            "alerts",
+            df_window,
+            {
+                'plant_id': 'Plant', 'sub_plant': 'Sub-Plant', 'equipment': 'Equipment',
+                'component': 'Component', 'sensor_type': 'Sensor', 'status': 'Severity',
+                'maintenance_type': 'Maintenance', 'action_required': 'Action'
+            },
+            ['sub_plant', 'status'],
+            where=alert_mask,
+            formatters={'Severity': lambda values: values.astype(str).map(severity_label)}
         )
-        
-        st.dataframe(alert_display, use_container_width=True, hide_index=True)
     else:
         st.success("✅ No active alerts")
 
 
 
-def render_maintenance_tab(selected_plant: str, to_date: date) -> None:
+def maintenance_mix(df_maint: pd.DataFrame) -> pd.DataFrame:
+    """Readings per maintenance type, for the strategy pie"""
+    maint_counts = df_maint['maintenance_type'].value_counts()
+    return pd.DataFrame({
+        'Maintenance Type': maint_counts.index,
+        'Count': maint_counts.values
+    })
+
+def render_maintenance_tab(selected_plant: str, from_date: date, to_date: date) -> None:
     """Render maintenance tab content"""
     st.subheader("🛠️ Maintenance Planning (Industry View)")
     
-    df_maint = df_raw[df_raw['plant_id'] == selected_plant].copy()
+    df_maint = get_plant_window(selected_plant, from_date, to_date)
     
     if not df_maint.empty:
-        maint_display = df_maint[[
-            'sub_plant', 'equipment', 'component', 'health_score',
-            'maintenance_type', 'priority', 'due_date'
-        ]].copy()
-        
-        maint_display.columns = [
-            'Sub-Plant', 'Equipment', 'Component', 'Health (%)',
-            'Maintenance Type', 'Priority', 'Planned Date'
-        ]
-        
-        maint_display['Planned Date'] = pd.to_datetime(maint_display['Planned Date']).dt.date
-        
-        st.dataframe(maint_display, use_container_width=True, hide_index=True)
-        
-        maint_counts = df_maint['maintenance_type'].value_counts()
-        maint_df = pd.DataFrame({
-            'Maintenance Type': maint_counts.index,
-            'Count': maint_counts.values
-        })
+        render_paged_table(
+            "maint",
+            df_maint,
+            {
+                'sub_plant': 'Sub-Plant', 'equipment': 'Equipment', 'component': 'Component',
+                'health_score': 'Health (%)', 'maintenance_type': 'Maintenance Type',
+                'priority': 'Priority', 'due_date': 'Planned Date'
+            },
+            ['sub_plant', 'maintenance_type', 'priority'],
+            formatters={'Planned Date': lambda values: pd.to_datetime(values).dt.date}
+        )
         
         st.plotly_chart(
-            create_pie_chart(maint_df, "Maintenance Type", "Maintenance Strategy Distribution"),
+            create_pie_chart(maintenance_mix(df_maint), "Maintenance Type", "Maintenance Strategy Distribution"),
             use_container_width=True,
             config={'displayModeBar': False}
         )
@@ -1562,9 +1754,102 @@ def render_maintenance_tab(selected_plant: str, to_date: date) -> None:
         "avoid unplanned downtime."
     )
 
+# =====================================================
+# BACKGROUND PREFETCH
+# =====================================================
+def warm_overview(
+    selected_plant: str,
+    from_date: date,
+    to_date: date,
+    theme_colors: Dict,
+    critical_count: int,
+    open_count: int
+) -> Iterator[None]:
+    """Fill the caches the overview tab reads: window rollup, plant window, trend and figures"""
+    cube = get_window_rollup(from_date, to_date)
+    _, plant_health, df_sub = overview_scores(cube, selected_plant)
+    yield
+    create_donut_chart(plant_health, "Overall Plant Health", theme_colors)
+    create_donut_chart(max(30, 100 - critical_count * 10), "Risk Buffer", theme_colors)
+    create_donut_chart(max(40, 100 - open_count * 5), "Operational Stability", theme_colors)
+    create_bar_chart(df_sub, "Sub-Plant", "Health (%)", "Sub-Plant Health")
+    yield
+    get_plant_window(selected_plant, from_date, to_date)
+    yield
+    
+    trend = load_health_history(selected_plant, from_date, to_date)
+    if not trend.empty:
+        create_trend_chart(trend, "run_at", "health_score", "sub_plant", "Sub-Plant Health by Pipeline Run")
+
+def warm_hierarchy(selected_plant: str, from_date: date, to_date: date, is_dark: bool) -> Iterator[None]:
+    """Fill the caches the hierarchy tab reads: every visualization and the windowed hierarchy index"""
+    create_hierarchy_flowchart(is_dark)
+    yield
+    if get_window_rollup(from_date, to_date).summary(selected_plant):
+        create_treemap_visualization(is_dark, selected_plant, from_date, to_date)
+    yield
+    create_network_diagram(is_dark)
+    yield
+    get_plant_hierarchy(selected_plant, from_date, to_date)
+
+def warm_alerts(selected_plant: str, from_date: date, to_date: date) -> None:
+    """Fill the plant window the alerts table pages over"""
+    get_plant_window(selected_plant, from_date, to_date)
+
+def warm_maintenance(selected_plant: str, from_date: date, to_date: date) -> Iterator[None]:
+    """Fill the plant window and the maintenance strategy pie"""
+    df_maint = get_plant_window(selected_plant, from_date, to_date)
+    yield
+    if not df_maint.empty:
+        create_pie_chart(maintenance_mix(df_maint), "Maintenance Type", "Maintenance Strategy Distribution")
+
+def prefetch_other_tabs(
+    active_tab: str,
+    selected_plant: str,
+    from_date: date,
+    to_date: date,
+    is_dark: bool,
+    theme_colors: Dict
+) -> None:
+    """
+    Queue warm-up of the tabs not on screen, next tab in the sidebar first
+    Jobs are keyed per session and tab, so a newer selection replaces a stale
+    one that has not run yet. The worker runs them once no script run is
+    active, pausing at each yield of a warm_* step while one is, and carries
+    this session's context so the st caches behave as they do in the foreground.
+    """
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    
+    issues = st.session_state.issues
+    jobs = {
+        "📊 Overview": (warm_overview, selected_plant, from_date, to_date, theme_colors,
+                       issues.critical_count, issues.open_count),
+        "🏗️ Hierarchy Visualization": (warm_hierarchy, selected_plant, from_date, to_date, is_dark),
+        "🚨 Alerts": (warm_alerts, selected_plant, from_date, to_date),
+        "🛠️ Maintenance": (warm_maintenance, selected_plant, from_date, to_date),
+    }
+    
+    def in_session(warm, *args):
+        def job():
+            # The worker thread is shared by every session; hold this one's context only while its job runs
+            worker = threading.current_thread()
+            add_script_run_ctx(worker, ctx)
+            try:
+                yield from warm(*args) or ()
+            finally:
+                setattr(worker, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+        return job
+    
+    start = TABS.index(active_tab)
+    for tab in TABS[start + 1:] + TABS[:start]:
+        PREFETCH.submit((ctx.session_id, tab), in_session(*jobs[tab]))
+
 # =====================================================
 # RUN APPLICATION
 # =====================================================
 if __name__ == "__main__":
 
-    main()
+    with PREFETCH.foreground():
+        main()
@@ -12,7 +12,19 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 from PIL import Image
+from pmanalysis.datastore import MINING_DATA, HierarchyIndex, TimeRangeIndex, history_version, read_history
+from pmanalysis.issues import IssueStore
+from pmanalysis.prefetch import PREFETCH
+from pmanalysis.rollup import RollupCube
+from pmanalysis.rules import (
+    HEALTH_BAND_LABELS, STATUS_ICONS, STATUS_COLORS, RISK_LABELS, RISK_ICONS,
+    CRITICAL_BAND, WARNING_BAND, HEALTHY_BAND, health_band, risk_code
+)
+from pmanalysis.tables import DEFAULT_PAGE_SIZE, PAGE_SIZES, page_count, select_rows, take_page
+import threading
 import time
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
 
 # =====================================================
 # PAGE CONFIG
@@ -307,9 +319,17 @@ def show_clock(title: str = "Please Wait…", subtitle: str = "Processing your r
     return ph
 
 
-def with_clock(title: str, subtitle: str, delay: float = 0.8):
+# Work that finishes faster than this never shows the overlay (no flicker)
+CLOCK_DELAY = 0.3
+# Once shown, the overlay stays up at least this long so it doesn't blink off
+CLOCK_MIN_VISIBLE = 0.5
+
+
+def with_clock(title: str, subtitle: str, delay: float = CLOCK_DELAY, min_visible: float = CLOCK_MIN_VISIBLE):
     """
-    Context manager: shows clock on enter, hides on exit.
+    Context manager: shows the clock only if the wrapped work is still running
+    after `delay` seconds, and hides it on exit (keeping it up for at least
+    `min_visible` seconds once it has appeared).
 
     Usage:
         with with_clock("Loading…", "Fetching data…"):
@@ -317,9 +337,30 @@ def with_clock(title: str, subtitle: str, delay: float = 0.8):
     """
     class _ClockCtx:
         def __enter__(self):
-            self._ph = show_clock(title, subtitle)
+            self._ph = st.empty()
+            self._lock = threading.Lock()
+            self._done = False
+            self._shown_at = None
+            # The timer thread draws into this session's placeholder
+            self._timer = threading.Timer(delay, self._show)
+            add_script_run_ctx(self._timer, get_script_run_ctx())
+            self._timer.start()
             return self
+        def _show(self):
+            with self._lock:
+                if not self._done:
+                    self._ph.markdown(
+                        CLOCK_HTML.format(css=LOADING_CSS, title=title, subtitle=subtitle),
+                        unsafe_allow_html=True,
+                    )
+                    self._shown_at = time.monotonic()
         def __exit__(self, *_):
+            self._timer.cancel()
+            with self._lock:
+                self._done = True
+                shown_at = self._shown_at
+            if shown_at is not None:
+                time.sleep(max(0.0, shown_at + min_visible - time.monotonic()))
             self._ph.empty()
     return _ClockCtx()
 
@@ -350,70 +391,89 @@ st.markdown(LOADING_CSS, unsafe_allow_html=True)
 # SESSION STATE INITIALIZATION
 # =====================================================
 if "issues" not in st.session_state:
-    st.session_state.issues = []
+    st.session_state.issues = None
 if "theme" not in st.session_state:
     st.session_state.theme = False
-if "data_loaded" not in st.session_state:
-    st.session_state.data_loaded = False
-if "loading" not in st.session_state:
-    st.session_state.loading = False
-
-# Track previous selections so we can fire the loader on change
-if "_prev_plant" not in st.session_state:
-    st.session_state._prev_plant = None
-if "_prev_tab" not in st.session_state:
-    st.session_state._prev_tab = None
-if "_prev_view" not in st.session_state:
-    st.session_state._prev_view = None
-if "_prev_subplant" not in st.session_state:
-    st.session_state._prev_subplant = None
-if "_prev_asset" not in st.session_state:
-    st.session_state._prev_asset = None
-if "_prev_subplant_drilldown" not in st.session_state:
-    st.session_state._prev_subplant_drilldown = None
-if "_prev_component" not in st.session_state:
-    st.session_state._prev_component = None
+if "issues_version" not in st.session_state:
+    st.session_state.issues_version = None
 
 # =====================================================
-# DATA LOADING — cached with TTL for latency
+# DATA LOADING — one shared frame per process, reloaded when the files change
 # =====================================================
-@st.cache_data(ttl=300, show_spinner=False)
 def load_data():
     try:
-        df = pd.read_csv('output/mining_data.csv')
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['due_date']  = pd.to_datetime(df['due_date'])
-        df['_status_label'] = df['health_score'].apply(
-            lambda s: 'Healthy' if s >= 85 else ('Warning' if s >= 70 else 'Critical')
-        )
-        return df
+        return MINING_DATA.get()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_plant_data(plant_id: str):
-    return df_raw[df_raw['plant_id'] == plant_id].copy() if df_raw is not None else pd.DataFrame()
+def load_time_index():
+    # Sorted by (plant_id, timestamp) so each window is two binary searches
+    return MINING_DATA.derive('time_index', TimeRangeIndex) if df_raw is not None else None
+
+
+def load_rollup_cube():
+    # Health mean/min/count and status counts per hierarchy level, one groupby per data version
+    return MINING_DATA.derive('rollup_cube', RollupCube) if df_raw is not None else None
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _window_rollup(data_version, from_date: date, to_date: date):
+    return load_rollup_cube().window(from_date, to_date)
+
+
+def get_window_rollup(from_date: date, to_date: date):
+    return _window_rollup(MINING_DATA.version, from_date, to_date)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _plant_window(data_version, plant_id: str, from_date: date, to_date: date):
+    index = load_time_index()
+    return index.window(plant_id, from_date, to_date) if index is not None else pd.DataFrame()
+
+
+def get_plant_window(plant_id: str, from_date: date, to_date: date):
+    # Shared read-only slice; copy before mutating
+    return _plant_window(MINING_DATA.version, plant_id, from_date, to_date)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _plant_hierarchy(data_version, plant_id: str, from_date: date, to_date: date):
+    return HierarchyIndex(get_plant_window(plant_id, from_date, to_date))
+
+
+def get_plant_hierarchy(plant_id: str, from_date: date, to_date: date):
+    # Path lookups over the same window the overview KPIs aggregate
+    return _plant_hierarchy(MINING_DATA.version, plant_id, from_date, to_date)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _health_history(store_version, plant_id: str, from_date: date, to_date: date) -> pd.DataFrame:
+    try:
+        history = read_history(plant_id=plant_id, readings_from=from_date, readings_to=to_date,
+                               columns=['run_at', 'sub_plant', 'health_score'])
+    except ImportError:
+        return pd.DataFrame()
+    if history.empty:
+        return history
+    return history.groupby(['run_at', 'sub_plant'], observed=True)['health_score'].mean().reset_index()
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_sub_plant_data(plant_id: str, sub_plant: str):
-    return df_raw[
-        (df_raw['plant_id'] == plant_id) &
-        (df_raw['sub_plant'] == sub_plant)
-    ].copy() if df_raw is not None else pd.DataFrame()
+def load_health_history(plant_id: str, from_date: date, to_date: date) -> pd.DataFrame:
+    # Re-read only after the pipeline appends a run to the history store
+    return _health_history(history_version(), plant_id, from_date, to_date)
 
 
-# ── Initial data load with clock overlay ─────────────
-_loading_placeholder = show_clock("Initialising Dashboard", "Connecting to mining data streams…")
-df_raw = load_data()
-_loading_placeholder.empty()
+# ── Data load; the clock appears only while a (re)load is actually slow ──
+with with_clock("Initialising Dashboard", "Connecting to mining data streams…"):
+    df_raw = load_data()
 
 # =====================================================
 # CONSTANTS & DATA STRUCTURES
 # =====================================================
 PLANTS = [f"Plant-{i}" for i in range(1, 6)]
+TABS = ["📊 Overview","🏗️ Hierarchy Visualization","🚨 Alerts","🛠️ Maintenance"]
 
 PLANT_STRUCTURE = {
     "Crushing Plant": {
@@ -614,38 +674,27 @@ def apply_theme(is_dark: bool) -> None:
 # =====================================================
 # UTILITY FUNCTIONS (CSV-based)
 # =====================================================
-@st.cache_data(ttl=300, show_spinner=False)
-def get_health_score(plant_id: str, sub_plant: str, equipment: str, component: str) -> int:
+def get_health_score(plant_id: str, sub_plant: str, equipment: str, component: str,
+                     from_date: date, to_date: date) -> int:
     if df_raw is None:
         return 85
-    filtered = df_raw[
-        (df_raw['plant_id'] == plant_id) &
-        (df_raw['sub_plant'] == sub_plant) &
-        (df_raw['equipment'] == equipment) &
-        (df_raw['component'] == component)
-    ]
-    return int(filtered['health_score'].iloc[0]) if not filtered.empty else 85
+    score = get_plant_hierarchy(plant_id, from_date, to_date).last(plant_id, sub_plant, equipment, component)
+    return int(score) if score is not None else 85
 
 
 def status(score: int) -> str:
-    if score >= 85: return "🟢 Healthy"
-    elif score >= 70: return "🟠 Warning"
-    return "🔴 Critical"
+    band = health_band(score)
+    return f"{STATUS_ICONS[band]} {HEALTH_BAND_LABELS['status'][band]}"
 
 def maintenance(score: int) -> str:
-    if score >= 85: return "Proactive"
-    elif score >= 70: return "Preventive"
-    return "Predictive"
+    return HEALTH_BAND_LABELS['maintenance_type'][health_band(score)]
 
 def action(score: int) -> str:
-    if score >= 85: return "Continue monitoring"
-    elif score >= 70: return "Plan inspection"
-    return "Immediate inspection & shutdown planning"
+    return HEALTH_BAND_LABELS['action_required'][health_band(score)]
 
 def ml_risk_prediction(score: int) -> str:
-    if score < 65: return "🔴 High Failure Risk"
-    elif score < 80: return "🟠 Medium Failure Risk"
-    return "🟢 Low Failure Risk"
+    code = risk_code(score)
+    return f"{RISK_ICONS[code]} {RISK_LABELS[code]}"
 
 def countdown_text(due_text: str) -> str:
     if "24" in due_text: return "⏱ Less than 24 hours remaining"
@@ -655,7 +704,9 @@ def countdown_text(due_text: str) -> str:
 # =====================================================
 # ENHANCED VISUALIZATION FUNCTIONS
 # =====================================================
-@st.cache_data(ttl=300, show_spinner=False)
+# Figure builders below are pure functions of their arguments; data-dependent
+# ones take the data version, so a new pipeline output misses the cache.
+@st.cache_data(max_entries=256, show_spinner=False)
 def create_donut_chart(value: int, title: str, success: str, danger: str) -> go.Figure:
     fig = go.Figure(data=[go.Pie(
         values=[value, 100 - value],
@@ -675,7 +726,7 @@ def create_donut_chart(value: int, title: str, success: str, danger: str) -> go.
     )
     return fig
 
-@st.cache_data(ttl=300, show_spinner=False)
+@st.cache_data(max_entries=128, show_spinner=False)
 def _build_bar_chart(x_data: tuple, y_data: tuple, x_label: str, y_label: str, title: str) -> go.Figure:
     df = pd.DataFrame({x_label: list(x_data), y_label: list(y_data)})
     fig = px.bar(df, x=x_label, y=y_label, color=y_label,
@@ -694,7 +745,7 @@ def _build_bar_chart(x_data: tuple, y_data: tuple, x_label: str, y_label: str, t
 def create_bar_chart(df: pd.DataFrame, x: str, y: str, title: str) -> go.Figure:
     return _build_bar_chart(tuple(df[x]), tuple(df[y]), x, y, title)
 
-@st.cache_data(ttl=300, show_spinner=False)
+@st.cache_data(max_entries=128, show_spinner=False)
 def _build_pie_chart(names: tuple, title: str) -> go.Figure:
     df = pd.DataFrame({'name': list(names)})
     fig = px.pie(df, names='name', title=title,
@@ -710,10 +761,22 @@ def _build_pie_chart(names: tuple, title: str) -> go.Figure:
 def create_pie_chart(df: pd.DataFrame, names: str, title: str) -> go.Figure:
     return _build_pie_chart(tuple(df[names]), title)
 
+def create_trend_chart(df: pd.DataFrame, x: str, y: str, color: str, title: str) -> go.Figure:
+    fig = px.line(df, x=x, y=y, color=color, markers=True, title=title)
+    fig.update_layout(
+        height=400,
+        margin=dict(t=50, b=50, l=50, r=50),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor='rgba(128,128,128,0.1)')
+    )
+    return fig
+
 # =====================================================
 # HIERARCHY VISUALIZATION FUNCTIONS
 # =====================================================
-@st.cache_data(ttl=600, show_spinner=False)
+@st.cache_data(show_spinner=False)
 def create_hierarchy_flowchart(is_dark: bool) -> go.Figure:
     node_labels = [
         "🏭 Mine Site","🏗️ Sub-Plant","⚙️ Equipment","🔧 Component",
@@ -749,21 +812,18 @@ def create_hierarchy_flowchart(is_dark: bool) -> go.Figure:
     return fig
 
 
-def render_subplant_asset_insights(selected_plant, selected_subplant, selected_asset, theme_colors):
+def render_subplant_asset_insights(selected_plant, selected_subplant, selected_asset, from_date, to_date, theme_colors):
     st.subheader(f"🚛 Asset Intelligence – {selected_asset}")
 
     with with_clock("Loading Asset Data", f"Fetching intelligence for {selected_asset}…"):
-        df_filtered = df_raw[
-            (df_raw["plant_id"] == selected_plant) &
-            (df_raw["sub_plant"] == selected_subplant) &
-            (df_raw["equipment"] == selected_asset)
-        ].copy()
-
-    if df_filtered.empty:
-        st.warning("No data available for this asset")
+        cube = get_window_rollup(from_date, to_date)
+        asset_rollup = cube.summary(selected_plant, selected_subplant, selected_asset)
+
+    if asset_rollup is None:
+        st.warning(f"No data available for this asset between {from_date} and {to_date}")
         return
 
-    asset_health = int(df_filtered["health_score"].mean())
+    asset_health = int(asset_rollup["mean"])
     k1, k2, k3 = st.columns(3)
     k1.metric("Asset Health", f"{asset_health}%")
     k2.metric("Status", status(asset_health))
@@ -776,8 +836,8 @@ def render_subplant_asset_insights(selected_plant, selected_subplant, selected_a
 
     st.markdown("### 🔩 Component Health Overview")
     comp_df = (
-        df_filtered.groupby("component")["health_score"].mean()
-        .reset_index().rename(columns={"health_score": "Health (%)"})
+        cube.breakdown(selected_plant, selected_subplant, selected_asset)
+        .sort_values("component", ignore_index=True)[["component", "mean"]].rename(columns={"mean": "Health (%)"})
     )
     comp_df["Health (%)"] = comp_df["Health (%)"].astype(int)
     comp_df["Status"] = comp_df["Health (%)"].apply(status)
@@ -789,26 +849,28 @@ def render_subplant_asset_insights(selected_plant, selected_subplant, selected_a
 
     avg_comp_health = comp_df["Health (%)"].mean()
     st.markdown("### 🧠 Component Intelligence Insight")
-    if avg_comp_health >= 85:
+    comp_band = health_band(avg_comp_health)
+    if comp_band == HEALTHY_BAND:
         st.success("All components operating in stable condition.")
-    elif 70 <= avg_comp_health < 85:
+    elif comp_band == WARNING_BAND:
         st.warning("Moderate wear detected. Preventive maintenance recommended.")
     else:
         st.error("Critical component degradation detected. Immediate action required.")
 
+    render_asset_sensor_drilldown(selected_plant, selected_subplant, selected_asset, comp_df["component"].tolist(),
+                                  from_date, to_date)
+
+
+# Picking a component reruns only the sensor sections, not the whole asset view
+@st.fragment
+@PREFETCH.in_foreground
+def render_asset_sensor_drilldown(selected_plant, selected_subplant, selected_asset, components, from_date, to_date):
     st.markdown("### 📡 Sensor-Level Intelligence")
-    selected_component = st.selectbox("Select Component", comp_df["component"], key="asset_component_select")
-
-    # Show clock when component changes
-    if st.session_state.get("_prev_asset_comp") != selected_component:
-        _prev = st.session_state.get("_prev_asset_comp")
-        st.session_state["_prev_asset_comp"] = selected_component
-        if _prev is not None:
-            ph = show_clock("Loading Sensor Data", f"Fetching readings for {selected_component}…")
-            time.sleep(0.7)
-            ph.empty()
-
-    sensor_df = df_filtered[df_filtered["component"] == selected_component]
+    selected_component = st.selectbox("Select Component", components, key="asset_component_select")
+
+    sensor_df = get_plant_hierarchy(selected_plant, from_date, to_date).rows(
+        selected_plant, selected_subplant, selected_asset, selected_component
+    )
     if sensor_df.empty:
         st.info("No sensor data available")
         return
@@ -822,9 +884,10 @@ def render_subplant_asset_insights(selected_plant, selected_subplant, selected_a
     worst_sensor = sensor_display.sort_values("Health (%)").iloc[0]
     avg_sensor_health = sensor_display["Health (%)"].mean()
     st.markdown("### 🚨 Sensor Risk Insight")
-    if avg_sensor_health >= 85:
+    sensor_band = health_band(avg_sensor_health)
+    if sensor_band == HEALTHY_BAND:
         st.success(f"All sensors stable. Lowest: {worst_sensor['Sensor']} ({worst_sensor['Health (%)']}%)")
-    elif 70 <= avg_sensor_health < 85:
+    elif sensor_band == WARNING_BAND:
         st.warning(f"Sensor degradation. Monitor {worst_sensor['Sensor']} ({worst_sensor['Health (%)']}%)")
     else:
         st.error(f"Critical! {worst_sensor['Sensor']} at {worst_sensor['Health (%)']}%. Immediate maintenance.")
@@ -885,20 +948,20 @@ def render_hierarchy_cards():
     """, unsafe_allow_html=True)
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def create_treemap_visualization(is_dark: bool, plant_id: str) -> go.Figure:
-    df_plant = df_raw[df_raw['plant_id'] == plant_id].copy()
+@st.cache_data(max_entries=32, show_spinner=False)
+def create_treemap_visualization(is_dark: bool, plant_id: str, from_date: date, to_date: date, data_version) -> go.Figure:
+    cube = get_window_rollup(from_date, to_date)
     labels = [plant_id]; parents = [""]; values = [100]
-    health_scores = [int(df_plant['health_score'].mean())]
-    for sp in df_plant['sub_plant'].unique():
+    health_scores = [int(cube.summary(plant_id)['mean'])]
+    for sp in cube.children(plant_id):
         labels.append(sp); parents.append(plant_id)
-        sp_data = df_plant[df_plant['sub_plant'] == sp]
-        values.append(len(sp_data)); health_scores.append(int(sp_data['health_score'].mean()))
-        for eq in sp_data['equipment'].unique():
+        sp_rollup = cube.summary(plant_id, sp)
+        values.append(sp_rollup['count']); health_scores.append(int(sp_rollup['mean']))
+        for eq in cube.children(plant_id, sp):
             labels.append(eq[:15]); parents.append(sp)
-            eq_data = sp_data[sp_data['equipment'] == eq]
-            values.append(len(eq_data)); health_scores.append(int(eq_data['health_score'].mean()))
-    colors = ['#22c55e' if s >= 85 else ('#f59e0b' if s >= 70 else '#ef4444') for s in health_scores]
+            eq_rollup = cube.summary(plant_id, sp, eq)
+            values.append(eq_rollup['count']); health_scores.append(int(eq_rollup['mean']))
+    colors = [STATUS_COLORS[health_band(s)] for s in health_scores]
     fig = go.Figure(go.Treemap(
         labels=labels, parents=parents, values=values,
         marker=dict(colors=colors, line=dict(width=2, color='white')),
@@ -915,7 +978,7 @@ def create_treemap_visualization(is_dark: bool, plant_id: str) -> go.Figure:
     return fig
 
 
-@st.cache_data(ttl=600, show_spinner=False)
+@st.cache_data(show_spinner=False)
 def create_network_diagram(is_dark: bool) -> go.Figure:
     node_x = [0.5,0.2,0.5,0.8,0.1,0.3,0.5,0.7,0.9,0.5]
     node_y = [1.0,0.75,0.75,0.75,0.5,0.5,0.5,0.5,0.5,0.25]
@@ -948,23 +1011,24 @@ def create_network_diagram(is_dark: bool) -> go.Figure:
     )
     return fig
 
+# =====================================================
+# CACHE INVALIDATION
+# =====================================================
+def clear_data_caches() -> None:
+    # Everything built from the pipeline output goes stale together
+    for cached in (_window_rollup, _plant_window, _plant_hierarchy, create_treemap_visualization):
+        cached.clear()
+
+MINING_DATA.on_reload('app2', clear_data_caches)
+
 # =====================================================
 # INITIALIZE ISSUES FROM CSV
 # =====================================================
 def initialize_issues_from_csv() -> None:
-    if not st.session_state.data_loaded and df_raw is not None:
-        st.session_state.issues = []
-        df_issues = df_raw[df_raw['completed'] == False].copy()
-        severity_map = {'Critical':'🔴 Critical','Warning':'🟠 Attention','Normal':'🟢 Normal'}
-        for _, row in df_issues.iterrows():
-            st.session_state.issues.append({
-                "Sub-Plant": row['sub_plant'], "Equipment": row['equipment'],
-                "Component": row['component'], "Health": int(row['health_score']),
-                "Severity": severity_map.get(row['severity'], '🟠 Attention'),
-                "Action Type": row['maintenance_type'], "Due": row['action_required'],
-                "Done": bool(row['completed']), "Owner": row['owner'],
-            })
-        st.session_state.data_loaded = True
+    data_version = MINING_DATA.version
+    if st.session_state.issues_version != data_version and df_raw is not None:
+        st.session_state.issues = IssueStore(df_raw)
+        st.session_state.issues_version = data_version
 
 # =====================================================
 # MAIN APPLICATION
@@ -976,12 +1040,6 @@ def main():
 
     theme_toggle = st.sidebar.toggle("🌗 Dark Mode", value=st.session_state.theme)
 
-    # Show clock when theme changes
-    if theme_toggle != st.session_state.theme:
-        ph = show_clock("Applying Theme", "Updating dashboard appearance…")
-        time.sleep(0.6)
-        ph.empty()
-
     st.session_state.theme = theme_toggle
     theme_colors = DARK_THEME if theme_toggle else LIGHT_THEME
     apply_theme(theme_toggle)
@@ -990,52 +1048,25 @@ def main():
 
     st.markdown("## ⛏️ Mining Industry – Plant Health Dashboard")
 
+    latest = load_time_index().max_date or date.today()
     c1, c2, c3 = st.columns([2,1,1])
     with c1:
         selected_plant = st.selectbox("🏭 Select Plant", PLANTS, key="plant_select")
     with c2:
-        from_date = st.date_input("📅 From", date.today() - timedelta(days=7), key="from_date")
+        from_date = st.date_input("📅 From", latest - timedelta(days=7), key="from_date")
     with c3:
-        to_date = st.date_input("📅 To", date.today(), key="to_date")
-
-    # Show clock when plant changes
-    if st.session_state._prev_plant is not None and st.session_state._prev_plant != selected_plant:
-        ph = show_clock("Loading Plant Data", f"Fetching health metrics for {selected_plant}…")
-        time.sleep(0.9)
-        ph.empty()
-    st.session_state._prev_plant = selected_plant
+        to_date = st.date_input("📅 To", latest, key="to_date")
 
     st.caption(f"Plant: **{selected_plant}** | Period: **{from_date} → {to_date}**")
     st.markdown("---")
 
     st.sidebar.title("📂 Navigation")
-    tab = st.sidebar.radio("Select Section", ["📊 Overview","🏗️ Hierarchy Visualization","🚨 Alerts","🛠️ Maintenance"], key="tab_select")
-
-    # Show clock when tab changes
-    if st.session_state._prev_tab is not None and st.session_state._prev_tab != tab:
-        tab_titles = {
-            "📊 Overview": ("Loading Overview", "Preparing plant health summary…"),
-            "🏗️ Hierarchy Visualization": ("Loading Hierarchy", "Building visualisation layers…"),
-            "🚨 Alerts": ("Loading Alerts", "Scanning for critical conditions…"),
-            "🛠️ Maintenance": ("Loading Maintenance", "Fetching maintenance schedule…"),
-        }
-        title, subtitle = tab_titles.get(tab, ("Loading…", "Please wait…"))
-        ph = show_clock(title, subtitle)
-        time.sleep(0.9)
-        ph.empty()
-    st.session_state._prev_tab = tab
+    tab = st.sidebar.radio("Select Section", TABS, key="tab_select")
 
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🔍 Detailed Insights")
     view_mode = st.sidebar.radio("Select View", ["🏭 Plant Overview","🚛 Sub-Plant / Asset Insights","Truck Insights"], key="view_mode")
 
-    # Show clock when view changes
-    if st.session_state._prev_view is not None and st.session_state._prev_view != view_mode:
-        ph = show_clock("Switching View", "Loading new dashboard panel…")
-        time.sleep(0.8)
-        ph.empty()
-    st.session_state._prev_view = view_mode
-
     selected_subplant_insight = None
     selected_asset = None
 
@@ -1049,32 +1080,22 @@ def main():
         selected_subplant_insight = st.sidebar.selectbox("Select Sub-Plant", list(PLANT_STRUCTURE.keys()), key="subplant_insight")
         selected_asset = st.sidebar.selectbox("Select Asset", list(PLANT_STRUCTURE[selected_subplant_insight].keys()), key="asset_select")
 
-        # Clock on sub-plant change
-        if st.session_state._prev_subplant != selected_subplant_insight and st.session_state._prev_subplant is not None:
-            ph = show_clock("Loading Sub-Plant", f"Fetching data for {selected_subplant_insight}…")
-            time.sleep(0.8)
-            ph.empty()
-        st.session_state._prev_subplant = selected_subplant_insight
-
-        # Clock on asset change
-        if st.session_state._prev_asset != selected_asset and st.session_state._prev_asset is not None:
-            ph = show_clock("Loading Asset", f"Fetching intelligence for {selected_asset}…")
-            time.sleep(0.8)
-            ph.empty()
-        st.session_state._prev_asset = selected_asset
+        render_subplant_asset_insights(selected_plant, selected_subplant_insight, selected_asset, from_date, to_date, theme_colors)
 
-        render_subplant_asset_insights(selected_plant, selected_subplant_insight, selected_asset, theme_colors)
-
-    render_operations_panel()
+    # Fragments can't call st.sidebar, so the panel is rendered inside the sidebar context
+    with st.sidebar:
+        render_operations_panel()
 
     if tab == "📊 Overview":
-        render_overview_tab(selected_plant, to_date, theme_colors)
+        render_overview_tab(selected_plant, from_date, to_date, theme_colors)
     elif tab == "🏗️ Hierarchy Visualization":
-        render_hierarchy_tab(theme_toggle, selected_plant)
+        render_hierarchy_tab(theme_toggle, selected_plant, from_date, to_date)
     elif tab == "🚨 Alerts":
-        render_alerts_tab(selected_plant, to_date)
+        render_alerts_tab(selected_plant, from_date, to_date)
     else:
-        render_maintenance_tab(selected_plant, to_date)
+        render_maintenance_tab(selected_plant, from_date, to_date)
+
+    prefetch_other_tabs(tab, selected_plant, from_date, to_date, theme_toggle, theme_colors)
 
     st.markdown("---")
     st.caption("Industry-ready mining dashboard designed for Plant Heads, Operations Managers, and Maintenance Teams.")
@@ -1082,27 +1103,28 @@ def main():
 # =====================================================
 # OPERATIONS CONTROL PANEL
 # =====================================================
+@st.fragment
+@PREFETCH.in_foreground
 def render_operations_panel() -> None:
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("## 🚦 Operations Control Panel")
-    st.sidebar.caption("Live view of plant issues, required actions, and completion status")
+    st.markdown("---")
+    st.markdown("## 🚦 Operations Control Panel")
+    st.caption("Live view of plant issues, required actions, and completion status")
 
-    open_issues = [i for i in st.session_state.issues if not i["Done"]]
-    critical_issues = [i for i in open_issues if i["Severity"] == "🔴 Critical"]
+    issues = st.session_state.issues
 
-    col1, col2 = st.sidebar.columns(2)
-    col1.metric("🔴 Critical", len(critical_issues))
-    col2.metric("📋 Open", len(open_issues))
+    col1, col2 = st.columns(2)
+    col1.metric("🔴 Critical", issues.critical_count)
+    col2.metric("📋 Open", issues.open_count)
 
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("### 🧾 Issues Requiring Action")
+    st.markdown("---")
+    st.markdown("### 🧾 Issues Requiring Action")
 
-    if not open_issues:
-        st.sidebar.success("✅ All issues under control")
+    if not issues.open_count:
+        st.success("✅ All issues under control")
     else:
-        for idx, issue in enumerate(open_issues):
+        for issue_id, issue in issues.open_records():
             header = f"{issue['Severity']} | {issue['Component']} ({issue['Action Type']})"
-            with st.sidebar.expander(header):
+            with st.expander(header):
                 st.markdown(f"""
 **Sub-Plant:** {issue['Sub-Plant']}  
 **Equipment:** {issue['Equipment']}  
@@ -1112,20 +1134,12 @@ def render_operations_panel() -> None:
 **Action Deadline:** {'Within 24 hours' if issue['Action Type'] == 'Predictive' else 'Within 7 days'}  
 {countdown_text('24' if issue['Action Type'] == 'Predictive' else '7')}
 """)
-                if st.button("✔ Mark Completed", key=f"complete_{idx}"):
-                    # Show clock while marking complete
-                    ph = show_clock("Updating Status", "Saving completion record…")
-                    time.sleep(1.0)
-                    ph.empty()
-
-                    for i in range(len(st.session_state.issues)):
-                        if st.session_state.issues[i] == issue:
-                            st.session_state.issues[i]["Done"] = True
-                            break
-                    st.rerun()
-
-    st.sidebar.markdown("### 🧭 Priority Guide")
-    st.sidebar.markdown("""
+                if st.button("✔ Mark Completed", key=f"complete_{issue_id}"):
+                    issues.mark_done(issue_id)
+                    st.rerun()  # full rerun: the overview KPIs read the same counts
+
+    st.markdown("### 🧭 Priority Guide")
+    st.markdown("""
 🟢 **Proactive**  Equipment healthy - Monitor  
 🟠 **Preventive**  Early warning - Plan within **7 days**  
 🔴 **Predictive**  High risk - Handle **immediately**
@@ -1134,10 +1148,48 @@ def render_operations_panel() -> None:
 # =====================================================
 # HIERARCHY VISUALIZATION TAB
 # =====================================================
-def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
+def render_hierarchy_tab(is_dark: bool, plant_id: str, from_date: date, to_date: date) -> None:
     st.markdown("## 🏗️ Mining Operations Monitoring Hierarchy")
     st.markdown("### Understanding How Your Plant is Monitored from Top to Bottom")
 
+    render_hierarchy_visualization(is_dark, plant_id, from_date, to_date)
+
+    st.markdown("---")
+    st.markdown("### 📖 How to Use This Information")
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("""#### For Plant Managers\n- **Monitor** overall health\n- **Identify** Sub-Plants needing attention\n- **Plan** resources\n- **Track** improvement""")
+    with c2:
+        st.markdown("""#### For Maintenance Teams\n- **Drill down** to equipment issues\n- **Review** sensor readings\n- **Prioritize** by health score\n- **Execute** maintenance proactively""")
+
+    st.markdown("---")
+    st.markdown("### 🔄 Complete Monitoring Workflow")
+    st.code("""
+STEP 1: Sensors collect real-time data (Vibration, Temperature, Pressure)
+       ↓
+STEP 2: Data analyzed → Health Score (0-100%)
+       ↓
+STEP 3: AI categorizes condition:
+       • 85-100% = 🟢 Healthy (Proactive)
+       • 70-84%  = 🟠 Warning (Preventive)
+       • 0-69%   = 🔴 Critical (Predictive)
+       ↓
+STEP 4: Maintenance recommendations generated
+       ↓
+STEP 5: Alerts sent to relevant teams
+       ↓
+STEP 6: Actions tracked in Operations Control Panel
+""", language="text")
+
+    st.markdown("---")
+    st.markdown("### 🎮 Try It Yourself")
+    render_hierarchy_explorer(plant_id, from_date, to_date)
+
+
+# Switching the visualization reruns only this section
+@st.fragment
+@PREFETCH.in_foreground
+def render_hierarchy_visualization(is_dark: bool, plant_id: str, from_date: date, to_date: date) -> None:
     viz_type = st.radio(
         "Select Visualization Type:",
         ["📊 Interactive Flow Diagram","🎴 Detailed Level Cards","🗺️ Hierarchical Health Map","🔗 Network View"],
@@ -1166,14 +1218,17 @@ def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
     elif viz_type == "🗺️ Hierarchical Health Map":
         st.markdown("### Real-Time Health Status Across All Levels")
         st.info("🔍 **Larger boxes** = higher level. **Colors** show health status.")
-        with with_clock("Building Health Map", f"Computing live health scores for {plant_id}…"):
-            fig = create_treemap_visualization(is_dark, plant_id)
-        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
-        df_plant = df_raw[df_raw['plant_id'] == plant_id]
+        plant_rollup = get_window_rollup(from_date, to_date).summary(plant_id) or {}
+        if plant_rollup:
+            with with_clock("Building Health Map", f"Computing live health scores for {plant_id}…"):
+                fig = create_treemap_visualization(is_dark, plant_id, from_date, to_date, MINING_DATA.version)
+            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+        else:
+            st.info(f"No readings for {plant_id} between {from_date} and {to_date}")
         c1, c2, c3 = st.columns(3)
-        c1.metric("🟢 Healthy Assets", len(df_plant[df_plant['health_score'] >= 85]), "85-100%")
-        c2.metric("🟠 Warning Assets", len(df_plant[(df_plant['health_score'] >= 70) & (df_plant['health_score'] < 85)]), "70-84%")
-        c3.metric("🔴 Critical Assets", len(df_plant[df_plant['health_score'] < 70]), "< 70%")
+        c1.metric("🟢 Healthy Assets", plant_rollup.get('healthy', 0), "85-100%")
+        c2.metric("🟠 Warning Assets", plant_rollup.get('warning', 0), "70-84%")
+        c3.metric("🔴 Critical Assets", plant_rollup.get('critical', 0), "< 70%")
 
     else:
         st.markdown("### Network Topology - How Systems Connect")
@@ -1188,35 +1243,11 @@ def render_hierarchy_tab(is_dark: bool, plant_id: str) -> None:
         c3.markdown("🟠 **Amber** = Warning")
         c4.markdown("🔴 **Red** = Critical")
 
-    st.markdown("---")
-    st.markdown("### 📖 How to Use This Information")
-    c1, c2 = st.columns(2)
-    with c1:
-        st.markdown("""#### For Plant Managers\n- **Monitor** overall health\n- **Identify** Sub-Plants needing attention\n- **Plan** resources\n- **Track** improvement""")
-    with c2:
-        st.markdown("""#### For Maintenance Teams\n- **Drill down** to equipment issues\n- **Review** sensor readings\n- **Prioritize** by health score\n- **Execute** maintenance proactively""")
 
-    st.markdown("---")
-    st.markdown("### 🔄 Complete Monitoring Workflow")
-    st.code("""
-STEP 1: Sensors collect real-time data (Vibration, Temperature, Pressure)
-       ↓
-STEP 2: Data analyzed → Health Score (0-100%)
-       ↓
-STEP 3: AI categorizes condition:
-       • 85-100% = 🟢 Healthy (Proactive)
-       • 70-84%  = 🟠 Warning (Preventive)
-       • 0-69%   = 🔴 Critical (Predictive)
-       ↓
-STEP 4: Maintenance recommendations generated
-       ↓
-STEP 5: Alerts sent to relevant teams
-       ↓
-STEP 6: Actions tracked in Operations Control Panel
-""", language="text")
-
-    st.markdown("---")
-    st.markdown("### 🎮 Try It Yourself")
+# The sub-plant / equipment / component pickers rerun only the path card below them
+@st.fragment
+@PREFETCH.in_foreground
+def render_hierarchy_explorer(plant_id: str, from_date: date, to_date: date) -> None:
     c1, c2, c3 = st.columns(3)
     with c1:
         selected_subplant = st.selectbox("Sub-Plant", list(PLANT_STRUCTURE.keys()), key="hier_subplant")
@@ -1225,15 +1256,7 @@ STEP 6: Actions tracked in Operations Control Panel
     with c3:
         selected_component = st.selectbox("Component", PLANT_STRUCTURE[selected_subplant][selected_equipment], key="hier_component")
 
-    # Clock on hierarchy drilldown changes
-    combo = f"{selected_subplant}|{selected_equipment}|{selected_component}"
-    if st.session_state.get("_prev_hier_combo") and st.session_state["_prev_hier_combo"] != combo:
-        ph = show_clock("Computing Health Score", "Running sensor analysis…")
-        time.sleep(0.6)
-        ph.empty()
-    st.session_state["_prev_hier_combo"] = combo
-
-    sample_health = get_health_score(plant_id, selected_subplant, selected_equipment, selected_component)
+    sample_health = get_health_score(plant_id, selected_subplant, selected_equipment, selected_component, from_date, to_date)
     sample_status = status(sample_health)
     sample_maintenance = maintenance(sample_health)
     sample_sensors = SENSOR_MAP.get(selected_component, ["General"])
@@ -1245,7 +1268,7 @@ STEP 6: Actions tracked in Operations Control Panel
         <h3>🏭 Mine Site → 🏗️ {selected_subplant} → ⚙️ {selected_equipment} → 🔧 {selected_component}</h3>
         <hr>
         <p><strong>📡 Monitored Sensors:</strong> {', '.join(sample_sensors)}</p>
-        <p><strong>📊 Current Health Score:</strong> <span class="status-badge status-{'healthy' if sample_health >= 85 else 'warning' if sample_health >= 70 else 'critical'}">{sample_health}%</span></p>
+        <p><strong>📊 Current Health Score:</strong> <span class="status-badge status-{HEALTH_BAND_LABELS['status'][health_band(sample_health)].lower()}">{sample_health}%</span></p>
         <p><strong>🎯 Status:</strong> {sample_status}</p>
         <p><strong>🛠️ Maintenance Type:</strong> {sample_maintenance}</p>
         <p><strong>⚡ Recommended Action:</strong> {action(sample_health)}</p>
@@ -1255,67 +1278,98 @@ STEP 6: Actions tracked in Operations Control Panel
 # =====================================================
 # TAB RENDERERS
 # =====================================================
-def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict) -> None:
+def render_overview_tab(selected_plant: str, from_date: date, to_date: date, theme_colors: Dict) -> None:
+    render_overview_kpis(selected_plant, from_date, to_date, theme_colors)
+    render_component_drilldown(selected_plant, from_date, to_date)
+
+    issues = st.session_state.issues
+
+    st.markdown("### ⚠️ Top Risk Areas (Quick View)")
+    if issues.open_count:
+        st.dataframe(issues.open_frame(["Sub-Plant","Equipment","Component","Severity","Action Type","Due"]), use_container_width=True, hide_index=True)
+    else:
+        st.success("✅ No high-risk areas identified")
+
+    st.markdown("### 🏭 Mining Operations Snapshot")
+    try:
+        st.image("images/img1.jpg", caption="Mining plant operations monitored through real-time systems", use_container_width=True)
+    except:
+        st.info("📷 Add 'images/img1.jpg' to show operations photo")
+
+
+# Sub-plant scores and plant health for a window cube (85 where there are no readings)
+def overview_scores(cube, selected_plant):
+    sub_scores = {}
+    for sp in PLANT_STRUCTURE.keys():
+        sp_rollup = cube.summary(selected_plant, sp)
+        sub_scores[sp] = int(sp_rollup['mean']) if sp_rollup else 85
+    plant_rollup = cube.summary(selected_plant)
+    return sub_scores, int(plant_rollup['mean']) if plant_rollup else 85
+
+
+# KPI row, donuts, sub-plant bar and trend
+def render_overview_kpis(selected_plant: str, from_date: date, to_date: date, theme_colors: Dict) -> None:
     st.subheader("🏭 Overall Plant Health")
 
     with with_clock("Loading Plant Overview", f"Calculating health metrics for {selected_plant}…"):
-        df_plant = get_plant_data(selected_plant)
-        sub_scores = {}
-        for sp in PLANT_STRUCTURE.keys():
-            sp_data = df_plant[df_plant['sub_plant'] == sp]
-            sub_scores[sp] = int(sp_data['health_score'].mean()) if not sp_data.empty else 85
+        cube = get_window_rollup(from_date, to_date)
+        sub_scores, plant_health = overview_scores(cube, selected_plant)
 
-    plant_health = int(df_plant['health_score'].mean()) if not df_plant.empty else 85
-    open_issues = [i for i in st.session_state.issues if not i["Done"]]
-    critical_issues = [i for i in open_issues if i["Severity"] == "🔴 Critical"]
+    issues = st.session_state.issues
 
     k1, k2, k3, k4 = st.columns(4)
     k1.metric("Plant Health", f"{plant_health}%")
     k2.metric("Status", status(plant_health))
     k3.metric("Maintenance Mode", maintenance(plant_health))
-    k4.metric("Critical Areas", sum(1 for v in sub_scores.values() if v < 70))
+    k4.metric("Critical Areas", sum(1 for v in sub_scores.values() if health_band(v) == CRITICAL_BAND))
 
     st.markdown("### 📊 Visual Health Indicators")
     d1, d2, d3 = st.columns(3)
     with d1:
         st.plotly_chart(create_donut_chart(plant_health, "Overall Plant Health", theme_colors['success'], theme_colors['danger']), use_container_width=True, config={'displayModeBar': False})
     with d2:
-        st.plotly_chart(create_donut_chart(max(30, 100 - len(critical_issues)*10), "Risk Buffer", theme_colors['success'], theme_colors['danger']), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_donut_chart(max(30, 100 - issues.critical_count*10), "Risk Buffer", theme_colors['success'], theme_colors['danger']), use_container_width=True, config={'displayModeBar': False})
     with d3:
-        st.plotly_chart(create_donut_chart(max(40, 100 - len(open_issues)*5), "Operational Stability", theme_colors['success'], theme_colors['danger']), use_container_width=True, config={'displayModeBar': False})
+        st.plotly_chart(create_donut_chart(max(40, 100 - issues.open_count*5), "Operational Stability", theme_colors['success'], theme_colors['danger']), use_container_width=True, config={'displayModeBar': False})
 
     df_sub = pd.DataFrame({"Sub-Plant": sub_scores.keys(), "Health (%)": sub_scores.values()})
     st.plotly_chart(create_bar_chart(df_sub, "Sub-Plant", "Health (%)", "Sub-Plant Health"), use_container_width=True, config={'displayModeBar': False})
 
+    st.markdown("### 📈 Health Trend")
+    trend = load_health_history(selected_plant, from_date, to_date)
+    if not trend.empty:
+        st.plotly_chart(create_trend_chart(trend, "run_at", "health_score", "sub_plant", "Sub-Plant Health by Pipeline Run"), use_container_width=True, config={'displayModeBar': False})
+    else:
+        st.info(f"No stored pipeline runs for {selected_plant} between {from_date} and {to_date}")
+
+
+# Picking a sub-plant reruns only the drilldown tables
+@st.fragment
+@PREFETCH.in_foreground
+def render_component_drilldown(selected_plant: str, from_date: date, to_date: date) -> None:
     st.markdown("### 🏗️ Sub-Plant → Components")
     selected_subplant = st.selectbox("Select Sub-Plant", list(PLANT_STRUCTURE.keys()), key="subplant_drilldown")
 
-    # Clock on sub-plant drilldown change
-    if st.session_state._prev_subplant_drilldown is not None and st.session_state._prev_subplant_drilldown != selected_subplant:
-        ph = show_clock("Drilling Down", f"Loading component data for {selected_subplant}…")
-        time.sleep(0.7)
-        ph.empty()
-    st.session_state._prev_subplant_drilldown = selected_subplant
-
     rows = []
     for eq, comps in PLANT_STRUCTURE[selected_subplant].items():
         for comp in comps:
-            score = get_health_score(selected_plant, selected_subplant, eq, comp)
+            score = get_health_score(selected_plant, selected_subplant, eq, comp, from_date, to_date)
             rows.append({"Equipment": eq, "Component": comp, "Health (%)": score, "Status": status(score)})
     df_comp = pd.DataFrame(rows)
     st.dataframe(df_comp, use_container_width=True, hide_index=True)
 
-    st.markdown("### 🔩 Component → Sensors")
-    selected_component = st.selectbox("Select Component", df_comp["Component"].unique(), key="component_select")
+    render_sensor_drilldown(selected_plant, selected_subplant, df_comp["Component"].unique().tolist(), from_date, to_date)
 
-    # Clock on component change
-    if st.session_state._prev_component is not None and st.session_state._prev_component != selected_component:
-        ph = show_clock("Loading Sensor Data", f"Fetching readings for {selected_component}…")
-        time.sleep(0.6)
-        ph.empty()
-    st.session_state._prev_component = selected_component
+
+# Picking a component reruns only the sensor table
+@st.fragment
+@PREFETCH.in_foreground
+def render_sensor_drilldown(selected_plant, selected_subplant, components, from_date: date, to_date: date):
+    st.markdown("### 🔩 Component → Sensors")
+    selected_component = st.selectbox("Select Component", components, key="component_select")
 
     sensor_rows = []
+    df_plant = get_plant_window(selected_plant, from_date, to_date)
     comp_data = df_plant[(df_plant['sub_plant'] == selected_subplant) & (df_plant['component'] == selected_component)]
     for _, row in comp_data.iterrows():
         sensor_rows.append({"Sensor": row['sensor_type'], "Health (%)": int(row['health_score']), "Status": status(int(row['health_score']))})
@@ -1324,56 +1378,172 @@ def render_overview_tab(selected_plant: str, to_date: date, theme_colors: Dict)
     else:
         st.info("No sensor data available for this component")
 
-    st.markdown("### ⚠️ Top Risk Areas (Quick View)")
-    if open_issues:
-        st.dataframe(pd.DataFrame(open_issues)[["Sub-Plant","Equipment","Component","Severity","Action Type","Due"]], use_container_width=True, hide_index=True)
-    else:
-        st.success("✅ No high-risk areas identified")
 
-    st.markdown("### 🏭 Mining Operations Snapshot")
-    try:
-        st.image("images/img1.jpg", caption="Mining plant operations monitored through real-time systems", use_container_width=True)
-    except:
-        st.info("📷 Add 'images/img1.jpg' to show operations photo")
+# Pipeline status with its traffic-light icon
+def severity_label(status_text: str) -> str:
+    labels = HEALTH_BAND_LABELS['status']
+    band = labels.index(status_text) if status_text in labels else CRITICAL_BAND
+    return f"{STATUS_ICONS[band]} {status_text}"
+
+
+# Filterable, sortable table showing one page of df at a time. columns maps source column -> label.
+# Filter/sort/paging run server-side over row positions; only the visible page, projected to
+# `columns`, is formatted and sent to the browser. Paging reruns only this fragment.
+@st.fragment
+@PREFETCH.in_foreground
+def render_paged_table(key: str, df: pd.DataFrame, columns: Dict[str, str], filter_columns: List[str], where=None, formatters: Dict = None) -> None:
+    base_rows = select_rows(df, where)
+    labels = {label: column for column, label in columns.items()}
+
+    controls = st.columns(len(filter_columns) + 3)
+    filters = {}
+    for control, column in zip(controls, filter_columns):
+        options = sorted(map(str, df[column].iloc[base_rows].unique()))
+        filters[column] = control.multiselect(columns[column], options, key=f"{key}_filter_{column}")
+    sort_label = controls[-3].selectbox("Sort by", list(labels), index=None, placeholder="Window order", key=f"{key}_sort")
+    descending = controls[-2].selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    page_size = controls[-1].selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{key}_page_size")
+
+    rows = select_rows(df, where, filters, sort_by=labels.get(sort_label), ascending=not descending)
+    if not len(rows):
+        st.info("No rows match the selected filters")
+        return
+
+    pages = page_count(len(rows), page_size)
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key=f"{key}_page")
+
+    display = take_page(df, rows, list(columns), page, page_size)
+    display.columns = list(columns.values())
+    for label, formatter in (formatters or {}).items():
+        display[label] = formatter(display[label])
+    st.dataframe(display, use_container_width=True, hide_index=True)
+    first = (page - 1) * page_size + 1
+    st.caption(f"Rows {first}–{first + len(display) - 1} of {len(rows)}")
 
 
-def render_alerts_tab(selected_plant: str, to_date: date) -> None:
+def render_alerts_tab(selected_plant: str, from_date: date, to_date: date) -> None:
     st.subheader("🚨 Plant → Sub-Plant → Component → Sensor Alerts")
 
     with with_clock("Scanning for Alerts", f"Checking critical conditions in {selected_plant}…"):
-        df_alerts = df_raw[(df_raw['plant_id'] == selected_plant) & (df_raw['health_score'] < 75)].copy()
-
-    if not df_alerts.empty:
-        alert_display = df_alerts[['plant_id','sub_plant','equipment','component','sensor_type','status','maintenance_type','action_required']].copy()
-        alert_display.columns = ['Plant','Sub-Plant','Equipment','Component','Sensor','Severity','Maintenance','Action']
-        alert_display['Severity'] = alert_display['Severity'].apply(
-            lambda x: f"🟢 {x}" if x == 'Healthy' else (f"🟠 {x}" if x == 'Warning' else f"🔴 {x}")
+        df_window = get_plant_window(selected_plant, from_date, to_date)
+        alert_mask = (df_window['health_score'] < 75).to_numpy()
+
+    if alert_mask.any():
+        render_paged_table(
+            "alerts", df_window,
+            {'plant_id': 'Plant', 'sub_plant': 'Sub-Plant', 'equipment': 'Equipment', 'component': 'Component',
+             'sensor_type': 'Sensor', 'status': 'Severity', 'maintenance_type': 'Maintenance', 'action_required': 'Action'},
+            ['sub_plant', 'status'], where=alert_mask,
+            formatters={'Severity': lambda values: values.astype(str).map(severity_label)}
         )
-        st.dataframe(alert_display, use_container_width=True, hide_index=True)
     else:
         st.success("✅ No active alerts")
 
 
-def render_maintenance_tab(selected_plant: str, to_date: date) -> None:
+# Readings per maintenance type, for the strategy pie
+def maintenance_mix(df_maint: pd.DataFrame) -> pd.DataFrame:
+    maint_counts = df_maint['maintenance_type'].value_counts()
+    return pd.DataFrame({'Maintenance Type': maint_counts.index, 'Count': maint_counts.values})
+
+
+def render_maintenance_tab(selected_plant: str, from_date: date, to_date: date) -> None:
     st.subheader("🛠️ Maintenance Planning (Industry View)")
 
     with with_clock("Loading Maintenance Schedule", "Fetching planned maintenance records…"):
-        df_maint = get_plant_data(selected_plant)
+        df_maint = get_plant_window(selected_plant, from_date, to_date)
 
     if not df_maint.empty:
-        maint_display = df_maint[['sub_plant','equipment','component','health_score','maintenance_type','priority','due_date']].copy()
-        maint_display.columns = ['Sub-Plant','Equipment','Component','Health (%)','Maintenance Type','Priority','Planned Date']
-        maint_display['Planned Date'] = pd.to_datetime(maint_display['Planned Date']).dt.date
-        st.dataframe(maint_display, use_container_width=True, hide_index=True)
-
-        maint_counts = df_maint['maintenance_type'].value_counts()
-        maint_df = pd.DataFrame({'Maintenance Type': maint_counts.index, 'Count': maint_counts.values})
-        st.plotly_chart(create_pie_chart(maint_df, "Maintenance Type", "Maintenance Strategy Distribution"), use_container_width=True, config={'displayModeBar': False})
+        render_paged_table(
+            "maint", df_maint,
+            {'sub_plant': 'Sub-Plant', 'equipment': 'Equipment', 'component': 'Component', 'health_score': 'Health (%)',
+             'maintenance_type': 'Maintenance Type', 'priority': 'Priority', 'due_date': 'Planned Date'},
+            ['sub_plant', 'maintenance_type', 'priority'],
+            formatters={'Planned Date': lambda values: pd.to_datetime(values).dt.date}
+        )
+
+        st.plotly_chart(create_pie_chart(maintenance_mix(df_maint), "Maintenance Type", "Maintenance Strategy Distribution"), use_container_width=True, config={'displayModeBar': False})
     else:
         st.info("No maintenance data available for this plant")
 
     st.success("📌 Predictive maintenance should be prioritized for LOW health assets to avoid unplanned downtime.")
 
 
+# =====================================================
+# BACKGROUND PREFETCH
+# =====================================================
+# Each warm_* fills the caches one tab reads, through the same cached functions the tab calls;
+# every yield ends a step, and the worker waits there while any session is rendering
+def warm_overview(selected_plant, from_date, to_date, theme_colors, critical_count, open_count):
+    cube = get_window_rollup(from_date, to_date)
+    sub_scores, plant_health = overview_scores(cube, selected_plant)
+    yield
+    create_donut_chart(plant_health, "Overall Plant Health", theme_colors['success'], theme_colors['danger'])
+    create_donut_chart(max(30, 100 - critical_count*10), "Risk Buffer", theme_colors['success'], theme_colors['danger'])
+    create_donut_chart(max(40, 100 - open_count*5), "Operational Stability", theme_colors['success'], theme_colors['danger'])
+    create_bar_chart(pd.DataFrame({"Sub-Plant": sub_scores.keys(), "Health (%)": sub_scores.values()}), "Sub-Plant", "Health (%)", "Sub-Plant Health")
+    yield
+    get_plant_window(selected_plant, from_date, to_date)
+    yield
+    load_health_history(selected_plant, from_date, to_date)
+
+
+def warm_hierarchy(selected_plant, from_date, to_date, is_dark):
+    create_hierarchy_flowchart(is_dark)
+    yield
+    if get_window_rollup(from_date, to_date).summary(selected_plant):
+        create_treemap_visualization(is_dark, selected_plant, from_date, to_date, MINING_DATA.version)
+    yield
+    create_network_diagram(is_dark)
+    yield
+    get_plant_hierarchy(selected_plant, from_date, to_date)
+
+
+def warm_alerts(selected_plant, from_date, to_date):
+    get_plant_window(selected_plant, from_date, to_date)
+
+
+def warm_maintenance(selected_plant, from_date, to_date):
+    df_maint = get_plant_window(selected_plant, from_date, to_date)
+    yield
+    if not df_maint.empty:
+        create_pie_chart(maintenance_mix(df_maint), "Maintenance Type", "Maintenance Strategy Distribution")
+
+
+# Queue warm-up of the tabs not on screen, next tab in the sidebar first. Jobs are keyed per
+# session and tab so a newer selection replaces a stale one; the worker runs them once no script
+# run (full or fragment) is active, carrying this session's context so the st caches behave as in
+# the foreground.
+def prefetch_other_tabs(active_tab, selected_plant, from_date, to_date, is_dark, theme_colors):
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+
+    issues = st.session_state.issues
+    jobs = {
+        "📊 Overview": (warm_overview, selected_plant, from_date, to_date, theme_colors, issues.critical_count, issues.open_count),
+        "🏗️ Hierarchy Visualization": (warm_hierarchy, selected_plant, from_date, to_date, is_dark),
+        "🚨 Alerts": (warm_alerts, selected_plant, from_date, to_date),
+        "🛠️ Maintenance": (warm_maintenance, selected_plant, from_date, to_date),
+    }
+
+    def in_session(warm, *args):
+        def job():
+            # The worker thread is shared by every session; hold this one's context only while its job runs
+            worker = threading.current_thread()
+            add_script_run_ctx(worker, ctx)
+            try:
+                yield from warm(*args) or ()
+            finally:
+                setattr(worker, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+        return job
+
+    start = TABS.index(active_tab)
+    for tab in TABS[start + 1:] + TABS[:start]:
+        PREFETCH.submit((ctx.session_id, tab), in_session(*jobs[tab]))
+
+
 if __name__ == "__main__":
-    main()
+    with PREFETCH.foreground():
+        main()
@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 from PIL import Image
+from pmanalysis.datastore import FLEET_DATA
 
 st.set_page_config(
     page_title="Asset Analysis - Haul Truck HT20002",
@@ -580,13 +581,10 @@ st.markdown(f"""
     </style>
 """, unsafe_allow_html=True)
 
-# Load Data
-@st.cache_data(ttl=300)
+# Load Data (shared across sessions, reloaded when the CSV changes)
 def load_fleet_data():
     try:
-        df = pd.read_csv('output/mining_truck_fleet_cleaned.csv')
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df
+        return FLEET_DATA.get()
     except:
         return pd.DataFrame()
 
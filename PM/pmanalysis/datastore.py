@@ -0,0 +1,366 @@
+"""
+Storage and loading of pipeline outputs for the dashboards
+main_pipeline writes mining_data.csv and, when pyarrow is installed, a typed
+mining_data.parquet next to it (datetime64 timestamps, dictionary-encoded
+hierarchy/status columns). load_mining_data() prefers the Parquet file.
+
+Every run is also appended to a history store partitioned Hive-style by plant,
+the date the pipeline ran and the date of the readings:
+    history/plant_id=Plant-1/run_date=2026-10-18/reading_date=2024-02-08/run-20261018T061500000000-0.parquet
+read_history() prunes partitions on plant_id, run_date and reading_date before
+opening files, so a dashboard's plant and from/to pickers only read matching days.
+
+MINING_DATA and FLEET_DATA are process-wide SharedDatasets: every Streamlit
+session and page reads the same frame, reloaded only when the files change.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = "output"
+DATA_STEM = "mining_data"
+FLEET_STEM = "mining_truck_fleet_cleaned"
+HISTORY_DIR = os.path.join(DATA_DIR, "history")
+# Rewritten by every append_history(); dataset discovery skips '_'-prefixed files
+HISTORY_MARKER = "_last_run"
+
+HIERARCHY_LEVELS = ['plant_id', 'sub_plant', 'equipment', 'component', 'sensor_type']
+CATEGORY_COLUMNS = HIERARCHY_LEVELS + ['status']
+DATETIME_COLUMNS = ['timestamp', 'due_date']
+
+def typed_frame(df):
+    """Copy of a pipeline output frame with datetime64 and categorical columns"""
+    df = df.copy()
+    for col in DATETIME_COLUMNS:
+        df[col] = pd.to_datetime(df[col])
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype('category')
+        elif isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(str)
+    return df
+
+def write_parquet(df, path):
+    """
+    Write `df` as Parquet with typed columns; categoricals become dictionary-encoded
+    Returns: False (nothing written) when no Parquet engine is installed
+    """
+    try:
+        typed_frame(df).to_parquet(path, index=False)
+    except ImportError:
+        return False
+    return True
+
+def data_paths(data_dir=DATA_DIR, stem=DATA_STEM):
+    return os.path.join(data_dir, f"{stem}.parquet"), os.path.join(data_dir, f"{stem}.csv")
+
+def load_mining_data(data_dir=DATA_DIR, stem=DATA_STEM):
+    """
+    Load pipeline output, preferring the Parquet file unless the CSV is newer
+    Both paths return the same dtypes: datetime64 timestamps and categorical
+    CATEGORY_COLUMNS.
+    """
+    parquet_path, csv_path = data_paths(data_dir, stem)
+    if os.path.exists(parquet_path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+    ):
+        try:
+            return pd.read_parquet(parquet_path)
+        except ImportError:
+            pass
+
+    return pd.read_csv(
+        csv_path,
+        parse_dates=DATETIME_COLUMNS,
+        dtype={col: 'category' for col in CATEGORY_COLUMNS}
+    )
+
+def load_fleet_data(data_dir=DATA_DIR, stem=FLEET_STEM):
+    """Truck fleet telemetry with a datetime64 Date column"""
+    df = pd.read_csv(os.path.join(data_dir, f"{stem}.csv"))
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df
+
+# =====================================================
+# SHARED PROCESS CACHE
+# =====================================================
+class SharedDataset:
+    """
+    One read-only copy of a dataset per process, reloaded when its files change
+    The version is the (path, mtime_ns, size) of every source file. get() only
+    stats the files and reloads when that changes, so sessions share one frame
+    instead of each holding a pickled copy. Callers must copy before mutating.
+
+    derive(name, builder) memoizes builder(frame) (indexes, rollups, ...) for
+    the current version; a reload drops everything derived from the old frame
+    at once and then runs the on_reload() callbacks, so caches held elsewhere
+    can be cleared in the same step.
+    """
+
+    def __init__(self, loader, *paths):
+        self.loader = loader
+        self.paths = paths
+        self._lock = threading.Lock()
+        self._state = (None, None, {})  # (version, frame, derived)
+        self._callbacks = {}
+
+    def current_version(self):
+        stamps = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                stamps.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamps.append((path, None, None))
+        return tuple(stamps)
+
+    def _snapshot(self):
+        version = self.current_version()
+        if self._state[0] != version:
+            reloaded = False
+            with self._lock:
+                if self._state[0] != version:
+                    self._state = (version, self.loader(), {})
+                    reloaded = True
+            if reloaded:
+                for callback in list(self._callbacks.values()):
+                    callback()
+        return self._state
+
+    @property
+    def version(self):
+        return self._snapshot()[0]
+
+    def get(self):
+        return self._snapshot()[1]
+
+    def on_reload(self, name, callback):
+        """Run callback() after each reload; registering the same name again replaces it"""
+        self._callbacks[name] = callback
+
+    def derive(self, name, builder):
+        _, frame, derived = self._snapshot()
+        if name not in derived:
+            with self._lock:
+                if name not in derived:
+                    derived[name] = builder(frame)
+        return derived[name]
+
+
+MINING_DATA = SharedDataset(load_mining_data, *data_paths())
+FLEET_DATA = SharedDataset(load_fleet_data, os.path.join(DATA_DIR, f"{FLEET_STEM}.csv"))
+
+# =====================================================
+# TIME-RANGE INDEX
+# =====================================================
+class TimeRangeIndex:
+    """
+    Pipeline output sorted by (plant_id, timestamp) for range queries
+    Each plant is a contiguous block with ascending timestamps, so window()
+    finds its rows with two binary searches and returns a slice instead of
+    scanning the whole frame with boolean masks.
+    """
+
+    def __init__(self, df, time_column='timestamp', key_column='plant_id'):
+        keys = df[key_column].astype(str).to_numpy()
+        times = df[time_column].to_numpy(dtype='datetime64[ns]')
+        order = np.lexsort((times, keys))
+
+        self.df = df.iloc[order].reset_index(drop=True)
+        self.times = times[order]
+        sorted_keys = keys[order]
+        plants, starts = np.unique(sorted_keys, return_index=True)
+        stops = np.append(starts[1:], len(sorted_keys))
+        self.blocks = {plant: (start, stop) for plant, start, stop in zip(plants, starts, stops)}
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def max_date(self):
+        return pd.Timestamp(self.times.max()).date() if len(self.times) else None
+
+    def bounds(self, plant_id, from_date=None, to_date=None):
+        """[start, stop) positions of plant_id's rows with from_date <= timestamp date <= to_date"""
+        start, stop = self.blocks.get(str(plant_id), (0, 0))
+        block = self.times[start:stop]
+        lo = 0 if from_date is None else np.searchsorted(block, np.datetime64(pd.Timestamp(from_date)), 'left')
+        hi = len(block) if to_date is None else np.searchsorted(
+            block, np.datetime64(pd.Timestamp(to_date) + pd.Timedelta(days=1)), 'left'
+        )
+        return start + lo, start + hi
+
+    def window(self, plant_id, from_date=None, to_date=None):
+        """Rows for one plant inside an inclusive [from_date, to_date] day range"""
+        lo, hi = self.bounds(plant_id, from_date, to_date)
+        return self.df.iloc[lo:hi]
+
+# =====================================================
+# HIERARCHY INDEX
+# =====================================================
+class HierarchyIndex:
+    """
+    Pipeline output grouped by plant → sub-plant → equipment → component → sensor
+    Rows are sorted on the hierarchy columns, so every prefix path is one
+    contiguous block; the bounds of every block at every level are held in one
+    dict, making point and prefix lookups a single hash probe.
+
+    Lookups take a path of 0..len(levels) keys, e.g.
+        index.rows('Plant-1', 'Grinding Plant')
+        index.last('Plant-1', 'Grinding Plant', 'Ball Mill', 'Motor')
+    """
+
+    def __init__(self, df, levels=HIERARCHY_LEVELS, time_column='timestamp'):
+        self.levels = list(levels)
+        codes = [pd.factorize(df[level].astype(str), sort=True) for level in self.levels]
+        order = np.lexsort([level_codes for level_codes, _ in codes[::-1]])
+
+        self.df = df.iloc[order]
+        self.order = order
+        n = len(order)
+        self._children = {}
+
+        # Sorted positions from oldest to latest reading (ties: later original row is later)
+        if time_column in df.columns:
+            by_recency = np.lexsort((order, df[time_column].to_numpy()[order]))
+        else:
+            by_recency = np.argsort(order)
+        recency = np.empty(n, dtype=int)
+        recency[by_recency] = np.arange(n)
+        self.blocks = {(): (0, n)}
+        self.last_row = {(): int(by_recency[-1]) if n else 0}
+
+        sorted_codes = [level_codes[order] for level_codes, _ in codes]
+        changed = np.zeros(max(n - 1, 0), dtype=bool)
+        for depth in range(1, len(self.levels) + 1):
+            level_codes = sorted_codes[depth - 1]
+            changed |= level_codes[1:] != level_codes[:-1]
+            starts = np.concatenate(([0], np.flatnonzero(changed) + 1)) if n else np.array([], dtype=int)
+            stops = np.append(starts[1:], n)
+            # Sorted position of each block's latest reading
+            lasts = by_recency[np.maximum.reduceat(recency, starts)] if n else starts
+            for start, stop, last in zip(starts, stops, lasts):
+                path = tuple(uniques[sorted_codes[i][start]] for i, (_, uniques) in enumerate(codes[:depth]))
+                self.blocks[path] = (int(start), int(stop))
+                self.last_row[path] = int(last)
+                self._children.setdefault(path[:-1], []).append(path[-1])
+
+    def __len__(self):
+        return len(self.df)
+
+    @staticmethod
+    def _key(path):
+        return tuple(str(key) for key in path)
+
+    def bounds(self, *path):
+        """[start, stop) of the block under `path` in the sorted frame; (0, 0) if unknown"""
+        return self.blocks.get(self._key(path), (0, 0))
+
+    def rows(self, *path):
+        """Rows under `path`, in their original order"""
+        start, stop = self.bounds(*path)
+        return self.df.iloc[start + np.argsort(self.order[start:stop], kind='stable')]
+
+    def children(self, *path):
+        """Keys one level below `path`, sorted"""
+        return list(self._children.get(self._key(path), []))
+
+    def last(self, *path, column='health_score', default=None):
+        """`column` of the latest reading under `path` (by time_column), or `default`"""
+        position = self.last_row.get(self._key(path))
+        if position is None or not len(self.df):
+            return default
+        return self.df[column].iat[position]
+
+# =====================================================
+# PARTITIONED HISTORY
+# =====================================================
+def _history_partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return ds.partitioning(
+        pa.schema([('plant_id', pa.string()), ('run_date', pa.date32()), ('reading_date', pa.date32())]),
+        flavor='hive'
+    )
+
+def append_history(df, history_dir=HISTORY_DIR, run_at=None):
+    """
+    Append one pipeline run to the partitioned history store
+    run_at (default: now, UTC) is stored as a run_at column, names the files and
+    its date is the run_date partition, so repeated runs on the same day sit side
+    by side instead of overwriting each other. Below that, rows are split by the
+    date of their timestamp into reading_date partitions.
+    Returns: False (nothing written) when pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError:
+        return False
+
+    run_at = pd.Timestamp(run_at) if run_at is not None else pd.Timestamp.now(tz='UTC').tz_localize(None)
+    # One resolution for every file, or the dataset's unified schema fails to cast
+    run_at = run_at.as_unit('us')
+    typed = typed_frame(df)
+    typed['plant_id'] = typed['plant_id'].astype(str)
+    typed['run_date'] = run_at.date()
+    typed['reading_date'] = typed['timestamp'].dt.date
+    typed['run_at'] = run_at
+
+    ds.write_dataset(
+        pa.Table.from_pandas(typed, preserve_index=False),
+        history_dir,
+        format='parquet',
+        partitioning=_history_partitioning(),
+        basename_template=f"run-{run_at:%Y%m%dT%H%M%S%f}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+    with open(os.path.join(history_dir, HISTORY_MARKER), 'w') as fh:
+        fh.write(f"{run_at.isoformat()}\n")
+    return True
+
+def history_version(history_dir=HISTORY_DIR):
+    """
+    (mtime_ns, size) of the marker append_history() rewrites after each run,
+    None when no run has been appended; one stat instead of walking the store
+    """
+    try:
+        stat = os.stat(os.path.join(history_dir, HISTORY_MARKER))
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def read_history(history_dir=HISTORY_DIR, plant_id=None, from_date=None, to_date=None, columns=None,
+                 readings_from=None, readings_to=None):
+    """
+    Runs from the history store, optionally for one plant, an inclusive
+    [from_date, to_date] run-date range and an inclusive [readings_from, readings_to]
+    range on the readings' dates; all three prune partitions, so only matching
+    files are opened
+    columns: subset to load (partition columns may be included)
+    """
+    import pyarrow.dataset as ds
+
+    if not os.path.isdir(history_dir):
+        return pd.DataFrame(columns=columns)
+
+    dataset = ds.dataset(history_dir, format='parquet', partitioning=_history_partitioning())
+    conditions = []
+    if plant_id is not None:
+        conditions.append(ds.field('plant_id') == plant_id)
+    if from_date is not None:
+        conditions.append(ds.field('run_date') >= pd.Timestamp(from_date).date())
+    if to_date is not None:
+        conditions.append(ds.field('run_date') <= pd.Timestamp(to_date).date())
+    if readings_from is not None:
+        conditions.append(ds.field('reading_date') >= pd.Timestamp(readings_from).date())
+    if readings_to is not None:
+        conditions.append(ds.field('reading_date') <= pd.Timestamp(readings_to).date())
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
@@ -0,0 +1,84 @@
+"""
+Process-wide LRU cache for the dashboards' Plotly figures
+A figure is keyed on (builder, data version, arguments): theme flags and
+colour dicts are ordinary arguments, and DataFrames are keyed by a content
+hash. Entries are built go.Figure objects shared across sessions, so callers
+must treat them as read-only. A pipeline reload drops every entry at once.
+
+    @FIGURES.cached
+    def create_treemap_visualization(is_dark, plant_id): ...
+"""
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pmanalysis.datastore import MINING_DATA
+except ImportError:  # run as a script from inside pmanalysis/
+    from datastore import MINING_DATA
+
+
+def freeze(value):
+    """Hashable stand-in for a builder argument"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, pd.DataFrame):
+        hashed = pd.util.hash_pandas_object(value, index=False).to_numpy()
+        return ('DataFrame', tuple(value.columns), tuple(map(str, value.dtypes)), hashed.tobytes())
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape, value.tobytes())
+    return value
+
+
+class FigureCache:
+    """
+    Built figures for the current version of `dataset`, least recently used
+    evicted past max_entries. The builder's code object is part of the key, so
+    editing a builder during development does not serve stale figures.
+    """
+
+    def __init__(self, dataset, max_entries=128, name='figures'):
+        self.dataset = dataset
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        dataset.on_reload(name, self.clear)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, builder, *args, **kwargs):
+        key = (builder.__qualname__, builder.__code__, self.dataset.version, freeze(args), freeze(kwargs))
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+                return figure
+
+        figure = builder(*args, **kwargs)
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure
+
+    def cached(self, builder):
+        """Decorator: serve builder(*args, **kwargs) from the cache"""
+        @wraps(builder)
+        def wrapper(*args, **kwargs):
+            return self.get(builder, *args, **kwargs)
+        return wrapper
+
+
+FIGURES = FigureCache(MINING_DATA)
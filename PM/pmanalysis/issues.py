@@ -0,0 +1,85 @@
+"""
+Columnar store for the dashboards' operations-panel issues
+Every incomplete pipeline row becomes one issue. The issue fields are built
+with vectorized column ops into a single DataFrame, and the positions of open
+and open-critical issues are kept as sorted id arrays that mark_done() updates,
+so the panel and the overview read counts and rows without rescanning.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Pipeline severity -> panel label; anything unmapped shows as DEFAULT_SEVERITY
+SEVERITY_LABELS = {'Critical': '🔴 Critical', 'Warning': '🟠 Attention', 'Normal': '🟢 Normal'}
+DEFAULT_SEVERITY = '🟠 Attention'
+CRITICAL_SEVERITY = SEVERITY_LABELS['Critical']
+
+# Panel column <- pipeline column
+ISSUE_FIELDS = {
+    "Sub-Plant": 'sub_plant',
+    "Equipment": 'equipment',
+    "Component": 'component',
+    "Health": 'health_score',
+    "Severity": 'severity',
+    "Action Type": 'maintenance_type',
+    "Due": 'action_required',
+    "Done": 'completed',
+    "Owner": 'owner',
+}
+
+
+class IssueStore:
+    """
+    Issues for the incomplete rows of a pipeline output frame
+    Issue ids are row positions in `table` and never change; open_ids and
+    critical_ids (open issues with CRITICAL_SEVERITY) are sorted id arrays.
+    """
+
+    def __init__(self, df):
+        pending = df[~df['completed'].astype(bool)]
+        table = pd.DataFrame(
+            {column: pending[source].to_numpy() for column, source in ISSUE_FIELDS.items()}
+        )
+        table["Health"] = table["Health"].astype(int)
+        table["Severity"] = (
+            pending['severity'].astype(str).map(SEVERITY_LABELS).fillna(DEFAULT_SEVERITY).to_numpy()
+        )
+        table["Done"] = table["Done"].astype(bool)
+        self.table = table
+
+        done = table["Done"].to_numpy()
+        self.open_ids = np.flatnonzero(~done)
+        self.critical_ids = np.flatnonzero(~done & (table["Severity"] == CRITICAL_SEVERITY).to_numpy())
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def open_count(self):
+        return len(self.open_ids)
+
+    @property
+    def critical_count(self):
+        return len(self.critical_ids)
+
+    def open_frame(self, columns=None):
+        """Open issues as a DataFrame (optionally only `columns`), in id order"""
+        table = self.table if columns is None else self.table[columns]
+        return table.iloc[self.open_ids]
+
+    def open_records(self):
+        """(issue_id, issue dict) for every open issue, in id order"""
+        return zip(self.open_ids.tolist(), self.open_frame().to_dict('records'))
+
+    @staticmethod
+    def _discard(ids, issue_id):
+        position = np.searchsorted(ids, issue_id)
+        if position < len(ids) and ids[position] == issue_id:
+            return np.delete(ids, position)
+        return ids
+
+    def mark_done(self, issue_id):
+        """Close one issue and drop it from the open/critical indices"""
+        self.table.at[issue_id, "Done"] = True
+        self.open_ids = self._discard(self.open_ids, issue_id)
+        self.critical_ids = self._discard(self.critical_ids, issue_id)
@@ -6,10 +6,26 @@ Output: Dashboard-ready CSV matching exact schema
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier
+from datetime import datetime, timezone
+from bisect import bisect_left, insort
+from collections import deque
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 import warnings
+import argparse
+import hashlib
+import json
+import os
+import time
+import joblib
+import sklearn
+try:
+    from pmanalysis.rules import RISK_LABELS, derive_business_columns, risk_code
+    from pmanalysis.datastore import append_history, write_parquet
+except ImportError:  # run as a script from inside pmanalysis/
+    from rules import RISK_LABELS, derive_business_columns, risk_code
+    from datastore import append_history, write_parquet
 warnings.filterwarnings('ignore')
 
 np.random.seed(42)
@@ -75,322 +91,1064 @@ COMPONENT_STRESS_FACTORS = {
 # =====================================================
 # STEP 2: GENERATE RAW SENSOR TIME-SERIES DATA
 # =====================================================
-def generate_raw_timeseries_data(plants=5, timesteps=1000):
+def _build_stream_catalog(plants):
     """
-    Generate raw sensor time-series data simulating real operational conditions
-    Returns: DataFrame with columns [plant_id, sub_plant, equipment, component, 
-             sensor_type, timestamp, readings (array)]
+    Enumerate every (plant, sub_plant, equipment, component, sensor) stream
+    Returns: (stream rows, component index of each stream, number of components)
     """
     plant_ids = [f"Plant-{i}" for i in range(1, plants + 1)]
-    base_timestamp = datetime(2024, 2, 8, 0, 0, 0)
-    
-    raw_data = []
-    
+
+    streams = []
+    stream_component = []
+    n_components = 0
+
     for plant_id in plant_ids:
         for sub_plant, equipments in PLANT_HIERARCHY.items():
             for equipment, components in equipments.items():
                 for component in components:
-                    sensors = SENSOR_MAPPING.get(component, ["General"])
-                    
-                    component_health_trajectory = np.linspace(
-                        np.random.uniform(85, 95),
-                        np.random.uniform(45, 75),
-                        timesteps
-                    )
-                    
-                    for sensor_type in sensors:
-                        ranges = SENSOR_OPERATIONAL_RANGES[sensor_type]
-                        stress = COMPONENT_STRESS_FACTORS[component]
-                        
-                        readings = []
-                        for step in range(timesteps):
-                            health = component_health_trajectory[step]
-                            health_degradation = (100 - health) / 100
-                            
-                            if sensor_type == "Wear":
-                                base_value = ranges["healthy"][0] + health_degradation * (
-                                    ranges["critical"][1] - ranges["healthy"][0]
-                                )
-                            else:
-                                base_value = (ranges["healthy"][0] + ranges["healthy"][1]) / 2
-                                base_value += health_degradation * stress * (
-                                    ranges["critical"][1] - base_value
-                                )
-                            
-                            noise = np.random.normal(0, base_value * 0.08)
-                            reading = max(base_value + noise, 0)
-                            readings.append(reading)
-                        
-                        raw_data.append({
-                            'plant_id': plant_id,
-                            'sub_plant': sub_plant,
-                            'equipment': equipment,
-                            'component': component,
-                            'sensor_type': sensor_type,
-                            'timestamp': base_timestamp,
-                            'readings': readings,
-                            'health_trajectory': component_health_trajectory
-                        })
-    
-    return pd.DataFrame(raw_data)
+                    for sensor_type in SENSOR_MAPPING.get(component, ["General"]):
+                        streams.append((plant_id, sub_plant, equipment, component, sensor_type))
+                        stream_component.append(n_components)
+                    n_components += 1
+
+    return streams, np.asarray(stream_component, dtype=np.intp), n_components
+
+def _sensor_baselines(streams):
+    """
+    Per-stream constants of the degradation model
+    Returns: (healthy midpoint / wear floor, critical ceiling, stress factor, is_wear)
+    """
+    start, ceiling, stress, is_wear = [], [], [], []
+
+    for _, _, _, component, sensor_type in streams:
+        ranges = SENSOR_OPERATIONAL_RANGES[sensor_type]
+        wear = sensor_type == "Wear"
+        start.append(ranges["healthy"][0] if wear else sum(ranges["healthy"]) / 2)
+        ceiling.append(ranges["critical"][1])
+        stress.append(COMPONENT_STRESS_FACTORS[component])
+        is_wear.append(wear)
+
+    return np.array(start), np.array(ceiling), np.array(stress), np.array(is_wear)
+
+class RawSensorData:
+    """
+    Columnar container for raw sensor streams
+    readings: float32 matrix (streams x timesteps), row i belongs to stream_id i
+    meta: one row per stream indexed by stream_id with the plant hierarchy,
+          sensor type, timestamp and the component's health_start / health_end
+    """
+    CATEGORY_COLUMNS = ['plant_id', 'sub_plant', 'equipment', 'component', 'sensor_type']
+
+    def __init__(self, meta, readings):
+        readings = np.asarray(readings, dtype=np.float32)
+        if readings.ndim != 2 or len(readings) != len(meta):
+            raise ValueError(
+                f"readings must be a (streams x timesteps) matrix with {len(meta)} rows, "
+                f"got shape {readings.shape}"
+            )
+        self.meta = meta
+        self.readings = readings
+
+    def __len__(self):
+        return len(self.meta)
+
+    @property
+    def timesteps(self):
+        return self.readings.shape[1]
+
+    @property
+    def health_final(self):
+        """Component health at the last timestep (the training target)"""
+        return self.meta['health_end']
+
+    def health_trajectory(self):
+        """Rebuild the linear per-stream health trajectory matrix on demand"""
+        ramp = np.linspace(0.0, 1.0, self.timesteps)
+        start = self.meta['health_start'].to_numpy()[:, None]
+        end = self.meta['health_end'].to_numpy()[:, None]
+        return start + (end - start) * ramp
+
+    def save(self, path):
+        """Write metadata to `path` (CSV) and readings next to it as `<stem>_readings.npy`"""
+        self.meta.to_csv(path)
+        np.save(self._readings_path(path), self.readings)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        meta = pd.read_csv(path, index_col='stream_id', parse_dates=['timestamp'])
+        for col in cls.CATEGORY_COLUMNS:
+            meta[col] = meta[col].astype('category')
+        return cls(meta, np.load(cls._readings_path(path), mmap_mode=mmap_mode))
+
+    @staticmethod
+    def _readings_path(path):
+        stem = str(path)[:-4] if str(path).endswith('.csv') else str(path)
+        return f"{stem}_readings.npy"
+
+def generate_raw_timeseries_data(plants=5, timesteps=1000, chunk_size=2048):
+    """
+    Generate raw sensor time-series data simulating real operational conditions
+    The reading matrix is drawn in NumPy batches of `chunk_size` streams.
+    Returns: RawSensorData with a float32 (streams x timesteps) readings matrix
+    """
+    base_timestamp = datetime(2024, 2, 8, 0, 0, 0)
+
+    streams, stream_component, n_components = _build_stream_catalog(plants)
+    start, ceiling, stress, is_wear = _sensor_baselines(streams)
+
+    # One linear health trajectory per component, shared by all of its sensors
+    health_start = np.random.uniform(85, 95, n_components)[stream_component]
+    health_end = np.random.uniform(45, 75, n_components)[stream_component]
+    ramp = np.linspace(0.0, 1.0, timesteps)
+
+    # Wear grows across the full healthy→critical span; every other sensor drifts
+    # from its healthy midpoint toward the critical ceiling, scaled by stress.
+    # Degradation is linear in time, so each stream's baseline is intercept + slope * ramp.
+    gain = np.where(is_wear, 1.0, stress) * (ceiling - start)
+    intercept = start + gain * (100 - health_start) / 100
+    slope = gain * (health_start - health_end) / 100
+
+    readings = np.empty((len(streams), timesteps), dtype=np.float32)
+    for lo in range(0, len(streams), chunk_size):
+        hi = min(lo + chunk_size, len(streams))
+        base_values = intercept[lo:hi, None] + slope[lo:hi, None] * ramp
+
+        # reading = max(base + N(0, 0.08 * base), 0)
+        chunk = np.random.standard_normal(base_values.shape)
+        chunk *= 0.08
+        chunk += 1
+        chunk *= base_values
+        np.maximum(chunk, 0, out=readings[lo:hi], casting='same_kind')
+
+    meta = pd.DataFrame(streams, columns=RawSensorData.CATEGORY_COLUMNS)
+    for col in RawSensorData.CATEGORY_COLUMNS:
+        meta[col] = meta[col].astype('category')
+    meta['timestamp'] = base_timestamp
+    meta['health_start'] = health_start
+    meta['health_end'] = health_end
+    meta.index.name = 'stream_id'
+
+    return RawSensorData(meta, readings)
 
 # =====================================================
 # STEP 3: FEATURE ENGINEERING FROM TIME-SERIES
 # =====================================================
-def extract_features_from_timeseries(readings):
-    """Extract statistical and temporal features from sensor readings"""
-    recent = readings[-100:]
-    
-    features = {
-        'mean': np.mean(recent),
-        'std': np.std(recent),
-        'max': np.max(recent),
-        'min': np.min(recent),
-        'median': np.median(recent),
-        'rms': np.sqrt(np.mean(np.square(recent))),
-        'peak_to_peak': np.max(recent) - np.min(recent),
-        'trend': np.polyfit(range(len(recent)), recent, 1)[0],
-        'acceleration': np.polyfit(range(len(recent)), recent, 2)[0],
-        'cv': np.std(recent) / (np.mean(recent) + 1e-10),
-        'skew': pd.Series(recent).skew(),
-        'kurtosis': pd.Series(recent).kurtosis(),
-        'latest': recent[-1]
-    }
-    
-    if len(recent) >= 20:
-        features['rolling_std'] = pd.Series(recent).rolling(20).std().iloc[-1]
-        features['rolling_max'] = pd.Series(recent).rolling(20).max().iloc[-1]
+FEATURE_WINDOW = 100
+ROLLING_WINDOW = 20
+
+FEATURE_NAMES = [
+    'mean', 'std', 'max', 'min', 'median', 'rms', 'peak_to_peak', 'trend',
+    'acceleration', 'cv', 'skew', 'kurtosis', 'latest', 'rolling_std', 'rolling_max'
+]
+
+def _trend_weights(n):
+    """
+    Closed-form least-squares weights over x = 0..n-1
+    readings @ linear gives the polyfit(deg=1) slope, readings @ quadratic the
+    polyfit(deg=2) leading coefficient (centred x makes x and x^2 - mean orthogonal)
+    """
+    x = np.arange(n, dtype=np.float64) - (n - 1) / 2
+    linear = x / np.dot(x, x) if n > 1 else np.zeros(n)
+    curve = x ** 2 - np.mean(x ** 2)
+    quadratic = curve / np.dot(curve, curve) if n > 2 else np.zeros(n)
+    return linear, quadratic
+
+def _sample_skew_kurtosis(n, m2, m3, m4):
+    """
+    Bias-corrected sample skew / excess kurtosis from centred power sums, as pandas computes them
+    m2, m3, m4: arrays of sum((x - mean)^k) over n samples
+    """
+    m2, m3, m4 = (np.asarray(m, dtype=np.float64) for m in (m2, m3, m4))
+    skew = np.full(m2.shape, np.nan)
+    kurtosis = np.full(m2.shape, np.nan)
+    flat = m2 < 1e-14
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if n >= 3:
+            skew = np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5
+            skew[flat] = 0.0
+        if n >= 4:
+            kurtosis = (
+                n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+                - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            )
+            kurtosis[flat] = 0.0
+    return skew, kurtosis
+
+def extract_features_batch(readings, window=FEATURE_WINDOW, rolling_window=ROLLING_WINDOW):
+    """
+    Extract statistical and temporal features for a whole (streams x timesteps) matrix
+    Moments are vectorized over rows; trend/acceleration use closed-form weights.
+    Returns: DataFrame with one row per stream and FEATURE_NAMES columns
+    """
+    recent = np.asarray(readings, dtype=np.float64)[:, -window:]
+    n = recent.shape[1]
+
+    mean = recent.mean(axis=1)
+    centered = recent - mean[:, None]
+    sq = centered ** 2
+    m2 = sq.sum(axis=1)
+    m3 = (sq * centered).sum(axis=1)
+    m4 = (sq * sq).sum(axis=1)
+    std = np.sqrt(m2 / n)
+    max_ = recent.max(axis=1)
+    min_ = recent.min(axis=1)
+
+    linear, quadratic = _trend_weights(n)
+
+    skew, kurtosis = _sample_skew_kurtosis(n, m2, m3, m4)
+
+    if n >= rolling_window:
+        tail = recent[:, -rolling_window:]
+        rolling_std = tail.std(axis=1, ddof=1)
+        rolling_max = tail.max(axis=1)
     else:
-        features['rolling_std'] = features['std']
-        features['rolling_max'] = features['max']
-    
-    return features
+        rolling_std = std
+        rolling_max = max_
 
-def engineer_features(raw_df):
-    """Apply feature engineering to raw time-series data"""
-    engineered = []
-    
-    for idx, row in raw_df.iterrows():
-        features = extract_features_from_timeseries(row['readings'])
-        sensor_type = row['sensor_type']
-        ranges = SENSOR_OPERATIONAL_RANGES[sensor_type]
-        
-        features['sensor_normalized'] = (features['latest'] - ranges["healthy"][0]) / (
-            ranges["critical"][1] - ranges["healthy"][0]
+    return pd.DataFrame({
+        'mean': mean,
+        'std': std,
+        'max': max_,
+        'min': min_,
+        'median': np.median(recent, axis=1),
+        'rms': np.sqrt(np.mean(recent ** 2, axis=1)),
+        'peak_to_peak': max_ - min_,
+        'trend': recent @ linear,
+        'acceleration': recent @ quadratic,
+        'cv': std / (mean + 1e-10),
+        'skew': skew,
+        'kurtosis': kurtosis,
+        'latest': recent[:, -1],
+        'rolling_std': rolling_std,
+        'rolling_max': rolling_max
+    }, columns=FEATURE_NAMES)
+
+def extract_features_from_timeseries(readings):
+    """Extract statistical and temporal features from a single stream's readings"""
+    return extract_features_batch(np.asarray(readings)[None, :]).iloc[0].to_dict()
+
+def _category_lookup(column, mapping):
+    """Vectorized dict lookup over a (categorical) column"""
+    column = column.astype('category')
+    table = np.array([mapping[c] for c in column.cat.categories], dtype=np.float64)
+    return table[column.cat.codes.to_numpy()]
+
+def add_condition_features(feature_df):
+    """Add range-normalized and anomaly columns from sensor_type / component and base features"""
+    sensor_types = feature_df['sensor_type']
+    healthy_low = _category_lookup(sensor_types, {s: r["healthy"][0] for s, r in SENSOR_OPERATIONAL_RANGES.items()})
+    warning_high = _category_lookup(sensor_types, {s: r["warning"][1] for s, r in SENSOR_OPERATIONAL_RANGES.items()})
+    critical_high = _category_lookup(sensor_types, {s: r["critical"][1] for s, r in SENSOR_OPERATIONAL_RANGES.items()})
+
+    latest = feature_df['latest'].to_numpy()
+    exceeded = latest > warning_high
+
+    feature_df['sensor_normalized'] = (latest - healthy_low) / (critical_high - healthy_low)
+    feature_df['threshold_exceedance'] = exceeded.astype(int)
+    feature_df['stress_factor'] = _category_lookup(feature_df['component'], COMPONENT_STRESS_FACTORS)
+
+    anomaly_score = (
+        exceeded.astype(int)
+        + (np.abs(feature_df['trend'].to_numpy()) > feature_df['std'].to_numpy())
+        + (feature_df['cv'].to_numpy() > 0.3)
+    )
+    feature_df['anomaly_detected'] = anomaly_score >= 2
+    return feature_df
+
+# Multi-horizon mode: trailing windows given as durations at SAMPLE_INTERVAL spacing
+SAMPLE_INTERVAL = pd.Timedelta(minutes=1)
+MULTI_WINDOWS = ("1h", "8h", "24h", "7d")
+MULTI_WINDOW_FEATURES = ['mean', 'std', 'rms', 'min', 'max', 'trend', 'cv']
+
+def _window_samples(label, sample_interval, timesteps):
+    """Samples in a trailing window, clamped to the available history"""
+    samples = int(pd.Timedelta(label) // pd.Timedelta(sample_interval))
+    return max(2, min(samples, timesteps))
+
+def fitting_windows(windows, timesteps, sample_interval=SAMPLE_INTERVAL):
+    """
+    The windows that fit in `timesteps` samples, in order
+    Longer ones would clamp to the full series and repeat each other's columns.
+    """
+    return tuple(
+        label for label in windows
+        if pd.Timedelta(label) // pd.Timedelta(sample_interval) <= timesteps
+    )
+
+def multiwindow_feature_columns(windows=MULTI_WINDOWS):
+    """Column names emitted by extract_multiwindow_features, e.g. '8h_trend'"""
+    return [f"{label}_{feature}" for label in windows for feature in MULTI_WINDOW_FEATURES]
+
+def extract_multiwindow_features(readings, windows=MULTI_WINDOWS, sample_interval=SAMPLE_INTERVAL):
+    """
+    Trailing-window features for several horizons at once
+    Prefix sums of x, x^2 and i*x over the longest window are built once; each
+    horizon is then a difference of two prefix columns, so N windows cost about
+    the same as one. Windows longer than the history are dropped (see fitting_windows).
+    Returns: DataFrame with '<label>_<feature>' columns, one row per stream
+    """
+    values = np.asarray(readings, dtype=np.float64)
+    windows = fitting_windows(windows, values.shape[1], sample_interval)
+    if not windows:
+        return pd.DataFrame(index=np.arange(len(values)))
+    sizes = {label: _window_samples(label, sample_interval, values.shape[1]) for label in windows}
+    longest = max(sizes.values())
+    tail = values[:, -longest:]
+
+    # Shift by the row mean so the squared prefix sums don't lose precision
+    shift = tail.mean(axis=1)
+    centred = tail - shift[:, None]
+    idx = np.arange(longest, dtype=np.float64)
+    zero = np.zeros((len(tail), 1))
+    c1 = np.hstack([zero, np.cumsum(centred, axis=1)])
+    c2 = np.hstack([zero, np.cumsum(centred ** 2, axis=1)])
+    ci = np.hstack([zero, np.cumsum(centred * idx, axis=1)])
+
+    # Suffix extremes: column k holds the max/min of the last k + 1 samples
+    suffix_max = np.maximum.accumulate(tail[:, ::-1], axis=1)
+    suffix_min = np.minimum.accumulate(tail[:, ::-1], axis=1)
+
+    columns = {}
+    for label, w in sizes.items():
+        start = longest - w
+        s1 = c1[:, -1] - c1[:, start]
+        s2 = c2[:, -1] - c2[:, start]
+        # sum of (local index) * value, local index = idx - start
+        si = ci[:, -1] - ci[:, start] - start * s1
+
+        a = s1 / w
+        mean = shift + a
+        std = np.sqrt(np.maximum(s2 / w - a * a, 0.0))
+        x_bar = (w - 1) / 2
+        trend = (si - x_bar * s1) / (w * (w * w - 1) / 12)
+
+        columns[f"{label}_mean"] = mean
+        columns[f"{label}_std"] = std
+        columns[f"{label}_rms"] = np.sqrt(np.maximum(s2 / w + 2 * shift * a + shift ** 2, 0.0))
+        columns[f"{label}_min"] = suffix_min[:, w - 1]
+        columns[f"{label}_max"] = suffix_max[:, w - 1]
+        columns[f"{label}_trend"] = trend
+        columns[f"{label}_cv"] = std / (mean + 1e-10)
+
+    return pd.DataFrame(columns, columns=multiwindow_feature_columns(windows))
+
+# Spectral stage: Welch-averaged spectra of vibration streams on rotating components
+SPECTRAL_COMPONENTS = ("Bearing", "Gearbox", "Pump", "Roller")
+SPECTRAL_WINDOW = 512
+SPECTRAL_FRAME = 64
+SPECTRAL_BANDS = 4
+
+def spectral_feature_columns(n_bands=SPECTRAL_BANDS):
+    return [f"band_energy_{i}" for i in range(1, n_bands + 1)] + [
+        'dominant_freq', 'spectral_kurtosis', 'crest_factor'
+    ]
+
+def extract_spectral_features(readings, window=SPECTRAL_WINDOW, frame=SPECTRAL_FRAME,
+                              n_bands=SPECTRAL_BANDS, sample_interval=SAMPLE_INTERVAL,
+                              batch_size=4096):
+    """
+    Batched spectral features for a (streams x timesteps) matrix
+    The last `window` samples of each stream are cut into Hann-tapered frames and
+    transformed with one rfft call per batch of `batch_size` streams.
+    band_energy_k: share of AC spectral energy in the k-th equal-width band
+    dominant_freq: frequency (Hz) of the strongest non-DC bin
+    spectral_kurtosis: peak over frequency of E|X|^4 / (E|X|^2)^2 - 2 across frames
+    crest_factor: peak / RMS of the mean-removed signal
+    Returns: DataFrame with spectral_feature_columns(n_bands), one row per stream
+    """
+    values = np.asarray(readings, dtype=np.float64)[:, -window:]
+    frame = min(frame, values.shape[1])
+    n_frames = values.shape[1] // frame
+    values = values[:, values.shape[1] - n_frames * frame:]
+
+    taper = np.hanning(frame)
+    freqs = np.fft.rfftfreq(frame, d=pd.Timedelta(sample_interval).total_seconds())[1:]
+    edges = np.linspace(0, len(freqs), n_bands + 1).astype(int)
+
+    out = np.zeros((len(values), n_bands + 3))
+    for lo in range(0, len(values), batch_size):
+        chunk = values[lo:lo + batch_size]
+        centred = chunk - chunk.mean(axis=1, keepdims=True)
+
+        frames = centred.reshape(len(chunk), n_frames, frame)
+        frames = (frames - frames.mean(axis=2, keepdims=True)) * taper
+        power = np.abs(np.fft.rfft(frames, axis=2)[:, :, 1:]) ** 2
+
+        psd = power.mean(axis=1)
+        total = psd.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bands = np.add.reduceat(psd, edges[:-1], axis=1) / total[:, None]
+            sk = (power ** 2).mean(axis=1) / psd ** 2 - 2
+            rms = np.sqrt((centred ** 2).mean(axis=1))
+            crest = np.abs(centred).max(axis=1) / rms
+
+        out[lo:lo + len(chunk), :n_bands] = np.nan_to_num(bands)
+        out[lo:lo + len(chunk), n_bands] = freqs[psd.argmax(axis=1)]
+        out[lo:lo + len(chunk), n_bands + 1] = np.nan_to_num(sk).max(axis=1)
+        out[lo:lo + len(chunk), n_bands + 2] = np.nan_to_num(crest)
+
+    return pd.DataFrame(out, columns=spectral_feature_columns(n_bands))
+
+def _spectral_streams(meta):
+    """Mask of vibration streams on components that get spectral features"""
+    return (
+        (meta['sensor_type'] == "Vibration").to_numpy()
+        & meta['component'].isin(SPECTRAL_COMPONENTS).to_numpy()
+    )
+
+def engineer_features(raw, windows=None, sample_interval=SAMPLE_INTERVAL, spectral=False):
+    """
+    Apply batched feature engineering to a RawSensorData batch
+    windows: optional horizons (e.g. MULTI_WINDOWS) adding '<label>_<feature>' columns
+             for those that fit the series
+    spectral: add spectral_feature_columns(), computed for vibration streams on
+              SPECTRAL_COMPONENTS and NaN for the streams spectra don't apply to
+    """
+    features = extract_features_batch(raw.readings)
+    parts = [raw.meta, features]
+    if windows:
+        parts.append(extract_multiwindow_features(raw.readings, windows, sample_interval))
+    if spectral:
+        mask = _spectral_streams(raw.meta)
+        spectral_df = pd.DataFrame(np.nan, index=np.arange(len(raw)), columns=spectral_feature_columns())
+        if mask.any():
+            spectral_df.loc[mask] = extract_spectral_features(
+                raw.readings[mask], sample_interval=sample_interval
+            ).to_numpy()
+        parts.append(spectral_df)
+    for part in parts[1:]:
+        part.index = raw.meta.index
+    feature_df = pd.concat(parts, axis=1)
+    return add_condition_features(feature_df).reset_index()
+
+class OnlineFeatureState:
+    """
+    Sliding-window feature state for one sensor stream
+    Keeps the last `window` readings in a ring buffer with running (shifted) power
+    sums and index-weighted sums, so each update is O(1) and features() never
+    re-scans history. Sums are re-centred from the buffer every `window` updates
+    to stop floating-point drift.
+    """
+    def __init__(self, window=FEATURE_WINDOW, rolling_window=ROLLING_WINDOW):
+        if not 0 < rolling_window <= window:
+            raise ValueError("rolling_window must be between 1 and window")
+        self.window = window
+        self.rolling_window = rolling_window
+        self._buffer = np.zeros(window)
+        self._seq = 0
+        self._sorted = []
+        self._max = deque()
+        self._min = deque()
+        self._rolling_max = deque()
+        self._reset_sums(0.0)
+
+    @property
+    def count(self):
+        return min(self._seq, self.window)
+
+    def _reset_sums(self, shift):
+        self._shift = shift
+        self._s1 = self._s2 = self._s3 = self._s4 = 0.0
+        self._t1 = self._t2 = 0.0
+        self._r1 = self._r2 = 0.0
+
+    def _resync(self):
+        values = self.values()
+        self._reset_sums(float(values.mean()))
+        d = values - self._shift
+        idx = np.arange(len(d), dtype=np.float64)
+        self._s1, self._s2 = d.sum(), (d ** 2).sum()
+        self._s3, self._s4 = (d ** 3).sum(), (d ** 4).sum()
+        self._t1, self._t2 = (idx * d).sum(), (idx ** 2 * d).sum()
+        tail = d[-self.rolling_window:]
+        self._r1, self._r2 = tail.sum(), (tail ** 2).sum()
+
+    def values(self):
+        """Readings currently in the window, oldest first"""
+        if self._seq <= self.window:
+            return self._buffer[:self._seq].copy()
+        head = self._seq % self.window
+        return np.concatenate([self._buffer[head:], self._buffer[:head]])
+
+    def update(self, value):
+        """Push one reading; O(1) apart from the sorted-window insert used for the median"""
+        value = float(value)
+        seq, window = self._seq, self.window
+        if seq == 0:
+            self._shift = value
+        d = value - self._shift
+        slot = seq % window
+
+        if seq >= self.rolling_window:
+            leaving = self._buffer[(seq - self.rolling_window) % window] - self._shift
+            self._r1 -= leaving
+            self._r2 -= leaving * leaving
+        self._r1 += d
+        self._r2 += d * d
+
+        if seq >= window:
+            old_value = self._buffer[slot]
+            old = old_value - self._shift
+            # Drop the oldest sample and shift every index down by one
+            s1 = self._s1 - old
+            self._t2 = self._t2 - 2 * self._t1 + s1 + (window - 1) ** 2 * d
+            self._t1 = self._t1 - s1 + (window - 1) * d
+            self._s1 = s1 + d
+            self._s2 += d * d - old * old
+            self._s3 += d ** 3 - old ** 3
+            self._s4 += d ** 4 - old ** 4
+            del self._sorted[bisect_left(self._sorted, old_value)]
+        else:
+            self._t1 += seq * d
+            self._t2 += seq * seq * d
+            self._s1 += d
+            self._s2 += d * d
+            self._s3 += d ** 3
+            self._s4 += d ** 4
+
+        self._buffer[slot] = value
+        insort(self._sorted, value)
+        self._push_extreme(self._max, seq, value, window, sign=1)
+        self._push_extreme(self._min, seq, value, window, sign=-1)
+        self._push_extreme(self._rolling_max, seq, value, self.rolling_window, sign=1)
+
+        self._seq = seq + 1
+        if self._seq % window == 0:
+            self._resync()
+        return self
+
+    def extend(self, values):
+        for value in values:
+            self.update(value)
+        return self
+
+    @staticmethod
+    def _push_extreme(extremes, seq, value, span, sign):
+        """Monotonic deque: front is the window max (sign=1) or min (sign=-1), amortized O(1)"""
+        while extremes and sign * extremes[-1][1] <= sign * value:
+            extremes.pop()
+        extremes.append((seq, value))
+        while extremes[0][0] <= seq - span:
+            extremes.popleft()
+
+    def features(self):
+        """Current window features, matching extract_features_from_timeseries over the same readings"""
+        n = self.count
+        if n == 0:
+            raise ValueError("no readings in window")
+
+        a = self._s1 / n
+        m2 = max(self._s2 - n * a * a, 0.0)
+        m3 = self._s3 - 3 * a * self._s2 + 2 * n * a ** 3
+        m4 = self._s4 - 4 * a * self._s3 + 6 * a * a * self._s2 - 3 * n * a ** 4
+        mean = self._shift + a
+        std = np.sqrt(m2 / n)
+        skew, kurtosis = _sample_skew_kurtosis(n, [m2], [m3], [m4])
+
+        # Closed-form polyfit over x = 0..n-1 using centred orthogonal polynomials
+        x_bar = (n - 1) / 2
+        spread = (n * n - 1) / 12
+        trend = (self._t1 - x_bar * self._s1) / (n * spread) if n > 1 else 0.0
+        curve_norm = n * (n * n - 1) * (3 * n * n - 7) / 240 - n * spread ** 2
+        acceleration = (
+            (self._t2 - 2 * x_bar * self._t1 + (x_bar ** 2 - spread) * self._s1) / curve_norm
+            if n > 2 else 0.0
         )
-        features['threshold_exceedance'] = int(features['latest'] > ranges["warning"][1])
-        features['stress_factor'] = COMPONENT_STRESS_FACTORS[row['component']]
-        
-        anomaly_score = 0
-        if features['latest'] > ranges["warning"][1]:
-            anomaly_score += 1
-        if abs(features['trend']) > features['std']:
-            anomaly_score += 1
-        if features['cv'] > 0.3:
-            anomaly_score += 1
-        
-        features['anomaly_detected'] = bool(anomaly_score >= 2)
-        
-        engineered.append({
-            **row.to_dict(),
-            **features
-        })
-    
-    return pd.DataFrame(engineered)
+
+        max_ = self._max[0][1]
+        min_ = self._min[0][1]
+        mid = n // 2
+        median = self._sorted[mid] if n % 2 else (self._sorted[mid - 1] + self._sorted[mid]) / 2
+
+        rw = self.rolling_window
+        if n >= rw:
+            rolling_std = np.sqrt(max(self._r2 - self._r1 ** 2 / rw, 0.0) / (rw - 1)) if rw > 1 else np.nan
+            rolling_max = self._rolling_max[0][1]
+        else:
+            rolling_std = std
+            rolling_max = max_
+
+        return {
+            'mean': mean,
+            'std': std,
+            'max': max_,
+            'min': min_,
+            'median': median,
+            'rms': np.sqrt((self._s2 + 2 * self._shift * self._s1) / n + self._shift ** 2),
+            'peak_to_peak': max_ - min_,
+            'trend': trend,
+            'acceleration': acceleration,
+            'cv': std / (mean + 1e-10),
+            'skew': skew[0],
+            'kurtosis': kurtosis[0],
+            'latest': self._buffer[(self._seq - 1) % self.window],
+            'rolling_std': rolling_std,
+            'rolling_max': rolling_max
+        }
+
+class OnlineFeatureBank:
+    """
+    Online feature states keyed by (plant_id, sub_plant, equipment, component, sensor_type)
+    Usage:
+        bank = OnlineFeatureBank.from_raw(raw)
+        bank.update(("Plant-1", "Crushing Plant", "Jaw Crusher", "Bearing", "Vibration"), 3.2)
+        feature_df = bank.features()
+    """
+    KEY_COLUMNS = RawSensorData.CATEGORY_COLUMNS
+
+    def __init__(self, window=FEATURE_WINDOW, rolling_window=ROLLING_WINDOW):
+        self.window = window
+        self.rolling_window = rolling_window
+        self.states = {}
+
+    def __len__(self):
+        return len(self.states)
+
+    def state(self, key):
+        key = tuple(key)
+        if key not in self.states:
+            self.states[key] = OnlineFeatureState(self.window, self.rolling_window)
+        return self.states[key]
+
+    def update(self, key, value):
+        return self.state(key).update(value)
+
+    def extend(self, key, values):
+        return self.state(key).extend(values)
+
+    @classmethod
+    def from_raw(cls, raw, window=FEATURE_WINDOW, rolling_window=ROLLING_WINDOW):
+        """Seed one state per stream with the last `window` readings of a RawSensorData batch"""
+        bank = cls(window, rolling_window)
+        keys = raw.meta[cls.KEY_COLUMNS].itertuples(index=False, name=None)
+        for key, readings in zip(keys, raw.readings[:, -window:]):
+            bank.extend(key, readings)
+        return bank
+
+    def features(self):
+        """Current features for every stream, in the engineer_features column layout"""
+        keys = pd.DataFrame(list(self.states.keys()), columns=self.KEY_COLUMNS)
+        features = pd.DataFrame([s.features() for s in self.states.values()], columns=FEATURE_NAMES)
+        return add_condition_features(pd.concat([keys, features], axis=1))
+
+# =====================================================
+# MODEL ARTIFACTS: SAVE / WARM-LOAD
+# =====================================================
+ARTIFACT_FORMAT = "pm-model"
+ARTIFACT_VERSION = 1
+MODEL_DIR = "models"
+
+def training_data_hash(X, y):
+    """Stable SHA-256 over the training frame (values and column names) and target"""
+    X = pd.DataFrame(X)
+    digest = hashlib.sha256()
+    digest.update("|".join(map(str, X.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(pd.Series(np.asarray(y)), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def read_artifact_metadata(path):
+    """Read an artifact's JSON header without unpickling the model"""
+    with open(f"{path}.json") as fh:
+        return json.load(fh)
+
+class PersistentModelMixin:
+    """
+    save()/load() for models holding a fitted `model` and its `scaler` (None when unscaled)
+    Artifact: joblib payload at `path` plus a JSON metadata header at `path`.json
+    """
+    feature_columns = None
+    training_hash = None
+    n_training_rows = None
+    # constructor arguments recorded in the artifact header and passed back on load
+    init_param_names = ()
+
+    def _record_training(self, X, y):
+        self.feature_columns = [str(c) for c in X.columns] if hasattr(X, 'columns') else None
+        self.training_hash = training_data_hash(X, y)
+        self.n_training_rows = len(X)
+
+    def _select_features(self, X):
+        """Reorder DataFrame inputs to the training column order"""
+        if self.feature_columns is not None and hasattr(X, 'columns'):
+            return X[self.feature_columns]
+        return X
+
+    def metadata(self):
+        return {
+            'format': ARTIFACT_FORMAT,
+            'format_version': ARTIFACT_VERSION,
+            'model_class': type(self).__name__,
+            'estimator': type(self.model).__name__,
+            'feature_columns': self.feature_columns,
+            'training_data_hash': self.training_hash,
+            'n_training_rows': self.n_training_rows,
+            'sklearn_version': sklearn.__version__,
+            'numpy_version': np.__version__,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            **{name: getattr(self, name) for name in self.init_param_names}
+        }
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = self.metadata()
+        joblib.dump({'metadata': header, 'scaler': self.scaler, 'model': self.model}, path)
+        with open(f"{path}.json", 'w') as fh:
+            json.dump(header, fh, indent=2)
+        return header
+
+    @classmethod
+    def load(cls, path, strict=False):
+        """
+        Load a saved artifact
+        strict: refuse artifacts written by a different scikit-learn version
+        """
+        payload = joblib.load(path)
+        header = payload.get('metadata', {})
+        check_artifact_metadata(header, cls, strict=strict)
+
+        params = {name: header[name] for name in cls.init_param_names if name in header}
+        obj = cls(**params)
+        obj.scaler = payload['scaler']
+        obj.model = payload['model']
+        obj.feature_columns = header.get('feature_columns')
+        obj.training_hash = header.get('training_data_hash')
+        obj.n_training_rows = header.get('n_training_rows')
+        return obj
+
+def check_artifact_metadata(header, model_cls, feature_columns=None, strict=True):
+    """
+    Validate an artifact header; raises ValueError describing the first mismatch
+    feature_columns: expected input columns, if the caller knows them
+    """
+    if header.get('format') != ARTIFACT_FORMAT or header.get('format_version') != ARTIFACT_VERSION:
+        raise ValueError(
+            f"unsupported artifact format {header.get('format')!r} v{header.get('format_version')}, "
+            f"expected {ARTIFACT_FORMAT!r} v{ARTIFACT_VERSION}"
+        )
+    if header.get('model_class') != model_cls.__name__:
+        raise ValueError(f"artifact holds a {header.get('model_class')}, expected {model_cls.__name__}")
+    if feature_columns is not None and header.get('feature_columns') != [str(c) for c in feature_columns]:
+        raise ValueError("artifact was trained on different feature columns")
+    if strict and header.get('sklearn_version') != sklearn.__version__:
+        raise ValueError(
+            f"artifact was written by scikit-learn {header.get('sklearn_version')}, "
+            f"running {sklearn.__version__}"
+        )
+
+def load_or_train(model_cls, path, X, y, retrain=False, reuse=False, **params):
+    """
+    Warm-load `path` when its header matches X's columns, this scikit-learn and
+    the constructor `params`, otherwise train a fresh model_cls(**params) on (X, y) and save it
+    An artifact trained on other data than (X, y) is retrained, unless reuse=True
+    asks to score with it anyway (with a warning).
+    Returns: (model, warm_loaded)
+    """
+    if not retrain and os.path.exists(path) and os.path.exists(f"{path}.json"):
+        try:
+            header = read_artifact_metadata(path)
+            check_artifact_metadata(header, model_cls, feature_columns=X.columns)
+            for key, value in params.items():
+                if header.get(key) != value:
+                    raise ValueError(f"artifact has {key}={header.get(key)!r}, wanted {value!r}")
+            stored, current = header.get('training_data_hash') or '', training_data_hash(X, y)
+            if stored != current:
+                if not reuse:
+                    raise ValueError(f"trained on data {stored[:12]}, not the current {current[:12]}")
+                print(f"      WARNING: scoring with {path}, trained on data {stored[:12]} "
+                      f"(current data {current[:12]})")
+            return model_cls.load(path, strict=True), True
+        except ValueError as exc:
+            print(f"      Ignoring stale artifact {path}: {exc}")
+
+    model = model_cls(**params)
+    model.train(X, y)
+    model.save(path)
+    return model, False
 
 # =====================================================
 # STEP 4: ML MODEL - HEALTH SCORE PREDICTOR
 # =====================================================
-class HealthScoreModel:
+HEALTH_FEATURE_COLS = ['mean', 'std', 'max', 'min', 'rms', 'trend', 'cv', 'sensor_normalized',
+                       'threshold_exceedance', 'stress_factor', 'rolling_std', 'acceleration']
+
+class HealthScoreModel(PersistentModelMixin):
+    """
+    RandomForest health score; trees are scale-invariant so features go in unscaled
+    (artifacts saved with a fitted scaler still load and apply it)
+    """
     def __init__(self):
         self.model = RandomForestRegressor(
             n_estimators=150, max_depth=12, min_samples_split=4,
             random_state=42, n_jobs=-1
         )
-        self.scaler = StandardScaler()
+        self.scaler = None
     
     def train(self, X, y):
-        X_scaled = self.scaler.fit_transform(X)
-        self.model.fit(X_scaled, y)
-    
+        self._record_training(X, y)
+        self.model.fit(self._inputs(X), y)
+
+    def _inputs(self, X):
+        if self.scaler is None:
+            return np.asarray(self._select_features(X), dtype=np.float32)
+        return self.scaler.transform(self._select_features(X))
+
     def predict(self, X):
-        X_scaled = self.scaler.transform(X)
-        predictions = self.model.predict(X_scaled)
+        X_in = self._inputs(X)
+        if self.model.n_jobs == 1:
+            predictions = self._predict_sequential(X_in)
+        else:
+            predictions = self.model.predict(X_in)
         return np.clip(predictions, 40, 95).astype(int)
 
+    def _predict_sequential(self, X):
+        """
+        RandomForestRegressor.predict for n_jobs=1 without joblib's per-tree dispatch
+        Same float32 inputs, per-tree traversal and summation order, so the output
+        is identical; the dispatch dominates when scoring a handful of rows.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        total = np.zeros(len(X))
+        for estimator in self.model.estimators_:
+            total += estimator.tree_.predict(X)[:, 0]
+        return total / len(self.model.estimators_)
+
 # =====================================================
 # STEP 5: ML MODEL - RISK CLASSIFIER
 # =====================================================
-class RiskClassificationModel:
-    def __init__(self):
-        self.model = GradientBoostingClassifier(
-            n_estimators=120, max_depth=6, learning_rate=0.12,
-            random_state=42
-        )
-        self.scaler = StandardScaler()
-        self.risk_labels = {
-            0: "Low Failure Risk",
-            1: "Medium Failure Risk",
-            2: "High Failure Risk"
-        }
+RISK_FEATURE_COLS = ['health_score', 'anomaly_detected', 'sensor_normalized',
+                     'trend', 'threshold_exceedance']
+
+RISK_BACKENDS = ('gbm', 'hist')
+
+class RiskClassificationModel(PersistentModelMixin):
+    """
+    Failure-risk classifier
+    backend='gbm': exact-split GradientBoostingClassifier on standardized features
+    backend='hist': HistGradientBoostingClassifier (binned splits, multi-core, early
+    stopping on a 10% validation split), fed unscaled features
+    """
+    init_param_names = ('backend',)
+
+    def __init__(self, backend='gbm'):
+        if backend not in RISK_BACKENDS:
+            raise ValueError(f"unknown risk backend {backend!r}, expected one of {RISK_BACKENDS}")
+        self.backend = backend
+        if backend == 'hist':
+            self.model = HistGradientBoostingClassifier(
+                max_iter=300, max_depth=6, learning_rate=0.12,
+                early_stopping=True, validation_fraction=0.1, n_iter_no_change=10,
+                random_state=42
+            )
+            self.scaler = None
+        else:
+            self.model = GradientBoostingClassifier(
+                n_estimators=120, max_depth=6, learning_rate=0.12,
+                random_state=42
+            )
+            self.scaler = StandardScaler()
+        self.risk_labels = dict(enumerate(RISK_LABELS))
+
+    def _inputs(self, X):
+        if self.scaler is None:
+            return np.asarray(self._select_features(X), dtype=np.float64)
+        return self.scaler.transform(self._select_features(X))
     
     def train(self, X, y):
-        X_scaled = self.scaler.fit_transform(X)
-        self.model.fit(X_scaled, y)
+        self._record_training(X, y)
+        if self.scaler is not None:
+            self.scaler.fit(X)
+        self.model.fit(self._inputs(X), y)
+
+    def predict_codes(self, X):
+        return self.model.predict(self._inputs(X))
     
     def predict(self, X):
-        X_scaled = self.scaler.transform(X)
-        risk_codes = self.model.predict(X_scaled)
-        return [self.risk_labels[code] for code in risk_codes]
+        return [self.risk_labels[code] for code in self.predict_codes(X)]
+
+def compare_risk_backends(X, y, backends=RISK_BACKENDS, test_size=0.25):
+    """
+    Fit each risk backend on the same split and score it on the holdout
+    Returns: DataFrame with backend, fit_seconds, holdout_accuracy
+    """
+    stratify = y if np.bincount(np.asarray(y)).min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=42, stratify=stratify
+    )
+    rows = []
+    for backend in backends:
+        model = RiskClassificationModel(backend)
+        started = time.perf_counter()
+        model.train(X_train, y_train)
+        elapsed = time.perf_counter() - started
+        accuracy = np.mean(model.predict_codes(X_test) == np.asarray(y_test))
+        rows.append({'backend': backend, 'fit_seconds': elapsed, 'holdout_accuracy': accuracy})
+    return pd.DataFrame(rows)
+
+def risk_inputs(feature_df):
+    """Risk model input frame from features that already carry a health_score"""
+    X_risk = feature_df[RISK_FEATURE_COLS].copy()
+    X_risk['anomaly_detected'] = X_risk['anomaly_detected'].astype(int)
+    return X_risk
+
+def score_features(feature_df, model_dir=MODEL_DIR, health_model=None, risk_model=None):
+    """
+    Score engineered features with persisted models, without retraining
+    Returns: copy of feature_df with health_score and ml_failure_risk columns
+    """
+    health_model = health_model or HealthScoreModel.load(os.path.join(model_dir, 'health_model.joblib'))
+    risk_model = risk_model or RiskClassificationModel.load(os.path.join(model_dir, 'risk_model.joblib'))
+
+    scored = feature_df.copy()
+    health_cols = health_model.feature_columns or HEALTH_FEATURE_COLS
+    scored['health_score'] = health_model.predict(scored[health_cols].fillna(0))
+    scored['ml_failure_risk'] = risk_model.predict(risk_inputs(scored))
+    return scored
 
 # =====================================================
-# STEP 6: BUSINESS LOGIC FUNCTIONS
+# STEP 6: BUSINESS LOGIC
 # =====================================================
-def compute_status(health_score):
-    if health_score >= 85: return "Healthy"
-    elif health_score >= 70: return "Warning"
-    else: return "Critical"
-
-def compute_maintenance_type(health_score):
-    if health_score >= 85: return "Proactive"
-    elif health_score >= 70: return "Preventive"
-    else: return "Predictive"
-
-def compute_action_required(health_score):
-    if health_score >= 85: return "Continue monitoring"
-    elif health_score >= 70: return "Plan inspection"
-    else: return "Immediate inspection & shutdown planning"
-
-def compute_severity(health_score):
-    if health_score >= 85: return "Normal"
-    elif health_score >= 70: return "Warning"
-    else: return "Critical"
-
-def compute_priority(health_score):
-    if health_score >= 85: return "Low"
-    elif health_score >= 70: return "Medium"
-    else: return "High"
-
-def compute_failure_days(health_score, anomaly, stress_factor):
-    base_rate = 0.018
-    
-    if health_score < 65:
-        days = (health_score - 40) / (base_rate * 12 * stress_factor)
-    elif health_score < 80:
-        days = (health_score - 50) / (base_rate * 6 * stress_factor)
-    else:
-        days = (health_score - 70) / (base_rate * 3 * stress_factor)
-    
-    if anomaly:
-        days *= 0.55
-    
-    return max(int(days), 1)
+# Band thresholds and the vectorized rule engine live in rules.py, shared with the dashboards
+
+# Sensor-specific output column: (sensor types it applies to, source feature, decimals)
+SENSOR_OUTPUT_COLUMNS = {
+    'vibration_rms': (["Vibration"], 'rms', 1),
+    'temperature_celsius': (["Temperature"], 'latest', 0),
+    'pressure_bar': (["Pressure"], 'latest', 1),
+    'power_kw': (["Power"], 'latest', 0),
+    'wear_percentage': (["Wear", "Speed"], 'latest', 0),
+}
+SPEED_COMPONENTS = ["Bearing", "Motor", "Gearbox"]
+SPEED_RPM_RANGE = (800, 1800)
+COMPONENT_KEYS = ['plant_id', 'sub_plant', 'equipment', 'component']
+
+def derive_sensor_columns(feature_df):
+    """
+    Sensor-specific reading columns from masks over sensor_type / component
+    Each column carries the rounded source feature where its sensor type matches
+    and 0.0 elsewhere; speed_rpm draws one reading per rotating-component row, in row order.
+    Returns: DataFrame on feature_df.index
+    """
+    sensor_types = feature_df['sensor_type'].to_numpy()
+    out = pd.DataFrame(index=feature_df.index)
+    out['sensor_value'] = feature_df['latest'].round(1)
+    for column, (types, source, decimals) in SENSOR_OUTPUT_COLUMNS.items():
+        mask = np.isin(sensor_types, types)
+        out[column] = np.where(mask, feature_df[source].round(decimals).to_numpy(), 0.0)
 
-def compute_due_date(timestamp, health_score):
-    if health_score < 70: return timestamp + timedelta(days=1)
-    elif health_score < 85: return timestamp + timedelta(days=7)
-    else: return timestamp + timedelta(days=14)
+    rotating = feature_df['component'].isin(SPEED_COMPONENTS).to_numpy()
+    speed = np.zeros(len(feature_df), dtype=int)
+    speed[rotating] = np.random.randint(*SPEED_RPM_RANGE, size=int(rotating.sum()))
+    out['speed_rpm'] = speed
+    return out
 
-def assign_owner(completed):
-    if completed:
-        return np.random.choice(["Operations Team", "Maintenance Team"], p=[0.65, 0.35])
-    return "Unassigned"
+def pivot_sensor_wide(output_df):
+    """
+    Wide layout: one row per component, one sensor_value column per sensor type
+    (NaN where the component has no such sensor), with the component's worst
+    health_score and whether any of its sensors flagged an anomaly
+    """
+    grouped = output_df.groupby(COMPONENT_KEYS, observed=True, sort=False)
+    readings = output_df.pivot_table(
+        index=COMPONENT_KEYS, columns='sensor_type', values='sensor_value',
+        aggfunc='first', observed=True, sort=False
+    )
+    readings.columns = list(readings.columns)
+    summary = grouped.agg(
+        timestamp=('timestamp', 'first'),
+        health_score=('health_score', 'min'),
+        anomaly_detected=('anomaly_detected', 'any')
+    )
+    return summary.join(readings).reset_index()
 
 # =====================================================
 # STEP 7: MAIN PIPELINE
 # =====================================================
-def main_pipeline():
+def main_pipeline(windows=None, model_dir=MODEL_DIR, retrain=False, reuse_models=False, risk_backend='gbm',
+                  compare_backends=False, wide=False, history_dir='history', spectral=False):
+    """
+    Run the pipeline end to end
+    model_dir: where health/risk model artifacts are saved and warm-loaded from
+    retrain: ignore saved artifacts and fit both models again
+    reuse_models: score with saved artifacts even when they were trained on other
+                  data (a warning is printed); by default such artifacts are refit
+    risk_backend: 'gbm' or 'hist' (see RiskClassificationModel)
+    compare_backends: also fit every risk backend on a holdout split and report its
+                      fit wall time and accuracy (off by default: it refits each backend)
+    wide: also export mining_data_wide.csv, one row per component (see pivot_sensor_wide)
+    history_dir: partitioned store each run is appended to (None to skip)
+    spectral: add spectral features for vibration streams and train the health model on them
+    """
     print("="*80)
     print("MINING PREDICTIVE MAINTENANCE ML PIPELINE")
     print("="*80)
     
     print("\n[1/8] Generating raw sensor time-series data...")
-    raw_df = generate_raw_timeseries_data(plants=5, timesteps=1000)
-    print(f"      Generated {len(raw_df)} sensor streams")
+    raw = generate_raw_timeseries_data(plants=5, timesteps=1000)
+    print(f"      Generated {len(raw)} sensor streams x {raw.timesteps} timesteps")
 
     output_file = 'data.csv'
-    raw_df.to_csv(output_file, index=False)
+    raw.save(output_file)
     
     print("\n[2/8] Engineering features from time-series...")
-    feature_df = engineer_features(raw_df)
-    print(f"      Extracted {len([c for c in feature_df.columns if c not in raw_df.columns])} features per sensor")
+    if windows:
+        fitting = fitting_windows(windows, raw.timesteps)
+        if len(fitting) < len(windows):
+            print(f"      Dropped windows longer than {raw.timesteps} samples: "
+                  f"{', '.join(w for w in windows if w not in fitting)}")
+        windows = fitting
+    feature_df = engineer_features(raw, windows=windows, spectral=spectral)
+    meta_cols = set(raw.meta.columns) | {raw.meta.index.name}
+    print(f"      Extracted {len([c for c in feature_df.columns if c not in meta_cols])} features per sensor")
     
     print("\n[3/8] Training Health Score prediction model...")
-    feature_cols = ['mean', 'std', 'max', 'min', 'rms', 'trend', 'cv', 'sensor_normalized',
-                    'threshold_exceedance', 'stress_factor', 'rolling_std', 'acceleration']
+    feature_cols = list(HEALTH_FEATURE_COLS)
+    if windows:
+        feature_cols += multiwindow_feature_columns(windows)
+    if spectral:
+        feature_cols += spectral_feature_columns()
     
     X_health = feature_df[feature_cols].fillna(0)
-    y_health = feature_df['health_trajectory'].apply(lambda x: x[-1])
+    y_health = feature_df['health_end']
     
-    health_model = HealthScoreModel()
-    health_model.train(X_health, y_health)
+    health_model, warm = load_or_train(
+        HealthScoreModel, os.path.join(model_dir, 'health_model.joblib'), X_health, y_health, retrain,
+        reuse=reuse_models
+    )
+    if warm:
+        print(f"      Warm-loaded model trained on data {health_model.training_hash[:12]}")
     
     feature_df['health_score'] = health_model.predict(X_health)
     print(f"      RMSE: {np.sqrt(np.mean((feature_df['health_score'] - y_health)**2)):.2f}")
     
     print("\n[4/8] Training Risk Classification model...")
-    risk_feature_cols = ['health_score', 'anomaly_detected', 'sensor_normalized', 
-                         'trend', 'threshold_exceedance']
+    X_risk = risk_inputs(feature_df)
     
-    X_risk = feature_df[risk_feature_cols].copy()
-    X_risk['anomaly_detected'] = X_risk['anomaly_detected'].astype(int)
+    y_risk = pd.Series(risk_code(feature_df['health_score']), index=feature_df.index)
     
-    y_risk = feature_df['health_score'].apply(
-        lambda h: 2 if h < 65 else (1 if h < 80 else 0)
-    )
+    if compare_backends:
+        for r in compare_risk_backends(X_risk, y_risk).itertuples():
+            print(f"      {r.backend:5s} fit {r.fit_seconds:6.2f}s  holdout accuracy {r.holdout_accuracy:.2%}")
     
-    risk_model = RiskClassificationModel()
-    risk_model.train(X_risk, y_risk)
+    risk_model, warm = load_or_train(
+        RiskClassificationModel, os.path.join(model_dir, 'risk_model.joblib'), X_risk, y_risk, retrain,
+        reuse=reuse_models, backend=risk_backend
+    )
+    if warm:
+        print(f"      Warm-loaded {risk_backend} model trained on data {risk_model.training_hash[:12]}")
     
     feature_df['ml_failure_risk'] = risk_model.predict(X_risk)
-    print(f"      Accuracy: {np.mean(y_risk == [0 if 'Low' in r else 1 if 'Med' in r else 2 for r in feature_df['ml_failure_risk']]):.2%}")
+    print(f"      Accuracy ({risk_backend}): {np.mean(y_risk == [0 if 'Low' in r else 1 if 'Med' in r else 2 for r in feature_df['ml_failure_risk']]):.2%}")
     
     print("\n[5/8] Computing derived business metrics...")
-    feature_df['status'] = feature_df['health_score'].apply(compute_status)
-    feature_df['maintenance_type'] = feature_df['health_score'].apply(compute_maintenance_type)
-    feature_df['action_required'] = feature_df['health_score'].apply(compute_action_required)
-    feature_df['severity'] = feature_df['health_score'].apply(compute_severity)
-    feature_df['priority'] = feature_df['health_score'].apply(compute_priority)
-    
-    feature_df['predicted_failure_days'] = feature_df.apply(
-        lambda r: compute_failure_days(r['health_score'], r['anomaly_detected'], r['stress_factor']),
-        axis=1
-    )
-    
-    feature_df['due_date'] = feature_df.apply(
-        lambda r: compute_due_date(r['timestamp'], r['health_score']),
-        axis=1
-    )
-    
-    feature_df['completed'] = feature_df['health_score'] >= 85
-    feature_df['owner'] = feature_df['completed'].apply(assign_owner)
+    business = derive_business_columns(feature_df)
+    feature_df[business.columns] = business
     
     print("\n[6/8] Computing sensor-specific columns...")
-    feature_df['sensor_value'] = feature_df['latest'].round(1)
-    feature_df['vibration_rms'] = feature_df.apply(
-        lambda r: round(r['rms'], 1) if r['sensor_type'] == 'Vibration' else 0.0,
-        axis=1
-    )
-    feature_df['temperature_celsius'] = feature_df.apply(
-        lambda r: round(r['latest'], 0) if r['sensor_type'] == 'Temperature' else 0.0,
-        axis=1
-    )
-    feature_df['pressure_bar'] = feature_df.apply(
-        lambda r: round(r['latest'], 1) if r['sensor_type'] == 'Pressure' else 0.0,
-        axis=1
-    )
-    feature_df['power_kw'] = feature_df.apply(
-        lambda r: round(r['latest'], 0) if r['sensor_type'] == 'Power' else 0.0,
-        axis=1
-    )
-    feature_df['speed_rpm'] = feature_df.apply(
-        lambda r: int(np.random.randint(800, 1800)) if r['component'] in ['Bearing', 'Motor', 'Gearbox'] else 0,
-        axis=1
-    )
-    feature_df['wear_percentage'] = feature_df.apply(
-        lambda r: round(r['latest'], 0) if r['sensor_type'] in ['Wear', 'Speed'] else 0.0,
-        axis=1
-    )
+    sensor_columns = derive_sensor_columns(feature_df)
+    feature_df[sensor_columns.columns] = sensor_columns
     
     print("\n[7/8] Formatting output to match schema...")
     output_cols = [
@@ -401,14 +1159,28 @@ def main_pipeline():
         'power_kw', 'speed_rpm', 'wear_percentage', 'owner', 'completed'
     ]
     
-    output_df = feature_df[output_cols].copy()
+    typed_df = feature_df[output_cols]
+    output_df = typed_df.copy()
     output_df['timestamp'] = output_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
     output_df['due_date'] = output_df['due_date'].dt.strftime('%Y-%m-%d %H:%M:%S')
     
-    print("\n[8/8] Exporting to CSV...")
+    print("\n[8/8] Exporting to CSV / Parquet...")
     output_file = 'mining_data.csv'
     output_df.to_csv(output_file, index=False)
     print(f"      ✓ Exported to: {output_file}")
+    if write_parquet(typed_df, 'mining_data.parquet'):
+        print("      ✓ Exported to: mining_data.parquet")
+    else:
+        print("      Skipped mining_data.parquet (no Parquet engine available)")
+    if history_dir:
+        if append_history(typed_df, history_dir):
+            print(f"      ✓ Appended run to: {history_dir}/plant_id=*/run_date=*/reading_date=*")
+        else:
+            print("      Skipped history store (pyarrow unavailable)")
+    if wide:
+        wide_file = 'mining_data_wide.csv'
+        pivot_sensor_wide(output_df).to_csv(wide_file, index=False)
+        print(f"      ✓ Exported to: {wide_file}")
     
     print("\n" + "="*80)
     print("PIPELINE SUMMARY")
@@ -440,5 +1212,31 @@ def main_pipeline():
     
     return output_df
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mining predictive maintenance ML pipeline")
+    parser.add_argument("--windows", nargs="+", metavar="DURATION",
+                        help=f"multi-horizon feature windows, e.g. {' '.join(MULTI_WINDOWS)}")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--retrain", action="store_true", help="ignore saved artifacts and fit both models")
+    parser.add_argument("--reuse-models", action="store_true",
+                        help="score with saved artifacts even if they were trained on other data")
+    parser.add_argument("--risk-backend", choices=RISK_BACKENDS, default='gbm')
+    parser.add_argument("--compare-backends", action="store_true",
+                        help="report fit time and holdout accuracy for every risk backend")
+    parser.add_argument("--wide", action="store_true", help="also export mining_data_wide.csv")
+    parser.add_argument("--spectral", action="store_true",
+                        help="add vibration spectral features to the health model inputs")
+    parser.add_argument("--history-dir", default='history',
+                        help="partitioned store each run is appended to")
+    parser.add_argument("--no-history", action="store_true", help="don't append this run to the history store")
+    args = parser.parse_args(argv)
+
+    return main_pipeline(
+        windows=args.windows, model_dir=args.model_dir, retrain=args.retrain,
+        reuse_models=args.reuse_models, risk_backend=args.risk_backend,
+        compare_backends=args.compare_backends, wide=args.wide, spectral=args.spectral,
+        history_dir=None if args.no_history else args.history_dir
+    )
+
 if __name__ == "__main__":
-    df_final = main_pipeline()
\ No newline at end of file
+    df_final = main()
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Idle-time warm-up of the dashboards' caches for the views a user opens next
+After a session renders its active tab it submits jobs that compute the other
+tabs' rollups and figures through the same cached functions, so switching tabs
+is served from warm caches. One daemon worker per process runs the jobs and is
+bounded so it never competes with foreground renders:
+
+  - it starts a job only while no script run is inside foreground(), and only
+    idle_delay seconds after the last one finished
+  - a job may be a generator: each yield ends a step, and before the next step
+    the worker waits for idle again, so a render arriving mid-job pauses it
+  - at most max_pending jobs wait; beyond that the oldest are dropped
+  - a job submitted under the key of a waiting job replaces it, so reruns with
+    new inputs do not pile up stale work; a paused job whose key was submitted
+    again is abandoned
+
+    with PREFETCH.foreground():
+        main()                      # submits ('alerts', plant, ...) jobs when done
+
+Fragment reruns skip main(), so fragments are marked foreground on their own:
+
+    @st.fragment
+    @PREFETCH.in_foreground
+    def render_paged_table(...): ...
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+
+class Prefetcher:
+    """
+    Single background worker running zero-argument warm-up jobs when idle
+    Jobs only fill caches, so a failed job is counted and otherwise ignored:
+    the foreground render computes the value itself.
+    """
+
+    def __init__(self, max_pending=16, idle_delay=0.25, name="dashboard-prefetch"):
+        self.max_pending = max_pending
+        self.idle_delay = idle_delay
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.superseded = 0
+        self._pending = OrderedDict()
+        self._active = 0
+        self._idle_since = time.monotonic()
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    @contextmanager
+    def foreground(self):
+        """Mark a script run in progress; the worker holds off until none are"""
+        with self._cond:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._idle_since = time.monotonic()
+                self._cond.notify_all()
+
+    def in_foreground(self, func):
+        """Decorator: run every call of func inside foreground()"""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.foreground():
+                return func(*args, **kwargs)
+        return wrapper
+
+    def submit(self, key, job):
+        """
+        Queue job() under `key`, replacing a waiting job with the same key
+        job() may return an iterator; the worker re-checks for idle between its items.
+        """
+        with self._cond:
+            self._pending.pop(key, None)
+            self._pending[key] = job
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._cond.notify_all()
+
+    def _idle_remaining(self):
+        """Seconds until the worker may run (0 when idle), None while a foreground run is active"""
+        if self._active:
+            return None
+        return max(0.0, self._idle_since + self.idle_delay - time.monotonic())
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                remaining = self._idle_remaining() if self._pending else None
+                if remaining == 0:
+                    return self._pending.popitem(last=False)
+                self._cond.wait(remaining)
+
+    def _resume(self, key):
+        """Wait for idle before a job's next step; False if a newer job took over its key"""
+        with self._cond:
+            while True:
+                if key in self._pending:
+                    return False
+                remaining = self._idle_remaining()
+                if remaining == 0:
+                    return True
+                self._cond.wait(remaining)
+
+    def _run(self):
+        while True:
+            key, job = self._next_job()
+            try:
+                steps = job()
+                try:
+                    for _ in steps or ():
+                        if not self._resume(key):
+                            self.superseded += 1
+                            break
+                    else:
+                        self.completed += 1
+                finally:
+                    # An abandoned generator job runs its cleanup now, on this thread
+                    if hasattr(steps, 'close'):
+                        steps.close()
+            except Exception:
+                self.failed += 1
+
+    def stats(self):
+        with self._cond:
+            return {
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'foreground_runs': self._active,
+                'completed': self.completed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'superseded': self.superseded
+            }
+
+
+PREFETCH = Prefetcher()
@@ -0,0 +1,117 @@
+"""
+Health rollups at every level of the plant hierarchy for the dashboards
+RollupCube aggregates pipeline output once per data version: a single groupby
+collapses readings to one row per (plant, sub-plant, equipment, component, day)
+holding health sum/min/count and per-band status counts, and every hierarchy
+level is rolled up from that daily base. Views read a summary or a child
+breakdown with one dict lookup instead of filtering and averaging raw rows.
+
+    cube = RollupCube(df)
+    cube.summary('Plant-1', 'Grinding Plant')   # {'mean': ..., 'min': ..., 'count': ..., 'healthy': ...}
+    cube.children('Plant-1')                    # sub-plants, in order of first appearance
+    cube.window(from_date, to_date)             # same cube over a day range, re-aggregated from the base
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pmanalysis.datastore import HIERARCHY_LEVELS
+    from pmanalysis.rules import health_band
+except ImportError:  # run as a script from inside pmanalysis/
+    from datastore import HIERARCHY_LEVELS
+    from rules import health_band
+
+# Sensors carry one reading each, so rollups stop at the component level
+ROLLUP_LEVELS = HIERARCHY_LEVELS[:4]
+
+# Status counts, indexed by health band: 0 = critical, 1 = warning, 2 = healthy
+STATUS_COUNT_COLUMNS = ['critical', 'warning', 'healthy']
+
+SUMMARY_COLUMNS = ['mean', 'min', 'count'] + STATUS_COUNT_COLUMNS
+
+_SUMS = ['health_sum', 'count'] + STATUS_COUNT_COLUMNS
+
+
+class RollupCube:
+    """
+    Health mean/min/count and status counts for every hierarchy path
+    df: pipeline output with the ROLLUP_LEVELS columns, health_score and timestamp
+    """
+
+    def __init__(self, df, levels=ROLLUP_LEVELS, time_column='timestamp'):
+        bands = health_band(df['health_score'].to_numpy())
+        readings = df[list(levels)].copy()
+        readings['day'] = df[time_column].dt.normalize()
+        readings['health_sum'] = df['health_score'].astype(np.float64)
+        readings['health_min'] = readings['health_sum']
+        readings['count'] = 1
+        for band, column in enumerate(STATUS_COUNT_COLUMNS):
+            readings[column] = (bands == band).astype(np.int64)
+
+        base = readings.groupby(list(levels) + ['day'], observed=True, sort=False).agg(
+            {'health_min': 'min', **{column: 'sum' for column in _SUMS}}
+        ).reset_index()
+        self._build(base, list(levels))
+
+    @classmethod
+    def _from_base(cls, base, levels):
+        cube = cls.__new__(cls)
+        cube._build(base, levels)
+        return cube
+
+    def _build(self, base, levels):
+        self.base = base
+        self.levels = levels
+        self.summaries = {}
+        self._children = {}
+
+        aggregations = {'health_min': 'min', **{column: 'sum' for column in _SUMS}}
+        for depth in range(len(levels) + 1):
+            keys = levels[:depth]
+            if keys:
+                table = base.groupby(keys, observed=True, sort=False).agg(aggregations)
+            else:
+                table = base.agg(aggregations).to_frame().T
+            for path, row in zip(table.index, table.itertuples(index=False)):
+                path = tuple(str(key) for key in path) if depth > 1 else ((str(path),) if depth else ())
+                if not row.count:
+                    continue
+                self.summaries[path] = {
+                    'mean': row.health_sum / row.count,
+                    'min': row.health_min,
+                    'count': int(row.count),
+                    **{column: int(getattr(row, column)) for column in STATUS_COUNT_COLUMNS}
+                }
+                if depth:
+                    self._children.setdefault(path[:-1], []).append(path[-1])
+
+    def window(self, from_date=None, to_date=None):
+        """Cube over readings with from_date <= timestamp date <= to_date (inclusive)"""
+        mask = np.ones(len(self.base), dtype=bool)
+        if from_date is not None:
+            mask &= (self.base['day'] >= pd.Timestamp(from_date)).to_numpy()
+        if to_date is not None:
+            mask &= (self.base['day'] <= pd.Timestamp(to_date)).to_numpy()
+        return self._from_base(self.base[mask], self.levels)
+
+    @staticmethod
+    def _key(path):
+        return tuple(str(key) for key in path)
+
+    def summary(self, *path):
+        """Rollup for `path` (0..len(levels) keys), or None when it has no readings"""
+        return self.summaries.get(self._key(path))
+
+    def children(self, *path):
+        """Keys one level below `path`, in order of first appearance"""
+        return list(self._children.get(self._key(path), []))
+
+    def breakdown(self, *path):
+        """One row per child of `path`: the child key column plus its rollup"""
+        level = self.levels[len(path)]
+        children = self.children(*path)
+        rows = [self.summaries[self._key(path) + (child,)] for child in children]
+        frame = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+        frame.insert(0, level, children)
+        return frame
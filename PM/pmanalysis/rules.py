@@ -0,0 +1,110 @@
+"""
+Health-score business rules shared by the ML pipeline and the dashboards
+Band thresholds are declared once here; main_pipeline derives every business
+column from them in one vectorized pass, and the dashboards' status() /
+maintenance() / action() / ml_risk_prediction() read the same tables.
+"""
+
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# BAND THRESHOLDS
+# =====================================================
+# Health bands: >= HEALTHY_MIN healthy, >= WARNING_MIN warning, else critical
+HEALTHY_MIN = 85
+WARNING_MIN = 70
+HEALTH_EDGES = np.array([WARNING_MIN, HEALTHY_MIN])
+# health_band() results
+CRITICAL_BAND, WARNING_BAND, HEALTHY_BAND = 0, 1, 2
+
+# Failure-risk bands: < HIGH_RISK_BELOW high, < MEDIUM_RISK_BELOW medium, else low
+HIGH_RISK_BELOW = 65
+MEDIUM_RISK_BELOW = 80
+RISK_EDGES = np.array([HIGH_RISK_BELOW, MEDIUM_RISK_BELOW])
+
+# =====================================================
+# PER-BAND OUTCOMES
+# =====================================================
+# Indexed by health band: 0 = critical, 1 = warning, 2 = healthy
+HEALTH_BAND_LABELS = {
+    'status': ["Critical", "Warning", "Healthy"],
+    'maintenance_type': ["Predictive", "Preventive", "Proactive"],
+    'action_required': ["Immediate inspection & shutdown planning", "Plan inspection", "Continue monitoring"],
+    'severity': ["Critical", "Warning", "Normal"],
+    'priority': ["High", "Medium", "Low"],
+}
+STATUS_ICONS = ["🔴", "🟠", "🟢"]
+STATUS_COLORS = ["#ef4444", "#f59e0b", "#22c55e"]
+DUE_DAYS = np.array([1, 7, 14])
+
+# Indexed by risk code: 0 = low, 1 = medium, 2 = high (the risk model's class codes)
+RISK_LABELS = ["Low Failure Risk", "Medium Failure Risk", "High Failure Risk"]
+RISK_ICONS = ["🟢", "🟠", "🔴"]
+
+# Days to failure = (health - offset) / (FAILURE_BASE_RATE * rate * stress), per risk code
+FAILURE_BASE_RATE = 0.018
+FAILURE_OFFSET = np.array([70, 50, 40])
+FAILURE_RATE = np.array([3, 6, 12])
+ANOMALY_FAILURE_FACTOR = 0.55
+
+OWNERS = ["Operations Team", "Maintenance Team"]
+OWNER_WEIGHTS = [0.65, 0.35]
+UNASSIGNED = "Unassigned"
+
+# =====================================================
+# BAND LOOKUP
+# =====================================================
+def health_band(scores):
+    """Health band index per score (NaN falls in the critical band); scalar in, int out"""
+    scores = np.asarray(scores, dtype=np.float64)
+    bands = (scores[..., None] >= HEALTH_EDGES).sum(axis=-1)
+    return int(bands) if bands.ndim == 0 else bands
+
+def risk_code(scores):
+    """Failure-risk code per score (NaN counts as low risk); scalar in, int out"""
+    scores = np.asarray(scores, dtype=np.float64)
+    codes = (scores[..., None] < RISK_EDGES).sum(axis=-1)
+    return int(codes) if codes.ndim == 0 else codes
+
+def _categorical(codes, labels):
+    return pd.Categorical.from_codes(codes, categories=labels)
+
+# =====================================================
+# VECTORIZED RULE ENGINE
+# =====================================================
+def failure_days(health_score, anomaly, stress_factor):
+    """Predicted days to failure, at least 1"""
+    health_score = np.asarray(health_score, dtype=np.float64)
+    codes = risk_code(health_score)
+    days = (health_score - FAILURE_OFFSET[codes]) / (FAILURE_BASE_RATE * FAILURE_RATE[codes] * np.asarray(stress_factor))
+    days = np.where(np.asarray(anomaly, dtype=bool), days * ANOMALY_FAILURE_FACTOR, days)
+    return np.maximum(np.trunc(days), 1).astype(int)
+
+def assign_owners(completed):
+    """Random owner for completed rows (drawn in row order), UNASSIGNED elsewhere"""
+    completed = np.asarray(completed, dtype=bool)
+    owners = np.full(len(completed), UNASSIGNED, dtype=object)
+    owners[completed] = np.random.choice(OWNERS, size=int(completed.sum()), p=OWNER_WEIGHTS)
+    return pd.Categorical(owners, categories=OWNERS + [UNASSIGNED])
+
+def derive_business_columns(df):
+    """
+    Every health-derived business column in one pass
+    df: needs health_score, anomaly_detected, stress_factor and timestamp
+    Returns: DataFrame on df.index with categorical status, maintenance_type,
+    action_required, severity, priority and owner, plus predicted_failure_days,
+    due_date and completed
+    """
+    health = df['health_score'].to_numpy(dtype=np.float64)
+    bands = health_band(health)
+
+    out = pd.DataFrame(
+        {column: _categorical(bands, labels) for column, labels in HEALTH_BAND_LABELS.items()},
+        index=df.index
+    )
+    out['predicted_failure_days'] = failure_days(health, df['anomaly_detected'], df['stress_factor'])
+    out['due_date'] = df['timestamp'] + pd.to_timedelta(DUE_DAYS[bands], unit='D')
+    out['completed'] = bands == HEALTHY_BAND
+    out['owner'] = assign_owners(out['completed'].to_numpy())
+    return out
@@ -0,0 +1,336 @@
+"""
+Local scoring service for the persisted health and risk models
+Loads both artifacts once, takes feature rows over HTTP (TCP or a Unix socket)
+and micro-batches concurrent requests into single predict() calls.
+
+Usage (from the PM/ directory, after main_pipeline has written models/):
+    python -m pmanalysis.service --model-dir models --port 8765
+    python -m pmanalysis.service --unix-socket /tmp/pm-scoring.sock
+
+Endpoints:
+    POST /score   {"rows": [{"mean": ..., "std": ..., ...}, ...]}
+                  -> {"health_score": [...], "ml_failure_risk": [...]}
+    GET  /stats   queue depth, batch sizes and p50/p99 latency in ms
+    GET  /health  liveness probe
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pmanalysis.model import (
+        MODEL_DIR, HEALTH_FEATURE_COLS, RISK_FEATURE_COLS,
+        HealthScoreModel, RiskClassificationModel, risk_inputs
+    )
+except ImportError:  # run as a script from inside pmanalysis/
+    from model import (
+        MODEL_DIR, HEALTH_FEATURE_COLS, RISK_FEATURE_COLS,
+        HealthScoreModel, RiskClassificationModel, risk_inputs
+    )
+
+
+# Largest POST body read into memory; ~16k feature rows of JSON
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+class ServiceOverloaded(RuntimeError):
+    """Raised when the request queue is at its bounded depth"""
+
+
+class LatencyTracker:
+    """Rolling window of request latencies (ms) with percentile summaries"""
+
+    def __init__(self, size=10000):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms):
+        with self._lock:
+            self._samples.append(latency_ms)
+
+    def summary(self):
+        with self._lock:
+            samples = np.fromiter(self._samples, dtype=np.float64)
+        if not len(samples):
+            return {'count': 0, 'p50_ms': None, 'p99_ms': None}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {'count': len(samples), 'p50_ms': round(p50, 3), 'p99_ms': round(p99, 3)}
+
+
+class _Job:
+    __slots__ = ('frame', 'future', 'enqueued_at')
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring requests into one health + one risk predict() call
+    max_batch_rows: flush once this many rows are waiting
+    max_wait_ms: longest the first request of a batch waits for company
+    max_queue: bounded request queue depth; submit() raises ServiceOverloaded beyond it
+    """
+
+    def __init__(self, health_model, risk_model, max_batch_rows=4096, max_wait_ms=2.0, max_queue=1024):
+        self.health_model = health_model
+        self.risk_model = risk_model
+        self.health_cols = health_model.feature_columns or HEALTH_FEATURE_COLS
+        self.input_cols = list(dict.fromkeys(
+            self.health_cols + [c for c in RISK_FEATURE_COLS if c != 'health_score']
+        ))
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self.latency = LatencyTracker()
+        self.batches = 0
+        self.rows_scored = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="scoring-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, frame):
+        """
+        Queue a feature frame for scoring; returns a Future of (health_score, ml_failure_risk)
+        Input columns are coerced to numbers here, so a malformed request raises
+        ValueError to its caller instead of failing the batch it would join.
+        """
+        missing = [c for c in self.input_cols if c not in frame.columns]
+        if missing:
+            raise ValueError(f"missing feature columns: {missing}")
+        job = _Job(self._coerce(frame))
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            raise ServiceOverloaded(f"queue depth {self._queue.maxsize} reached") from None
+        return job.future
+
+    def _coerce(self, frame):
+        columns = {}
+        for column in self.input_cols:
+            try:
+                columns[column] = pd.to_numeric(frame[column], errors='raise')
+            except (ValueError, TypeError) as exc:
+                raise ValueError(f"feature column {column!r} is not numeric: {exc}") from None
+            # Health inputs are zero-filled; the risk model takes its columns as given
+            if column in RISK_FEATURE_COLS and columns[column].isna().any():
+                raise ValueError(f"feature column {column!r} has missing values")
+        return pd.DataFrame(columns, index=frame.index)
+
+    def score(self, frame, timeout=None):
+        return self.submit(frame).result(timeout)
+
+    def _collect(self):
+        """Block for one job, then gather more until the batch is full or max_wait expires"""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch, rows = [first], len(first.frame)
+        deadline = first.enqueued_at + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                self._stopped.set()
+                break
+            batch.append(job)
+            rows += len(job.frame)
+        return batch
+
+    def _predict(self, frame):
+        health = self.health_model.predict(frame[self.health_cols].fillna(0))
+        frame['health_score'] = health
+        return health, self.risk_model.predict(risk_inputs(frame))
+
+    def _finish(self, job, result=None, exc=None):
+        if exc is None:
+            job.future.set_result(result)
+        else:
+            job.future.set_exception(exc)
+        self.latency.record((time.perf_counter() - job.enqueued_at) * 1000.0)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if batch is None:
+                break
+            try:
+                frame = pd.concat([job.frame for job in batch], ignore_index=True)
+                health, risk = self._predict(frame)
+            except Exception:
+                # Re-score one by one so a request that slipped past submit()
+                # fails alone rather than taking its batch down with it
+                for job in batch:
+                    try:
+                        health, risk = self._predict(job.frame.reset_index(drop=True))
+                    except Exception as exc:
+                        self._finish(job, exc=exc)
+                    else:
+                        self._finish(job, (health.tolist(), list(risk)))
+                continue
+
+            self.batches += 1
+            self.rows_scored += len(frame)
+            offset = 0
+            for job in batch:
+                end = offset + len(job.frame)
+                self._finish(job, (health[offset:end].tolist(), list(risk[offset:end])))
+                offset = end
+
+    def stats(self):
+        return {
+            'queue_depth': self._queue.qsize(),
+            'max_queue': self._queue.maxsize,
+            'batches': self.batches,
+            'rows_scored': self.rows_scored,
+            'mean_batch_rows': round(self.rows_scored / self.batches, 2) if self.batches else 0,
+            'latency': self.latency.summary()
+        }
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join(timeout=5)
+
+
+def load_batcher(model_dir=MODEL_DIR, **kwargs):
+    """Load both persisted models once and wrap them in a MicroBatcher"""
+    health_model = HealthScoreModel.load(os.path.join(model_dir, 'health_model.joblib'))
+    # Batches are small and arrive one at a time; fanning 150 trees out to a
+    # thread pool on every call costs more than it saves
+    health_model.model.set_params(n_jobs=1)
+    risk_model = RiskClassificationModel.load(os.path.join(model_dir, 'risk_model.joblib'))
+    return MicroBatcher(health_model, risk_model, **kwargs)
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    request_timeout = 10.0
+
+    def setup(self):
+        # Headers and body go out as two writes; with Nagle on, the body waits
+        # for the client's delayed ACK (~40 ms) on every keep-alive request
+        self.disable_nagle_algorithm = self.request.family != socket.AF_UNIX
+        super().setup()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {'status': 'ok'})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.batcher.stats())
+        else:
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError(f"invalid Content-Length {length}")
+            if length > self.server.max_request_bytes:
+                # The body is left unread, so the connection can't be reused
+                self.close_connection = True
+                self._send_json(413, {'error': f"request body over {self.server.max_request_bytes} bytes"})
+                return
+            rows = json.loads(self.rfile.read(length))['rows']
+            frame = pd.DataFrame.from_records(rows)
+            future = self.server.batcher.submit(frame)
+        except ServiceOverloaded as exc:
+            self._send_json(503, {'error': str(exc)})
+            return
+        except (ValueError, KeyError, TypeError) as exc:
+            self._send_json(400, {'error': str(exc)})
+            return
+
+        try:
+            health, risk = future.result(self.request_timeout)
+        except Exception as exc:
+            self._send_json(500, {'error': str(exc)})
+            return
+        self._send_json(200, {'health_score': health, 'ml_failure_risk': risk})
+
+    def address_string(self):
+        # Unix-socket peers have no (host, port) pair
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def make_server(batcher, host="127.0.0.1", port=8765, unix_socket=None, max_request_bytes=MAX_REQUEST_BYTES):
+    if unix_socket:
+        server = ThreadingUnixHTTPServer(unix_socket, ScoringRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ScoringRequestHandler)
+        server.daemon_threads = True
+    server.batcher = batcher
+    server.max_request_bytes = max_request_bytes
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-batching scoring service for the PM models")
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch-rows", type=int, default=4096)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-queue", type=int, default=1024)
+    parser.add_argument("--max-request-bytes", type=int, default=MAX_REQUEST_BYTES,
+                        help="reject larger POST bodies with 413")
+    args = parser.parse_args(argv)
+
+    batcher = load_batcher(
+        args.model_dir, max_batch_rows=args.max_batch_rows,
+        max_wait_ms=args.max_wait_ms, max_queue=args.max_queue
+    )
+    server = make_server(batcher, args.host, args.port, args.unix_socket, args.max_request_bytes)
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"Scoring service listening on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Server-side filtering, sorting and paging for the dashboards' large tables
+select_rows() works on row positions: filters and the sort run over single
+columns of the cached plant window, and take_page() then materializes only
+the visible page, restricted to the displayed columns. st.dataframe receives
+page_size rows instead of every reading in the window.
+
+    rows = select_rows(df, where=df['health_score'] < 75, filters={'sub_plant': ['Grinding Plant']},
+                       sort_by='health_score')
+    page = take_page(df, rows, ['sub_plant', 'component', 'health_score'], page=2, page_size=50)
+"""
+
+import numpy as np
+
+PAGE_SIZES = [25, 50, 100, 250]
+DEFAULT_PAGE_SIZE = 50
+
+
+def select_rows(df, where=None, filters=None, sort_by=None, ascending=True):
+    """
+    Positions of the rows of df to show, in display order
+    where: optional boolean mask over df's rows
+    filters: {column: allowed values}; an empty selection does not restrict
+    sort_by: column to sort on (stable, so ties keep their window order)
+    """
+    mask = np.ones(len(df), dtype=bool) if where is None else np.asarray(where, dtype=bool).copy()
+    for column, values in (filters or {}).items():
+        if len(values):
+            mask &= df[column].isin(values).to_numpy()
+    rows = np.flatnonzero(mask)
+
+    if sort_by is not None and len(rows):
+        keys = df[sort_by].iloc[rows].reset_index(drop=True)
+        rows = rows[keys.sort_values(ascending=ascending, kind='stable').index.to_numpy()]
+    return rows
+
+
+def page_count(total_rows, page_size=DEFAULT_PAGE_SIZE):
+    """Number of pages for total_rows (at least 1, so an empty table still has a page)"""
+    return max(1, -(-total_rows // page_size))
+
+
+def take_page(df, rows, columns, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Page `page` (1-based, clamped to the last page) of `rows`, only `columns`
+    Returns a new frame with a fresh index that is safe to format in place.
+    """
+    page = min(max(int(page), 1), page_count(len(rows), page_size))
+    start = (page - 1) * page_size
+    positions = [df.columns.get_loc(column) for column in columns]
+    return df.iloc[rows[start:start + page_size], positions].reset_index(drop=True)
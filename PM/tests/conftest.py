@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Tests import pmanalysis the way the dashboards do, from the PM/ directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def readings():
+    """Pipeline-shaped output spanning several days, in no particular order"""
+    rng = np.random.default_rng(42)
+    n = 3000
+    hierarchy = {
+        "Grinding": {"Ball Mill": ["Motor", "Bearing", "Liner"], "SAG Mill": ["Motor", "Gearbox"]},
+        "Crushing": {"Jaw Crusher": ["Liner", "Motor"], "Cone Crusher": ["Bearing"]},
+    }
+    paths = [(sp, eq, comp) for sp, equipment in hierarchy.items() for eq, comps in equipment.items() for comp in comps]
+    picks = rng.integers(0, len(paths), size=n)
+    # Whole-minute offsets over five days, with some readings exactly on midnight
+    minutes = rng.integers(0, 5 * 24 * 60, size=n)
+    minutes[:40] = rng.integers(0, 6, size=40) * 24 * 60
+    return pd.DataFrame({
+        'plant_id': pd.Categorical(rng.choice(["Plant-1", "Plant-2", "Plant-3"], size=n)),
+        'sub_plant': pd.Categorical([paths[i][0] for i in picks]),
+        'equipment': pd.Categorical([paths[i][1] for i in picks]),
+        'component': pd.Categorical([paths[i][2] for i in picks]),
+        'sensor_type': pd.Categorical(rng.choice(["Vibration", "Temperature", "Power"], size=n)),
+        'timestamp': pd.Timestamp('2024-02-08') + pd.to_timedelta(minutes, unit='min'),
+        'health_score': rng.integers(40, 96, size=n),
+        'status': pd.Categorical(rng.choice(["Healthy", "Warning", "Critical"], size=n)),
+    })
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from pmanalysis.datastore import CATEGORY_COLUMNS, load_mining_data, typed_frame, write_parquet
+
+
+def output_frame():
+    return pd.DataFrame({
+        'plant_id': ["Plant-1", "Plant-2", "Plant-1"],
+        'sub_plant': ["Grinding", "Crushing", "Grinding"],
+        'equipment': ["Ball Mill", "Jaw Crusher", "Ball Mill"],
+        'component': ["Motor", "Liner", "Bearing"],
+        'sensor_type': ["Power", "Wear", "Vibration"],
+        'timestamp': ["2026-10-01 06:00:00", "2026-10-01 06:05:00", "2026-10-02 06:00:00"],
+        'due_date': ["2026-10-08 06:00:00", "2026-10-02 06:05:00", "2026-10-16 06:00:00"],
+        'health_score': [80, 62, 90],
+        'status': pd.Categorical(["Warning", "Critical", "Healthy"]),
+        'owner': pd.Categorical(["Unassigned", "Unassigned", "Operations Team"]),
+        'completed': [False, False, True],
+    })
+
+
+def test_typed_frame_dtypes():
+    typed = typed_frame(output_frame())
+    assert typed['timestamp'].dtype == 'datetime64[ns]'
+    assert typed['due_date'].dtype == 'datetime64[ns]'
+    for column in CATEGORY_COLUMNS:
+        assert isinstance(typed[column].dtype, pd.CategoricalDtype)
+    # categoricals outside CATEGORY_COLUMNS are written as plain strings
+    assert typed['owner'].dtype == object
+
+
+def test_csv_and_parquet_load_the_same_frame(tmp_path):
+    pytest.importorskip("pyarrow", exc_type=ImportError)
+    df = output_frame()
+    df.to_csv(tmp_path / "mining_data.csv", index=False)
+    from_csv = load_mining_data(str(tmp_path))
+
+    assert write_parquet(df, str(tmp_path / "mining_data.parquet"))
+    from_parquet = load_mining_data(str(tmp_path))
+
+    assert dict(from_parquet.dtypes) == dict(from_csv.dtypes)
+    pd.testing.assert_frame_equal(from_parquet, from_csv, check_categorical=False)
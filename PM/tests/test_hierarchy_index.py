@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from pmanalysis.datastore import HIERARCHY_LEVELS, HierarchyIndex, TimeRangeIndex
+
+
+def pandas_rows(df, path):
+    mask = pd.Series(True, index=df.index)
+    for level, key in zip(HIERARCHY_LEVELS, path):
+        mask &= df[level].astype(str) == key
+    return df[mask]
+
+
+def all_paths(df):
+    paths = {()}
+    for depth in range(1, len(HIERARCHY_LEVELS) + 1):
+        for key in df[HIERARCHY_LEVELS[:depth]].astype(str).drop_duplicates().itertuples(index=False):
+            paths.add(tuple(key))
+    return paths
+
+
+@pytest.fixture(scope="module")
+def index(readings):
+    return HierarchyIndex(readings)
+
+
+def test_rows_match_boolean_masks(readings, index):
+    for path in all_paths(readings):
+        pd.testing.assert_frame_equal(index.rows(*path), pandas_rows(readings, path))
+
+
+def test_children_match_unique_keys(readings, index):
+    for path in all_paths(readings):
+        if len(path) == len(HIERARCHY_LEVELS):
+            assert index.children(*path) == []
+            continue
+        level = HIERARCHY_LEVELS[len(path)]
+        assert index.children(*path) == sorted(pandas_rows(readings, path)[level].astype(str).unique())
+
+
+def test_last_is_the_latest_reading(readings, index):
+    for path in all_paths(readings):
+        rows = pandas_rows(readings, path)
+        latest = rows[rows['timestamp'] == rows['timestamp'].max()]
+        assert index.last(*path) == latest['health_score'].iloc[-1]
+        assert index.last(*path, column='timestamp') == rows['timestamp'].max()
+
+
+def test_last_over_a_time_window(readings):
+    # Window rows come out in time order, so the latest reading is the last row
+    window = TimeRangeIndex(readings).window("Plant-2", "2024-02-09", "2024-02-11")
+    index = HierarchyIndex(window)
+    for path in all_paths(window):
+        rows = pandas_rows(window, path)
+        assert index.last(*path) == rows['health_score'].iloc[-1]
+
+
+def test_unknown_path_and_empty_frame(readings, index):
+    assert index.last("Plant-1", "Nowhere", default=85) == 85
+    assert index.rows("Plant-9").empty
+    assert index.children("Plant-9") == []
+    empty = HierarchyIndex(readings.iloc[:0])
+    assert len(empty) == 0 and empty.last("Plant-1") is None
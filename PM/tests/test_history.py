@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow", exc_type=ImportError)
+
+from pmanalysis.datastore import append_history, history_version, read_history
+
+
+def run_frame(seed, days=4):
+    rng = np.random.default_rng(seed)
+    n = 24 * days
+    return pd.DataFrame({
+        'plant_id': rng.choice(["Plant-1", "Plant-2"], size=n),
+        'sub_plant': rng.choice(["Grinding", "Crushing"], size=n),
+        'equipment': "Ball Mill",
+        'component': "Motor",
+        'sensor_type': "Power",
+        'timestamp': pd.Timestamp('2024-02-08') + pd.to_timedelta(np.arange(n), unit='h'),
+        'due_date': pd.Timestamp('2024-02-20'),
+        'health_score': rng.integers(40, 96, size=n),
+        'status': "Healthy",
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    runs = {
+        pd.Timestamp('2026-10-17 06:00'): run_frame(0),
+        pd.Timestamp('2026-10-18 06:00'): run_frame(1),
+        pd.Timestamp('2026-10-18 18:30'): run_frame(2),
+    }
+    for run_at, frame in runs.items():
+        assert append_history(frame, str(tmp_path), run_at=run_at)
+    expected = pd.concat([frame.assign(run_at=run_at) for run_at, frame in runs.items()], ignore_index=True)
+    return str(tmp_path), expected
+
+
+def _sorted(frame):
+    return frame.sort_values(['run_at', 'timestamp']).reset_index(drop=True)
+
+
+def test_reading_range_matches_pandas_filter(store):
+    history_dir, expected = store
+    columns = ['run_at', 'timestamp', 'sub_plant', 'health_score']
+    got = read_history(history_dir, plant_id="Plant-2", readings_from="2024-02-09", readings_to="2024-02-10",
+                       columns=columns)
+
+    days = expected['timestamp'].dt.normalize()
+    mask = (expected['plant_id'] == "Plant-2") & (days >= "2024-02-09") & (days <= "2024-02-10")
+    want = expected.loc[mask, columns]
+    assert len(got) == len(want) > 0
+    assert _sorted(got)['health_score'].tolist() == _sorted(want)['health_score'].tolist()
+    assert (got['run_at'].dt.floor('s').isin(expected['run_at'])).all()
+
+
+def test_run_date_range(store):
+    history_dir, expected = store
+    got = read_history(history_dir, from_date="2026-10-18", to_date="2026-10-18", columns=['run_at'])
+    assert sorted(got['run_at'].unique()) == [pd.Timestamp('2026-10-18 06:00'), pd.Timestamp('2026-10-18 18:30')]
+    assert len(got) == (expected['run_at'].dt.date == pd.Timestamp('2026-10-18').date()).sum()
+
+
+def test_reading_range_prunes_files(store):
+    import pyarrow.dataset as ds
+    from pmanalysis.datastore import _history_partitioning
+
+    history_dir, _ = store
+    dataset = ds.dataset(history_dir, format='parquet', partitioning=_history_partitioning())
+    one_day = (ds.field('plant_id') == "Plant-1") & (ds.field('reading_date') == pd.Timestamp('2024-02-09').date())
+    fragments = list(dataset.get_fragments(filter=one_day))
+    # one file per run for that plant and reading day
+    assert len(fragments) == 3
+    assert all('plant_id=Plant-1' in f.path and 'reading_date=2024-02-09' in f.path for f in fragments)
+
+
+def test_missing_store_reads_empty(tmp_path):
+    got = read_history(str(tmp_path / "absent"), plant_id="Plant-1", columns=['run_at', 'health_score'])
+    assert got.empty and list(got.columns) == ['run_at', 'health_score']
+
+
+def test_history_version_changes_with_each_run(tmp_path):
+    history_dir = str(tmp_path)
+    assert history_version(history_dir) is None
+    append_history(run_frame(0), history_dir, run_at=pd.Timestamp('2026-10-18 06:00'))
+    first = history_version(history_dir)
+    assert first is not None and history_version(history_dir) == first
+
+    append_history(run_frame(1), history_dir, run_at=pd.Timestamp('2026-10-18 06:00:01.5'))
+    assert history_version(history_dir) != first
+    # the marker isn't picked up as a data file
+    assert len(read_history(history_dir, columns=['run_at'])['run_at'].unique()) == 2
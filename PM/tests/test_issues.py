@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pmanalysis.issues import CRITICAL_SEVERITY, IssueStore
+
+
+@pytest.fixture
+def pipeline_rows(readings):
+    rng = np.random.default_rng(3)
+    return readings.assign(
+        severity=pd.Categorical(rng.choice(["Critical", "Warning", "Normal", "Unknown"], size=len(readings))),
+        maintenance_type=rng.choice(["Predictive", "Preventive", "Proactive"], size=len(readings)),
+        action_required=rng.choice(["Plan inspection", "Continue monitoring"], size=len(readings)),
+        completed=rng.random(len(readings)) < 0.4,
+        owner="Unassigned",
+    )
+
+
+def reference_issues(df):
+    """The original iterrows() build of the operations-panel issue list"""
+    severity_map = {'Critical': '🔴 Critical', 'Warning': '🟠 Attention', 'Normal': '🟢 Normal'}
+    return [{
+        "Sub-Plant": row['sub_plant'],
+        "Equipment": row['equipment'],
+        "Component": row['component'],
+        "Health": int(row['health_score']),
+        "Severity": severity_map.get(row['severity'], '🟠 Attention'),
+        "Action Type": row['maintenance_type'],
+        "Due": row['action_required'],
+        "Done": bool(row['completed']),
+        "Owner": row['owner'],
+    } for _, row in df[df['completed'] == False].iterrows()]
+
+
+def test_issues_match_row_by_row_build(pipeline_rows):
+    store = IssueStore(pipeline_rows)
+    expected = reference_issues(pipeline_rows)
+    assert len(store) == store.open_count == len(expected)
+    assert [issue for _, issue in store.open_records()] == expected
+    assert store.critical_count == sum(issue["Severity"] == CRITICAL_SEVERITY for issue in expected)
+
+
+def test_mark_done_updates_open_and_critical_ids(pipeline_rows):
+    store = IssueStore(pipeline_rows)
+    critical_id = int(store.critical_ids[0])
+    other_id = int(np.setdiff1d(store.open_ids, store.critical_ids)[0])
+    open_count, critical_count = store.open_count, store.critical_count
+
+    store.mark_done(critical_id)
+    store.mark_done(other_id)
+    store.mark_done(other_id)
+
+    assert store.open_count == open_count - 2
+    assert store.critical_count == critical_count - 1
+    assert critical_id not in store.open_ids and other_id not in store.open_ids
+    assert store.table.at[critical_id, "Done"] and store.table.at[other_id, "Done"]
+    open_frame = store.open_frame(["Health", "Done"])
+    assert list(open_frame.columns) == ["Health", "Done"]
+    assert not open_frame["Done"].any()
+    assert (np.diff(store.open_ids) > 0).all()
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from pmanalysis.prefetch import Prefetcher
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_jobs_wait_for_foreground_runs_to_finish():
+    prefetch = Prefetcher(idle_delay=0.01, name="test-prefetch")
+    ran = threading.Event()
+    with prefetch.foreground():
+        prefetch.submit('a', ran.set)
+        assert not ran.wait(0.1)
+    assert ran.wait(5)
+    wait_for(lambda: prefetch.stats()['completed'] == 1)
+
+
+def test_generator_job_pauses_between_steps():
+    prefetch = Prefetcher(idle_delay=0.01, name="test-prefetch")
+    steps, release = [], threading.Event()
+    foreground = prefetch.foreground()
+
+    def job():
+        steps.append(1)
+        foreground.__enter__()
+        release.set()
+        yield
+        steps.append(2)
+
+    prefetch.submit('a', job)
+    assert release.wait(5)
+    time.sleep(0.1)
+    assert steps == [1]
+    foreground.__exit__(None, None, None)
+    wait_for(lambda: steps == [1, 2])
+
+
+def test_resubmitted_key_abandons_the_paused_job_and_closes_it():
+    prefetch = Prefetcher(idle_delay=0.01, name="test-prefetch")
+    cleaned_up, second = threading.Event(), threading.Event()
+    foreground = prefetch.foreground()
+
+    def first():
+        try:
+            foreground.__enter__()
+            yield
+            raise AssertionError("abandoned job resumed")
+        finally:
+            cleaned_up.set()
+
+    prefetch.submit('tab', first)
+    wait_for(lambda: prefetch.stats()['foreground_runs'] == 1)
+    prefetch.submit('tab', second.set)
+    foreground.__exit__(None, None, None)
+
+    assert cleaned_up.wait(5) and second.wait(5)
+    wait_for(lambda: prefetch.stats()['superseded'] == 1)
+    assert prefetch.stats()['failed'] == 0
+
+
+def test_pending_jobs_are_bounded_and_failures_counted():
+    prefetch = Prefetcher(max_pending=2, idle_delay=0.01, name="test-prefetch")
+    ran = []
+    with prefetch.foreground():
+        for i in range(5):
+            prefetch.submit(i, lambda i=i: ran.append(i))
+        prefetch.submit('boom', lambda: 1 / 0)
+        assert prefetch.stats()['pending'] == 2
+    wait_for(lambda: prefetch.stats()['completed'] + prefetch.stats()['failed'] == 2)
+    assert ran == [4]
+    assert prefetch.stats()['dropped'] == 4 and prefetch.stats()['failed'] == 1
@@ -0,0 +1,70 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pmanalysis.rollup import ROLLUP_LEVELS, STATUS_COUNT_COLUMNS, RollupCube
+
+
+def pandas_summaries(df):
+    """Every hierarchy path's rollup, straight from the readings"""
+    df = df.assign(band=np.select([df['health_score'] >= 85, df['health_score'] >= 70], [2, 1], 0))
+    summaries = {}
+    for depth in range(len(ROLLUP_LEVELS) + 1):
+        groups = df.groupby(ROLLUP_LEVELS[:depth], observed=True) if depth else [((), df)]
+        for key, rows in groups:
+            key = key if isinstance(key, tuple) else (key,)
+            summaries[tuple(str(k) for k in key)] = {
+                'mean': rows['health_score'].mean(),
+                'min': rows['health_score'].min(),
+                'count': len(rows),
+                **{column: int((rows['band'] == band).sum()) for band, column in enumerate(STATUS_COUNT_COLUMNS)},
+            }
+    return summaries
+
+
+def assert_cube_matches(cube, df):
+    expected = pandas_summaries(df) if len(df) else {}
+    assert set(cube.summaries) == set(expected)
+    for path, want in expected.items():
+        got = cube.summary(*path)
+        assert got['mean'] == pytest.approx(want['mean'])
+        assert {k: got[k] for k in want if k != 'mean'} == {k: want[k] for k in want if k != 'mean'}
+
+
+def test_cube_matches_groupby(readings):
+    assert_cube_matches(RollupCube(readings), readings)
+
+
+@pytest.mark.parametrize("from_date, to_date", [
+    (date(2024, 2, 9), date(2024, 2, 10)),
+    (date(2024, 2, 8), date(2024, 2, 8)),
+    (None, date(2024, 2, 9)),
+    (date(2024, 2, 12), None),
+    (date(2024, 3, 1), date(2024, 3, 2)),
+])
+def test_window_matches_filtered_groupby(readings, from_date, to_date):
+    days = readings['timestamp'].dt.normalize()
+    mask = pd.Series(True, index=readings.index)
+    if from_date is not None:
+        mask &= days >= pd.Timestamp(from_date)
+    if to_date is not None:
+        mask &= days <= pd.Timestamp(to_date)
+    assert_cube_matches(RollupCube(readings).window(from_date, to_date), readings[mask])
+
+
+def test_children_in_first_appearance_order(readings):
+    cube = RollupCube(readings)
+    assert cube.children() == list(readings['plant_id'].astype(str).unique())
+    plant = readings[readings['plant_id'] == "Plant-1"]
+    assert cube.children("Plant-1") == list(plant['sub_plant'].astype(str).unique())
+
+
+def test_breakdown(readings):
+    cube = RollupCube(readings)
+    frame = cube.breakdown("Plant-2", "Grinding")
+    assert frame['equipment'].tolist() == cube.children("Plant-2", "Grinding")
+    rows = readings[(readings['plant_id'] == "Plant-2") & (readings['sub_plant'] == "Grinding")]
+    assert frame['count'].sum() == len(rows)
+    assert frame['critical'].sum() == (rows['health_score'] < 70).sum()
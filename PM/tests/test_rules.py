@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pmanalysis.rules import (
+    CRITICAL_BAND, HEALTHY_BAND, WARNING_BAND, derive_business_columns, failure_days, health_band, risk_code
+)
+
+
+def reference_status(score):
+    if score >= 85:
+        return "Healthy"
+    if score >= 70:
+        return "Warning"
+    return "Critical"
+
+
+def reference_failure_days(score, anomaly, stress):
+    if score < 65:
+        days = (score - 40) / (0.018 * 12 * stress)
+    elif score < 80:
+        days = (score - 50) / (0.018 * 6 * stress)
+    else:
+        days = (score - 70) / (0.018 * 3 * stress)
+    if anomaly:
+        days *= 0.55
+    return max(int(days), 1)
+
+
+@pytest.mark.parametrize("score, band", [
+    (0, CRITICAL_BAND), (69.99, CRITICAL_BAND), (70, WARNING_BAND),
+    (84.9, WARNING_BAND), (85, HEALTHY_BAND), (100, HEALTHY_BAND), (np.nan, CRITICAL_BAND),
+])
+def test_health_band_edges(score, band):
+    assert health_band(score) == band
+    assert isinstance(health_band(score), int)
+
+
+def test_risk_code_edges():
+    assert risk_code([64.9, 65, 79.9, 80, np.nan]).tolist() == [2, 1, 1, 0, 0]
+
+
+def test_business_columns_match_scalar_rules():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'health_score': rng.integers(40, 96, size=500),
+        'anomaly_detected': rng.random(500) < 0.3,
+        'stress_factor': rng.uniform(0.8, 1.6, size=500),
+        'timestamp': pd.Timestamp('2026-10-01') + pd.to_timedelta(rng.integers(0, 72, size=500), unit='h'),
+    })
+    out = derive_business_columns(df)
+
+    assert out['status'].astype(str).tolist() == [reference_status(s) for s in df['health_score']]
+    expected_days = [
+        reference_failure_days(s, a, f)
+        for s, a, f in zip(df['health_score'], df['anomaly_detected'], df['stress_factor'])
+    ]
+    assert out['predicted_failure_days'].tolist() == expected_days
+    assert failure_days(df['health_score'], df['anomaly_detected'], df['stress_factor']).tolist() == expected_days
+
+    due = (out['due_date'] - df['timestamp']).dt.days
+    assert due.tolist() == [1 if s < 70 else 7 if s < 85 else 14 for s in df['health_score']]
+    assert (out['completed'] == (df['health_score'] >= 85)).all()
+    assert (out.loc[~out['completed'], 'owner'] == "Unassigned").all()
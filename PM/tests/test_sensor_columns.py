@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from pmanalysis.model import derive_sensor_columns, pivot_sensor_wide
+
+SENSOR_TYPES = ["Vibration", "Temperature", "Pressure", "Power", "Wear", "Speed", "Current"]
+COMPONENTS = ["Bearing", "Motor", "Gearbox", "Liner", "Pump"]
+
+
+def feature_frame(n=300, seed=2):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'plant_id': rng.choice(["Plant-1", "Plant-2"], size=n),
+        'sub_plant': "Grinding",
+        'equipment': rng.choice(["Ball Mill", "Crusher"], size=n),
+        'component': rng.choice(COMPONENTS, size=n),
+        'sensor_type': rng.choice(SENSOR_TYPES, size=n),
+        'timestamp': pd.Timestamp('2026-10-01') + pd.to_timedelta(np.arange(n), unit='min'),
+        'latest': rng.uniform(0, 200, size=n),
+        'rms': rng.uniform(0, 10, size=n),
+        'health_score': rng.integers(40, 96, size=n),
+        'anomaly_detected': rng.random(n) < 0.2,
+    })
+
+
+def test_sensor_columns_match_row_rules():
+    df = feature_frame()
+    np.random.seed(7)
+    out = derive_sensor_columns(df)
+
+    np.random.seed(7)
+    rows = df.to_dict('records')
+    expected = pd.DataFrame({
+        'sensor_value': df['latest'].round(1),
+        'vibration_rms': [round(r['rms'], 1) if r['sensor_type'] == 'Vibration' else 0.0 for r in rows],
+        'temperature_celsius': [round(r['latest'], 0) if r['sensor_type'] == 'Temperature' else 0.0 for r in rows],
+        'pressure_bar': [round(r['latest'], 1) if r['sensor_type'] == 'Pressure' else 0.0 for r in rows],
+        'power_kw': [round(r['latest'], 0) if r['sensor_type'] == 'Power' else 0.0 for r in rows],
+        'wear_percentage': [round(r['latest'], 0) if r['sensor_type'] in ['Wear', 'Speed'] else 0.0 for r in rows],
+        'speed_rpm': [
+            int(np.random.randint(800, 1800)) if r['component'] in ['Bearing', 'Motor', 'Gearbox'] else 0
+            for r in rows
+        ],
+    }, index=df.index)
+
+    pd.testing.assert_frame_equal(out[expected.columns], expected, check_dtype=False)
+
+
+def test_pivot_sensor_wide_one_row_per_component():
+    df = feature_frame()
+    df['sensor_value'] = df['latest'].round(1)
+    wide = pivot_sensor_wide(df).set_index(['plant_id', 'sub_plant', 'equipment', 'component'])
+
+    for key, group in df.groupby(['plant_id', 'sub_plant', 'equipment', 'component']):
+        row = wide.loc[key]
+        assert row['health_score'] == group['health_score'].min()
+        assert row['anomaly_detected'] == group['anomaly_detected'].any()
+        assert row['timestamp'] == group['timestamp'].iloc[0]
+        for sensor_type in SENSOR_TYPES:
+            readings = group.loc[group['sensor_type'] == sensor_type, 'sensor_value']
+            if len(readings):
+                assert row[sensor_type] == readings.iloc[0]
+            else:
+                assert pd.isna(row[sensor_type])
+    assert len(wide) == df.groupby(['plant_id', 'sub_plant', 'equipment', 'component']).ngroups
@@ -0,0 +1,81 @@
+import http.client
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pmanalysis.model import HEALTH_FEATURE_COLS, HealthScoreModel, RiskClassificationModel, risk_inputs
+from pmanalysis.rules import risk_code
+from pmanalysis.service import MicroBatcher, make_server
+
+
+@pytest.fixture(scope="module")
+def features():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(size=(400, len(HEALTH_FEATURE_COLS))), columns=HEALTH_FEATURE_COLS)
+    frame['anomaly_detected'] = rng.random(400) < 0.2
+    frame['health_end'] = 70 + 10 * frame['mean'] - 5 * frame['std'] + rng.normal(size=400)
+    return frame
+
+
+@pytest.fixture(scope="module")
+def batcher(features):
+    health_model = HealthScoreModel()
+    health_model.model.set_params(n_estimators=20)
+    health_model.train(features[HEALTH_FEATURE_COLS], features['health_end'])
+
+    scored = features.copy()
+    scored['health_score'] = health_model.predict(features[HEALTH_FEATURE_COLS])
+    risk_model = RiskClassificationModel()
+    risk_model.model.set_params(n_estimators=20)
+    risk_model.train(risk_inputs(scored), risk_code(scored['health_score']))
+
+    batcher = MicroBatcher(health_model, risk_model, max_wait_ms=20.0)
+    yield batcher
+    batcher.close()
+
+
+def test_concurrent_requests_match_direct_predict(features, batcher):
+    expected_health = batcher.health_model.predict(features[HEALTH_FEATURE_COLS])
+    scored = features.assign(health_score=expected_health)
+    expected_risk = list(batcher.risk_model.predict(risk_inputs(scored)))
+
+    futures = [batcher.submit(features.iloc[start:start + 50]) for start in range(0, len(features), 50)]
+    health = sum((future.result(5)[0] for future in futures), [])
+    risk = sum((list(future.result(5)[1]) for future in futures), [])
+
+    assert health == expected_health.tolist()
+    assert risk == expected_risk
+    assert batcher.stats()['rows_scored'] >= len(features)
+
+
+def test_malformed_request_fails_alone(features, batcher):
+    bad = features.iloc[:3].astype({'mean': object})
+    bad.loc[bad.index[0], 'mean'] = 'n/a'
+    with pytest.raises(ValueError, match="'mean'"):
+        batcher.submit(bad)
+    assert len(batcher.score(features.iloc[:3], timeout=5)[0]) == 3
+
+
+def test_http_round_trip_and_body_cap(features, batcher):
+    server = make_server(batcher, port=0, max_request_bytes=4096)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        port = server.server_address[1]
+        rows = json.loads(features.iloc[:2][batcher.input_cols].to_json(orient='records'))
+
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        connection.request('POST', '/score', json.dumps({'rows': rows}))
+        response = connection.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read())['health_score'] == batcher.score(features.iloc[:2], timeout=5)[0]
+
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        connection.request('POST', '/score', json.dumps({'rows': rows * 50}))
+        response = connection.getresponse()
+        assert response.status == 413
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,51 @@
+import os
+import threading
+
+import pandas as pd
+
+from pmanalysis.datastore import SharedDataset
+
+
+def test_reloads_only_when_files_change(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({'x': [1, 2]}).to_csv(path, index=False)
+    loads, reloads = [], []
+
+    def loader():
+        loads.append(1)
+        return pd.read_csv(path)
+
+    dataset = SharedDataset(loader, str(path))
+    dataset.on_reload('count', lambda: reloads.append(1))
+    first = dataset.get()
+    assert dataset.get() is first
+    assert dataset.derive('total', lambda df: df['x'].sum()) == 3
+    assert len(loads) == 1
+
+    pd.DataFrame({'x': [1, 2, 3]}).to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert dataset.get()['x'].tolist() == [1, 2, 3]
+    assert dataset.derive('total', lambda df: df['x'].sum()) == 6
+    assert len(loads) == 2 and len(reloads) == 2
+
+
+def test_concurrent_readers_share_one_load(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({'x': [1]}).to_csv(path, index=False)
+    loads = []
+    dataset = SharedDataset(lambda: loads.append(1) or pd.read_csv(path), str(path))
+
+    frames = []
+    threads = [threading.Thread(target=lambda: frames.append(dataset.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1
+    assert all(frame is frames[0] for frame in frames)
+
+
+def test_missing_file_version(tmp_path):
+    dataset = SharedDataset(pd.DataFrame, str(tmp_path / "absent.csv"))
+    assert dataset.current_version() == ((str(tmp_path / "absent.csv"), None, None),)
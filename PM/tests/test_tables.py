@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from pmanalysis.datastore import TimeRangeIndex
+from pmanalysis.tables import page_count, select_rows, take_page
+
+COLUMNS = ['sub_plant', 'component', 'health_score', 'timestamp']
+
+
+@pytest.fixture(scope="module")
+def window(readings):
+    return TimeRangeIndex(readings).window("Plant-1", "2024-02-09", "2024-02-11")
+
+
+def pandas_selection(df, where, filters, sort_by, ascending):
+    mask = pd.Series(True if where is None else where, index=df.index)
+    for column, values in filters.items():
+        if values:
+            mask &= df[column].isin(values)
+    selected = df[mask]
+    if sort_by is not None:
+        selected = selected.sort_values(sort_by, ascending=ascending, kind='stable')
+    return selected
+
+
+@pytest.mark.parametrize("critical, filters, sort_by, ascending", [
+    (False, {}, None, True),
+    (True, {}, 'health_score', True),
+    (False, {'sub_plant': ["Grinding"]}, 'health_score', False),
+    (True, {'sub_plant': ["Crushing"], 'component': ["Motor", "Liner"]}, 'timestamp', False),
+    (False, {'sub_plant': []}, 'component', True),
+    (False, {'component': ["Nothing"]}, 'health_score', True),
+])
+def test_pages_match_pandas(window, critical, filters, sort_by, ascending):
+    where = (window['health_score'] < 70).to_numpy() if critical else None
+    rows = select_rows(window, where=where, filters=filters, sort_by=sort_by, ascending=ascending)
+    expected = pandas_selection(window, where, filters, sort_by, ascending)[COLUMNS].reset_index(drop=True)
+    assert len(rows) == len(expected)
+
+    pages = page_count(len(rows), 25)
+    got = pd.concat([take_page(window, rows, COLUMNS, page, 25) for page in range(1, pages + 1)], ignore_index=True)
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_page_numbers_are_clamped(window):
+    rows = select_rows(window, sort_by='health_score')
+    last = page_count(len(rows), 50)
+    pd.testing.assert_frame_equal(take_page(window, rows, COLUMNS, 0, 50), take_page(window, rows, COLUMNS, 1, 50))
+    pd.testing.assert_frame_equal(take_page(window, rows, COLUMNS, last + 3, 50), take_page(window, rows, COLUMNS, last, 50))
+    assert len(take_page(window, rows, COLUMNS, last, 50)) == len(rows) - (last - 1) * 50
+
+
+def test_page_count():
+    assert page_count(0, 25) == 1
+    assert page_count(25, 25) == 1
+    assert page_count(26, 25) == 2
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from pmanalysis.datastore import TimeRangeIndex
+
+
+def pandas_window(df, plant_id, from_date, to_date):
+    days = df['timestamp'].dt.normalize()
+    mask = df['plant_id'] == plant_id
+    if from_date is not None:
+        mask &= days >= pd.Timestamp(from_date)
+    if to_date is not None:
+        mask &= days <= pd.Timestamp(to_date)
+    return df[mask]
+
+
+def canonical(frame):
+    return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("plant_id, from_date, to_date", [
+    ("Plant-1", date(2024, 2, 9), date(2024, 2, 10)),
+    ("Plant-2", date(2024, 2, 8), date(2024, 2, 8)),
+    ("Plant-3", date(2024, 2, 12), date(2024, 2, 13)),
+    ("Plant-1", None, date(2024, 2, 9)),
+    ("Plant-2", date(2024, 2, 11), None),
+    ("Plant-3", None, None),
+    ("Plant-1", date(2024, 3, 1), date(2024, 3, 5)),
+    ("Plant-9", date(2024, 2, 8), date(2024, 2, 12)),
+])
+def test_window_matches_pandas(readings, plant_id, from_date, to_date):
+    index = TimeRangeIndex(readings)
+    got = index.window(plant_id, from_date, to_date)
+    want = pandas_window(readings, plant_id, from_date, to_date)
+
+    assert len(got) == len(want)
+    pd.testing.assert_frame_equal(canonical(got), canonical(want))
+    assert got['timestamp'].is_monotonic_increasing
+
+
+def test_window_keeps_midnight_of_first_day_and_drops_midnight_after_last(readings):
+    index = TimeRangeIndex(readings)
+    plant = readings[readings['plant_id'] == "Plant-1"]
+    midnights = plant.loc[plant['timestamp'].dt.normalize() == plant['timestamp'], 'timestamp']
+    assert midnights.nunique() > 1
+
+    for day in sorted(midnights.unique())[1:]:
+        day = pd.Timestamp(day)
+        got = index.window("Plant-1", day.date(), day.date())
+        assert (got['timestamp'] == day).sum() == (plant['timestamp'] == day).sum()
+        assert not (got['timestamp'] == day + pd.Timedelta(days=1)).any()
+        previous = index.window("Plant-1", day.date() - pd.Timedelta(days=1), day.date() - pd.Timedelta(days=1))
+        assert not (previous['timestamp'] == day).any()
+
+
+def test_max_date(readings):
+    assert TimeRangeIndex(readings).max_date == readings['timestamp'].max().date()
+    assert TimeRangeIndex(readings.iloc[:0]).max_date is None